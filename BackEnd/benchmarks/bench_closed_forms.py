@@ -0,0 +1,107 @@
+# benchmarks/bench_closed_forms.py
+"""
+Compara los coeficientes por fórmula cerrada (closed_forms) contra el motor
+simbólico general (DerivativeTower) y el modo AD.
+
+Para cada expresión del corpus mide el tiempo de obtener c_0..c_n en frío
+(torre nueva en cada repetición) por los tres caminos y verifica que la
+fórmula cerrada coincida con el motor general. "cerrada" incluye reconocer
+la familia; "fórmula" es solo evaluar los coeficientes (lo que se repite al
+subir el orden o cambiar el centro).
+
+Uso (desde BackEnd/):
+    python benchmarks/bench_closed_forms.py [--order 20] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sympy as sp  # noqa: E402
+
+from closed_forms import match_closed_form  # noqa: E402
+from manual_diff import DerivativeTower  # noqa: E402
+from taylor_ad import taylor_series_ad  # noqa: E402
+from taylor_engine import _coefficient, parse_expression, x  # noqa: E402
+
+
+CORPUS = [
+    "sin(x)",
+    "cos(2*x + 1)",
+    "exp(3*x)",
+    "sinh(x/2) + cosh(x)",
+    "x**7 - 3*x**4 + 2*x - 5",
+    "1/(1 + 2*x)",
+    "log(1 + x)",
+    "(1 + x)**(1/3)",
+    "2*sin(x) + exp(x) - x**3",
+]
+
+CENTER = 0.3
+
+
+def _symbolic(expr: sp.Expr, order: int):
+    tower = DerivativeTower(expr, x)
+    return [_coefficient(tower, CENTER, k)[0] for k in range(order + 1)]
+
+
+def _ad(expr: sp.Expr, order: int):
+    return taylor_series_ad(expr, x, CENTER, order)
+
+
+def _closed(expr: sp.Expr, order: int):
+    return match_closed_form(expr, x).coefficients(CENTER, order)
+
+
+def _formula(form, order: int):
+    return form.coefficients(CENTER, order)
+
+
+def _time(fn, expr: sp.Expr, order: int, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(expr, order)
+    return (time.perf_counter() - start) / repeat, out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--order", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    header = (
+        f"{'expresión':28} {'simbólico (ms)':>15} {'AD (ms)':>9} "
+        f"{'cerrada (ms)':>13} {'fórmula (ms)':>13} {'speedup':>9}  resultado"
+    )
+    print(f"Orden n = {args.order}, centro a = {CENTER}\n")
+    print(header)
+    print("-" * len(header))
+
+    mismatches = 0
+    total_symbolic = total_closed = 0.0
+    for src in CORPUS:
+        expr = parse_expression(src)
+        t_sym, ref = _time(_symbolic, expr, args.order, args.repeat)
+        t_ad, _ = _time(_ad, expr, args.order, args.repeat)
+        t_closed, got = _time(_closed, expr, args.order, max(args.repeat, 100))
+        t_formula, _ = _time(_formula, match_closed_form(expr, x), args.order, 1000)
+        total_symbolic += t_sym
+        total_closed += t_closed
+        ok = all(abs(g - r) <= 1e-9 * max(1.0, abs(r)) for g, r in zip(got, ref))
+        mismatches += not ok
+        print(
+            f"{src:28} {t_sym * 1e3:15.2f} {t_ad * 1e3:9.2f} {t_closed * 1e3:13.4f} "
+            f"{t_formula * 1e3:13.4f} "
+            f"{t_sym / t_closed:8.0f}x  {'igual' if ok else 'DISTINTO'}"
+        )
+
+    print(f"\nSpeedup total frente al motor simbólico: {total_symbolic / total_closed:.0f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
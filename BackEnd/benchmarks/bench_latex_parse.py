@@ -0,0 +1,147 @@
+# benchmarks/bench_latex_parse.py
+"""
+Compara el parser liviano (latex_fast) contra el parser ANTLR de SymPy.
+
+Para cada expresión del corpus mide el tiempo medio de ambos caminos y
+verifica que den la misma función (evaluando numéricamente en varios
+puntos). Las entradas que el parser liviano no cubre se marcan como
+"fallback" (en producción irían a ANTLR). Las de MUST_FALLBACK tienen que
+caer a ANTLR: si el parser liviano las acepta, cuenta como distinto.
+
+Uso (desde BackEnd/):
+    python benchmarks/bench_latex_parse.py [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sympy as sp  # noqa: E402
+
+from latex_fast import UnsupportedLatex, parse_latex_fast  # noqa: E402
+from taylor_engine import normalize_constants, normalize_input_expression  # noqa: E402
+
+
+# Entradas típicas de MathLive (antes de normalize_input_expression)
+CORPUS = [
+    r"\sin(x)",
+    r"\sin\left(x\right)+x^2",
+    r"\frac{1}{1+x}",
+    r"\exponentialE^{x}",
+    r"e^{x}\cos\left(2x\right)",
+    r"\tan(x)e^{x}",
+    r"\sqrt{1+x}",
+    r"\sqrt[3]{x+2}",
+    r"\ln\left(1+x\right)",
+    r"\frac{\sin(x)}{x+2}",
+    r"x^{3}-2x^{2}+x-5",
+    r"\arctan\left(x^2\right)",
+    r"\sinh(x)\cdot\cosh(x)",
+    r"\sin^2 x+\cos^2 x",
+    r"\frac{\tan\left(x\right)}{1+x^{2}}",
+    r"\sin(\pi x)",
+    r"\log_{2}(x)",
+    r"|x|",
+    # Multiplicación implícita tras / explícito: ANTLR la liga primero
+    r"1/2x",
+    r"x^2/2x",
+    r"1/2\sin(x)",
+    r"1/2(x+1)",
+    r"1/x^2\sin(x)+1",
+    r"x\div 2x",
+    r"2x/3",
+    r"1/2\cdot x",
+]
+
+# Notación de Leibniz: ANTLR devuelve Derivative, el parser liviano no la cubre
+MUST_FALLBACK = [
+    r"\frac{d}{dx}x",
+    r"\frac{d}{dx}\left(x^2\right)",
+    r"\frac{dy}{dx}",
+]
+
+SAMPLE_POINTS = [0.13, 0.37, 0.71]
+
+
+def _comparable(expr: sp.Expr) -> sp.Expr:
+    """Lleva ambas salidas a la misma forma (constantes, log(u, E), símbolo pi)."""
+    expr = normalize_constants(expr)
+    expr = expr.subs(sp.Symbol("pi"), sp.pi)
+    return expr.replace(
+        lambda e: isinstance(e, sp.log) and len(e.args) == 2,
+        lambda e: sp.log(e.args[0]) / sp.log(e.args[1]),
+    )
+
+
+def _same_function(a: sp.Expr, b: sp.Expr) -> bool:
+    x = sp.Symbol("x")
+    for p in SAMPLE_POINTS:
+        va = complex(sp.N(_comparable(a).subs(x, p)))
+        vb = complex(sp.N(_comparable(b).subs(x, p)))
+        if abs(va - vb) > 1e-9 * (1 + abs(va)):
+            return False
+    return True
+
+
+def _time_per_call(fn, src: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(src)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    from sympy.parsing.latex import parse_latex
+
+    # La primera llamada a ANTLR carga la gramática: se mide aparte
+    start = time.perf_counter()
+    parse_latex("x")
+    print(f"Carga inicial de ANTLR: {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    header = f"{'expresión':40} {'ANTLR (µs)':>12} {'rápido (µs)':>12} {'speedup':>8}  resultado"
+    print(header)
+    print("-" * len(header))
+
+    mismatches = 0
+    for raw in MUST_FALLBACK:
+        try:
+            fast = parse_latex_fast(normalize_input_expression(raw))
+        except UnsupportedLatex:
+            continue
+        mismatches += 1
+        print(f"{raw:40} {'':>12} {'':>12} {'':>8}  DISTINTO (debía caer a ANTLR: {fast})")
+
+    total_antlr = total_fast = 0.0
+    for raw in CORPUS:
+        src = normalize_input_expression(raw)
+        t_antlr = _time_per_call(parse_latex, src, args.repeat)
+        try:
+            fast = parse_latex_fast(src)
+        except UnsupportedLatex:
+            print(f"{raw:40} {t_antlr * 1e6:12.1f} {'-':>12} {'-':>8}  fallback")
+            continue
+
+        t_fast = _time_per_call(parse_latex_fast, src, args.repeat)
+        total_antlr += t_antlr
+        total_fast += t_fast
+        ok = _same_function(fast, parse_latex(src))
+        mismatches += not ok
+        print(
+            f"{raw:40} {t_antlr * 1e6:12.1f} {t_fast * 1e6:12.1f} "
+            f"{t_antlr / t_fast:7.1f}x  {'igual' if ok else 'DISTINTO'}"
+        )
+
+    if total_fast:
+        print(f"\nSpeedup total en entradas cubiertas: {total_antlr / total_fast:.1f}x")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
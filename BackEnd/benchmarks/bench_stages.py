@@ -0,0 +1,279 @@
+# benchmarks/bench_stages.py
+"""
+Micro-benchmarks por etapa de generar_taylor_con_analisis, con umbral de
+regresión contra una línea base guardada en stages_baseline.json.
+
+Para cada expresión del corpus y cada orden (5/10/20/40 por defecto) mide en
+frío, sin las cachés del motor ni el almacén persistente:
+
+- parse:        texto → sp.Expr (parse_expression + normalize_constants)
+- tower:        derivadas 0..n con DerivativeTower
+- coefficients: CoefficientTable.ensure(n) sobre la torre ya derivada
+                (fórmula cerrada si la hay; si no, evaluación compilada)
+- polynomial:   taylor_polynomial (textos SymPy y LaTeX de P_n)
+- convergence:  valor exacto, sumas parciales y tabla de convergencia
+- plot:         muestreo de f y P_n + PNG (en el hilo actual, sin pool)
+
+Cada etapa se repite --repeat veces y se guarda el mejor tiempo (el mínimo
+es mucho más estable que la media en una máquina con otra carga). Los coeficientes
+se verifican contra las fórmulas de lab.py (sin(x), e^x y polinomios) o,
+para el resto, contra el motor de series (taylor_series). Como esas
+expresiones de lab.py tienen fórmula cerrada, contra lab.py se verifica
+además el camino general (torre + evaluación) con la fórmula desactivada.
+
+Falla si alguna etapa supera la línea base en más de --threshold % (por
+defecto el de la línea base) o si algún resultado no coincide. Las etapas
+por debajo de --floor-ms no se comparan: ahí manda el ruido. Una etapa que
+pasa el umbral se vuelve a medir (hasta --retries veces, quedándose con el
+mejor tiempo) antes de contarla como regresión: en una máquina compartida
+un pico de carga puntual no debe hacer fallar la corrida.
+
+Uso (desde BackEnd/):
+    python benchmarks/bench_stages.py [--orders 5 10 20 40] [--repeat 5]
+                                      [--threshold 30] [--update]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sin almacén persistente ni pool de gráficas: se mide el cómputo en sí
+os.environ["TAYLOR_STORE_PATH"] = ""
+os.environ["TAYLOR_PLOT_WORKERS"] = "0"
+
+import numpy as np  # noqa: E402
+
+import lab  # noqa: E402
+from manual_diff import DerivativeTower  # noqa: E402
+from plotting import render_png  # noqa: E402
+from plot_series import mark_pole_gaps  # noqa: E402
+from taylor_engine import (  # noqa: E402
+    CoefficientTable,
+    build_convergence_table,
+    compute_taylor_coefficients_series,
+    evaluate_taylor_poly_vectorized,
+    evaluate_taylor_poly_with_partials,
+    exact_value,
+    exact_values_vectorized,
+    normalize_constants,
+    parse_expression,
+    taylor_polynomial,
+    x,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stages_baseline.json")
+
+STAGES = ["parse", "tower", "coefficients", "polynomial", "convergence", "plot"]
+
+CENTER = 0.5
+X_EVAL = 0.8
+PLOT_POINTS = 300
+
+# (expresión, coeficientes de referencia de lab.py o None → motor de series)
+CORPUS = [
+    ("sin(x)", lambda a, n: lab.calcular_coeficientes_taylor_sin(a, n)),
+    ("exp(x)", lambda a, n: lab.calcular_coeficientes_taylor_exp(a, n)),
+    ("3*x**2 - 2*x + 1",
+     lambda a, n: lab.calcular_coeficientes_taylor_polinomio(a, n, 3, -2, 1)),
+    ("x**3 - x + 4",
+     lambda a, n: lab.calcular_coeficientes_taylor_polinomio_cubico(a, n, 1, 0, -1, 4)),
+    ("2*x**4 + x**3 - 5*x",
+     lambda a, n: lab.calcular_coeficientes_taylor_polinomio_cuartico(a, n, 2, 1, 0, -5, 0)),
+    ("sin(x)/(2 + x)", None),
+    ("x*exp(-x**2)", None),
+    ("exp(x)*cos(x)", None),
+    ("log(1 + x)*sqrt(1 + x)", None),
+]
+
+
+# ============================================================
+# Etapas
+# ============================================================
+
+def _best_ms(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None):
+    """Mejor tiempo en ms de `repeat` corridas; setup (sin medir) arma el estado."""
+    samples = []
+    out = None
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        start = time.perf_counter()
+        out = fn(state) if setup is not None else fn()
+        samples.append((time.perf_counter() - start) * 1e3)
+    return min(samples), out
+
+
+def _tower(expr, order: int) -> DerivativeTower:
+    tower = DerivativeTower(expr, x)
+    tower.extend_to(order)
+    return tower
+
+
+def _plot(tower: DerivativeTower, coefs: List[float]) -> bytes:
+    xs = np.linspace(CENTER - 1.5, CENTER + 1.5, PLOT_POINTS)
+    ys_real = mark_pole_gaps(exact_values_vectorized(tower, 0, xs))
+    ys_taylor, _ = evaluate_taylor_poly_vectorized(coefs, CENTER, xs)
+    return render_png(xs, ys_real, ys_taylor, CENTER, coefs[0])
+
+
+def measure(src: str, order: int, repeat: int) -> Dict:
+    """Tiempos por etapa (ms) y coeficientes de una expresión a un orden."""
+    times: Dict[str, float] = {}
+
+    times["parse"], expr = _best_ms(
+        lambda: normalize_constants(parse_expression(src)), repeat
+    )
+    times["tower"], tower = _best_ms(lambda: _tower(expr, order), repeat)
+    # Torre nueva (sin lambdify cacheado) por corrida
+    times["coefficients"], coefs = _best_ms(
+        lambda table: table.ensure(order), repeat,
+        setup=lambda: CoefficientTable(_tower(expr, order), CENTER),
+    )
+    times["polynomial"], _ = _best_ms(lambda: taylor_polynomial(coefs, CENTER), repeat)
+
+    def convergence(fresh: DerivativeTower):
+        exact = exact_value(expr, X_EVAL, tower=fresh)
+        approx, partials = evaluate_taylor_poly_with_partials(coefs, CENTER, X_EVAL)
+        return approx, build_convergence_table(partials, exact)
+
+    times["convergence"], (approx, _) = _best_ms(
+        convergence, repeat, setup=lambda: DerivativeTower(expr, x)
+    )
+    times["plot"], _ = _best_ms(
+        lambda fresh: _plot(fresh, coefs), repeat, setup=lambda: DerivativeTower(expr, x)
+    )
+    return {"times": times, "expr": expr, "coefs": coefs, "approx": approx}
+
+
+def tower_coefficients(expr, order: int) -> List[float]:
+    """c_0..c_n por la torre de derivadas, aunque haya fórmula cerrada."""
+    table = CoefficientTable(_tower(expr, order), CENTER)
+    table.closed_form = None
+    return table.ensure(order)
+
+
+def _compare(coefs: List[float], expected: List[float], source: str) -> Optional[str]:
+    for k, (got, ref) in enumerate(zip(coefs, expected)):
+        if abs(got - ref) > 1e-9 * max(1.0, abs(ref)):
+            return f"c_{k} = {got!r} ≠ {ref!r} ({source})"
+    return None
+
+
+def check(result: Dict, reference, order: int) -> Optional[str]:
+    """None si los coeficientes coinciden con la referencia; si no, el motivo."""
+    if reference is not None:
+        expected = reference(CENTER, order)
+        problem = _compare(result["coefs"], expected, "lab") or _compare(
+            tower_coefficients(result["expr"], order), expected, "lab, torre"
+        )
+    else:
+        expected, _ = compute_taylor_coefficients_series(result["expr"], CENTER, order)
+        problem = _compare(result["coefs"], expected, "serie")
+    if problem:
+        return problem
+    if reference is not None:
+        lab_approx, _ = lab.evaluar_polinomio_taylor(expected, CENTER, X_EVAL)
+        if abs(result["approx"] - lab_approx) > 1e-9 * max(1.0, abs(lab_approx)):
+            return f"P_n(x) = {result['approx']!r} ≠ {lab_approx!r} (lab)"
+    return None
+
+
+# ============================================================
+# Programa
+# ============================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Regresión tolerada en %% (por defecto la de la línea base).")
+    parser.add_argument("--floor-ms", type=float, default=None,
+                        help="Etapas más rápidas que esto no se comparan.")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Nuevas mediciones de un caso antes de darlo por regresión.")
+    parser.add_argument("--update", action="store_true", help="Reescribir la línea base.")
+    args = parser.parse_args()
+
+    baseline = {"threshold_pct": 30.0, "floor_ms": 2.0, "stages": {}}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+    threshold = args.threshold if args.threshold is not None else baseline["threshold_pct"]
+    floor_ms = args.floor_ms if args.floor_ms is not None else baseline["floor_ms"]
+
+    # Primera corrida sin medir: imports diferidos (matplotlib, ANTLR, ...)
+    measure(CORPUS[-1][0], min(args.orders), 1)
+
+    print(f"Centro a = {CENTER}, x = {X_EVAL}, mejor de {args.repeat}; "
+          f"umbral +{threshold:.0f} % (etapas ≥ {floor_ms} ms)\n")
+    header = f"{'expresión':26} {'n':>3} " + " ".join(f"{s:>12}" for s in STAGES) + "  resultado"
+    print(header)
+    print("-" * len(header))
+
+    def slower(times: Dict[str, float], base: Dict[str, float]) -> List[str]:
+        """Etapas que superan la línea base más el umbral."""
+        return [
+            stage for stage in STAGES
+            if stage in base
+            and max(times[stage], base[stage]) >= floor_ms
+            and times[stage] > base[stage] * (1 + threshold / 100)
+        ]
+
+    regressions: List[str] = []
+    mismatches: List[str] = []
+    measured: Dict[str, Dict[str, float]] = {}
+    for src, reference in CORPUS:
+        for order in args.orders:
+            key = f"{src} | n={order}"
+            base = baseline["stages"].get(key, {})
+            result = measure(src, order, args.repeat)
+            times = {s: result["times"][s] for s in STAGES}
+            for _ in range(0 if args.update else args.retries):
+                if not slower(times, base):
+                    break
+                again = measure(src, order, args.repeat)["times"]
+                times = {s: min(times[s], again[s]) for s in STAGES}
+            measured[key] = {s: round(times[s], 3) for s in STAGES}
+
+            flagged = [] if args.update else slower(times, base)
+            for stage in flagged:
+                regressions.append(
+                    f"{key} {stage}: {times[stage]:.2f} ms > {base[stage]:.2f} ms "
+                    f"(+{(times[stage] / base[stage] - 1) * 100:.0f} %)"
+                )
+            cells = [
+                f"{times[stage]:11.2f}{'!' if stage in flagged else ' '}" for stage in STAGES
+            ]
+
+            problem = check(result, reference, order)
+            if problem:
+                mismatches.append(f"{key}: {problem}")
+            print(f"{src:26} {order:3d} " + " ".join(cells)
+                  + f"  {'igual' if problem is None else 'DISTINTO'}")
+
+    if args.update:
+        baseline.update(
+            stages=measured,
+            orders=args.orders,
+            repeat=args.repeat,
+            python=sys.version.split()[0],
+        )
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nLínea base actualizada en {BASELINE_PATH}")
+
+    print()
+    failures = regressions + mismatches
+    for failure in failures:
+        print(f"FALLA: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# benchmarks/check_precision.py
+"""
+Verificación de regresión de los modos mp / exact con coeficientes fuera del
+rango float.
+
+Con 1/(1-x) cerca de su polo los c_k crecen como (1-a)^-(k+1) y pasan de
+1e308 enseguida. Cada caso pasa por la API (TestClient, en este proceso) y
+verifica que:
+
+- la respuesta sea JSON válido (200, sin Infinity/NaN),
+- los c_k que no entran en un float vengan como null,
+- coefficients_exact traiga el valor completo de todos los c_k,
+- el resultado de un trabajo (POST /taylor/jobs) se pueda leer con GET.
+
+Uso (desde BackEnd/):
+    python benchmarks/check_precision.py
+"""
+
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sin almacén persistente ni precalentamiento: solo interesa la respuesta
+os.environ["TAYLOR_STORE_PATH"] = ""
+os.environ["TAYLOR_WARMUP"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+
+EXPRESSION = r"\frac{1}{1-x}"
+
+# (endpoint, centro, orden): /taylor/analyze tiene tope de orden síncrono
+CASES = [
+    ("analyze", 0.9999999, 50),
+    ("jobs", 0.9, 400),
+]
+
+JOB_TIMEOUT_S = 300.0
+
+
+def _request(precision: str, center: float, order: int) -> Dict:
+    return {
+        "expression": EXPRESSION,
+        "center": center,
+        "x_eval": 0.5,
+        "order": order,
+        "precision": precision,
+        "include_plot": False,
+        "detail": "none",
+    }
+
+
+def _run(client: TestClient, endpoint: str, body: Dict) -> Dict:
+    if endpoint == "analyze":
+        response = client.post("/taylor/analyze", json=body)
+        response.raise_for_status()
+        return response.json()
+
+    job_id = client.post("/taylor/jobs", json=body).json()["job_id"]
+    deadline = time.monotonic() + JOB_TIMEOUT_S
+    while True:
+        response = client.get(f"/taylor/jobs/{job_id}")
+        response.raise_for_status()
+        status = response.json()
+        if status["status"] not in ("queued", "running"):
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"trabajo {job_id} sin terminar")
+        time.sleep(0.2)
+    if status["status"] != "done":
+        raise RuntimeError(f"trabajo {status['status']}: {status['error']}")
+    return status["result"]
+
+
+def check(result: Dict, center: float, order: int) -> Optional[str]:
+    """None si la respuesta es coherente; si no, el motivo."""
+    coefs: List[Optional[float]] = result["coefficients"]
+    exact: List[str] = result["coefficients_exact"] or []
+    if len(coefs) != order + 1 or len(exact) != order + 1:
+        return f"{len(coefs)} coeficientes, {len(exact)} exactos (esperaba {order + 1})"
+    gap = float(f"{1 - center:.12g}")
+    for k, (c, text) in enumerate(zip(coefs, exact)):
+        # c_k = (1 - a)^-(k+1): null solo si de verdad no entra en un float
+        digits = -(k + 1) * math.log10(gap)
+        if digits > 309:
+            if c is not None:
+                return f"c_{k} = {c!r}, esperaba null"
+        elif digits < 300:
+            expected = gap ** -(k + 1)
+            if c is None or abs(c - expected) > 1e-6 * expected:
+                return f"c_{k} = {c!r} ≠ {expected!r}"
+        if not text or text[0] == "-":
+            return f"coefficients_exact[{k}] = {text!r}"
+    if coefs[-1] is not None:
+        return f"c_{order} = {coefs[-1]!r}: el caso ya no sale del rango float"
+    for row in result["convergence_table"]:
+        for key, value in row.items():
+            if isinstance(value, float) and value != value:
+                return f"fila {row['order']}: {key} = nan"
+    return None
+
+
+def main_check() -> int:
+    client = TestClient(main.app)
+    failures: List[str] = []
+    for endpoint, center, order in CASES:
+        for precision in ("mp", "exact"):
+            label = f"{endpoint:8} a={center:<10} n={order:<4} {precision:6}"
+            try:
+                problem = check(_run(client, endpoint, _request(precision, center, order)),
+                                center, order)
+            except Exception as e:
+                problem = f"{type(e).__name__}: {e}"
+            print(f"{label} {'ok' if problem is None else 'FALLA'}")
+            if problem:
+                failures.append(f"{label}: {problem}")
+
+    print()
+    for failure in failures:
+        print(f"FALLA: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_check())
@@ -0,0 +1,113 @@
+# benchmarks/importtime.py
+"""
+Presupuesto de tiempo de importación de la API (arranque en frío).
+
+Corre `python -X importtime -c "import main"` varias veces en procesos
+nuevos, toma el mínimo por módulo y lo compara con la línea base guardada en
+importtime_baseline.json:
+
+- falla si el total supera el presupuesto (budget_ms),
+- falla si se importa algún módulo prohibido al arrancar (p. ej. matplotlib,
+  que solo deben cargar los workers del pool de gráficas),
+- muestra los paquetes de primer nivel que más tardan y su diferencia con
+  la línea base.
+
+Uso (desde BackEnd/):
+    python benchmarks/importtime.py [--runs 5] [--update]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_baseline.json")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def measure_once() -> Dict[str, int]:
+    """{módulo: µs acumulados} de una importación en frío de main."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "TAYLOR_WARMUP": "0"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def top_level(cumulative: Dict[str, int]) -> Dict[str, int]:
+    """Tiempo por paquete de primer nivel (fastapi, sympy, numpy, ...)."""
+    packages: Dict[str, int] = {}
+    for module, us in cumulative.items():
+        root = module.split(".")[0]
+        if module == root:
+            packages[root] = max(packages.get(root, 0), us)
+    return packages
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="Reescribir la línea base.")
+    args = parser.parse_args()
+
+    runs = [measure_once() for _ in range(args.runs)]
+    modules = set().union(*runs)
+    best = {m: min(run.get(m, 0) for run in runs if m in run) for m in modules}
+    total_ms = best["main"] / 1000
+    # Solo los paquetes que pesan (>= 5 ms), sin contar el propio main
+    packages = {
+        name: us / 1000 for name, us in top_level(best).items()
+        if name != "main" and us >= 5000
+    }
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"Importación de main: {total_ms:.0f} ms (mejor de {args.runs}); "
+          f"línea base {baseline['total_ms']:.0f} ms, presupuesto {baseline['budget_ms']:.0f} ms\n")
+    print(f"{'paquete':28} {'ms':>8} {'base':>8} {'Δ':>8}")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:15]:
+        base = baseline["packages"].get(name)
+        delta = f"{ms - base:+8.0f}" if base is not None else f"{'nuevo':>8}"
+        base_txt = f"{base:8.0f}" if base is not None else f"{'-':>8}"
+        print(f"{name:28} {ms:8.0f} {base_txt} {delta}")
+
+    failures = []
+    if total_ms > baseline["budget_ms"]:
+        failures.append(f"total {total_ms:.0f} ms > presupuesto {baseline['budget_ms']:.0f} ms")
+    for name in baseline["forbidden"]:
+        if any(m == name or m.startswith(name + ".") for m in modules):
+            failures.append(f"{name} se importa al arrancar")
+
+    if args.update:
+        baseline.update(
+            total_ms=round(total_ms, 1),
+            packages={name: round(ms, 1) for name, ms in sorted(packages.items())},
+            python=sys.version.split()[0],
+        )
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"\nLínea base actualizada en {BASELINE_PATH}")
+
+    for failure in failures:
+        print(f"FALLA: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
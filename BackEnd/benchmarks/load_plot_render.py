@@ -0,0 +1,117 @@
+# benchmarks/load_plot_render.py
+"""
+Prueba de carga del renderer de gráficas.
+
+Lanza N requests GET plot_url (/taylor/plot/{id}?spec=...) en paralelo (cada una con una
+función/centro distinto) y verifica que cada PNG recibido sea idéntico,
+byte a byte, al que produce una figura nueva y aislada para esos mismos
+datos. Si dos renders se mezclaran (líneas de otra request, ejes de la
+anterior, etc.), los bytes no coincidirían.
+
+Uso (desde BackEnd/):
+    python benchmarks/load_plot_render.py [--requests 64] [--threads 16]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from plot_series import mark_pole_gaps  # noqa: E402
+from plotting import PlotRenderer, plot_workers  # noqa: E402
+from taylor_engine import (  # noqa: E402
+    default_plot_limits,
+    evaluate_taylor_poly_vectorized,
+    exact_values_vectorized,
+    get_derivative_tower,
+    get_taylor_coefficients,
+    parse_input_cached,
+)
+
+
+EXPRESSIONS = [
+    r"\sin(x)",
+    r"\cos(2x)",
+    r"e^{x}",
+    r"\frac{1}{2+x}",
+    r"\arctan(x)",
+    r"\sinh(x)",
+    r"\sqrt{4+x}",
+    r"x^{3}-x",
+]
+
+
+def _jobs(n: int):
+    for i in range(n):
+        yield {
+            "expression": EXPRESSIONS[i % len(EXPRESSIONS)],
+            "center": round(0.1 * (i // len(EXPRESSIONS)), 2),
+            "order": 2 + i % 7,
+            "num_points": 300,
+        }
+
+
+def _reference_png(job) -> bytes:
+    """Render con una figura nueva (sin reutilizar nada) para comparar."""
+    sym_expr = parse_input_cached(job["expression"], True)
+    coefs = get_taylor_coefficients(sym_expr, job["center"], job["order"])
+    x_min, x_max = default_plot_limits(job["center"])
+    xs = np.linspace(x_min, x_max, job["num_points"])
+    ys_real = mark_pole_gaps(exact_values_vectorized(get_derivative_tower(sym_expr), 0, xs))
+    ys_taylor, _ = evaluate_taylor_poly_vectorized(coefs, job["center"], xs)
+    return PlotRenderer().render(xs, ys_real, ys_taylor, job["center"], coefs[0])
+
+
+def main_load() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    client = TestClient(main.app)
+    jobs = list(_jobs(args.requests))
+
+    plot_urls = []
+    for job in jobs:
+        res = client.post("/taylor/analyze", json=job)
+        res.raise_for_status()
+        plot_urls.append(res.json()["plot_url"])
+    main.PLOT_PNG_CACHE.clear()
+
+    def fetch(plot_url: str):
+        start = time.perf_counter()
+        res = client.get(plot_url)
+        res.raise_for_status()
+        return res.content, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(fetch, plot_urls))
+    wall = time.perf_counter() - start
+
+    mismatches = 0
+    for job, (png, _latency) in zip(jobs, results):
+        if png != _reference_png(job):
+            mismatches += 1
+            print(f"DISTINTO: {job}")
+
+    latencies = sorted(lat for _png, lat in results)
+    print(f"workers del pool: {plot_workers()}  hilos cliente: {args.threads}")
+    print(f"{len(jobs)} gráficas en {wall:.2f} s ({len(jobs) / wall:.1f} gráficas/s)")
+    print(
+        f"latencia p50={latencies[len(latencies) // 2] * 1000:.0f} ms "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms"
+    )
+    print(f"imágenes incorrectas o mezcladas: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_load())
@@ -0,0 +1,142 @@
+# caching.py
+"""
+Caché LRU acotada y segura entre hilos, con expiración opcional (TTL).
+
+FastAPI ejecuta los endpoints `def` en un pool de hilos, así que todas las
+operaciones se hacen bajo un lock. La caché se limita por cantidad de
+entradas y, opcionalmente, por bytes (según una función `size_of` que
+estima el tamaño de cada valor).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Caché LRU con límite de entradas, límite de memoria y TTL.
+
+    - max_entries: número máximo de entradas.
+    - max_bytes:   tamaño total máximo (None = sin límite).
+    - ttl:         segundos de vida de cada entrada (None = no expira).
+    - size_of:     función que estima el tamaño en bytes de un valor.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        *,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        size_of: Optional[Callable[[Any], int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser >= 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._size_of = size_of or (lambda _value: 0)
+        self._clock = clock
+        # key -> (valor, tamaño, instante de expiración)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # -------------------------------------------------------------------
+    # Acceso
+    # -------------------------------------------------------------------
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, _size, expires_at = item
+            if expires_at is not None and self._clock() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = self._size_of(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                # Un valor más grande que toda la caché no se guarda
+                return
+            expires_at = self._clock() + self.ttl if self.ttl is not None else None
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Devuelve el valor cacheado o lo calcula (fuera del lock) y lo guarda."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    # -------------------------------------------------------------------
+    # Mantenimiento
+    # -------------------------------------------------------------------
+
+    def clear(self) -> int:
+        """Vacía la caché y devuelve cuántas entradas se eliminaron."""
+        with self._lock:
+            n = len(self._data)
+            self._data.clear()
+            self._bytes = 0
+            return n
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _value, size, _expires_at = self._data.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
@@ -0,0 +1,247 @@
+# closed_forms.py
+"""
+Coeficientes de Taylor por fórmula cerrada para familias conocidas.
+
+Generaliza las derivadas de lab.py (derivada_seno, derivada_euler_exponencial,
+derivada_polinomio_*): para estas familias c_k = f⁽ᵏ⁾(a)/k! sale directo en
+O(1) por orden, sin derivar nada. Con u = p·x + q y t = p·a + q:
+
+- sin(u), cos(u):    c_k = p^k/k! · sin/cos(t + kπ/2)
+- sinh(u), cosh(u):  c_k = p^k/k! · (sinh t | cosh t según la paridad de k)
+- exp(u):            c_k = e^t · p^k/k!
+- u^α (1/(a+bx), (1+x)^α, sqrt(...)):
+                     c_k = C(α, k) · p^k · t^(α-k)
+- log(u):            c_0 = log t,  c_k = (-1)^(k+1) (p/t)^k / k
+- polinomios de cualquier grado (desplazamiento de Taylor con Horner)
+
+También se aceptan múltiplos constantes y sumas de estos términos. Todo lo
+demás lanza NoClosedForm y quien llama sigue con el motor general.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, List, Optional, Tuple
+
+import sympy as sp
+
+
+class NoClosedForm(ValueError):
+    """La expresión (o el centro pedido) no tiene fórmula cerrada acá."""
+
+
+class ClosedForm:
+    """Familia reconocida: nombre legible + función (center, order) → coefs."""
+
+    __slots__ = ("family", "_coefficients")
+
+    def __init__(self, family: str, coefficients: Callable[[float, int], List[float]]):
+        self.family = family
+        self._coefficients = coefficients
+
+    def coefficients(self, center: float, order: int) -> List[float]:
+        """[c_0..c_order] en `center`; NoClosedForm si el centro no sirve."""
+        try:
+            return self._coefficients(float(center), order)
+        except (OverflowError, ZeroDivisionError, ValueError) as exc:
+            if isinstance(exc, NoClosedForm):
+                raise
+            raise NoClosedForm(f"Fórmula cerrada no aplicable en a={center}: {exc}")
+
+
+# ============================================================
+# Fórmulas
+# ============================================================
+
+def _scales(p: float, order: int) -> List[float]:
+    """[p^k / k!] sin calcular k! (no se desborda en órdenes altos)."""
+    out = [1.0]
+    for k in range(1, order + 1):
+        out.append(out[-1] * p / k)
+    return out
+
+
+def _periodic(cycle: List[float], p: float, order: int) -> List[float]:
+    """c_k = p^k/k! · cycle[k mod len(cycle)] (sin, cos, sinh, cosh)."""
+    return [s * cycle[k % len(cycle)] for k, s in enumerate(_scales(p, order))]
+
+
+def _sin(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        s, c = math.sin(t), math.cos(t)
+        return _periodic([s, c, -s, -c], p, order)
+    return coefficients
+
+
+def _cos(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        s, c = math.sin(t), math.cos(t)
+        return _periodic([c, -s, -c, s], p, order)
+    return coefficients
+
+
+def _sinh(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        return _periodic([math.sinh(t), math.cosh(t)], p, order)
+    return coefficients
+
+
+def _cosh(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        return _periodic([math.cosh(t), math.sinh(t)], p, order)
+    return coefficients
+
+
+def _exp(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        e_t = math.exp(p * center + q)
+        return [e_t * s for s in _scales(p, order)]
+    return coefficients
+
+
+def _log(p: float, q: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        if t <= 0:
+            raise NoClosedForm(f"log fuera de su dominio en a={center}")
+        ratio = p / t
+        out = [math.log(t)]
+        power = 1.0
+        for k in range(1, order + 1):
+            power *= -ratio
+            out.append(-power / k)
+        return out
+    return coefficients
+
+
+def _power(p: float, q: float, alpha: float) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        t = p * center + q
+        if t == 0 or (t < 0 and not float(alpha).is_integer()):
+            raise NoClosedForm(f"(p·x + q)^α no es real/analítica en a={center}")
+        # C(α, k) p^k t^(α-k) = C(α, k-1) p^(k-1) t^(α-k+1) · (α-k+1)/k · p/t
+        out = [t ** alpha]
+        ratio = p / t
+        for k in range(1, order + 1):
+            out.append(out[-1] * (alpha - k + 1) / k * ratio)
+        return out
+    return coefficients
+
+
+def _polynomial(ascending: List[float]) -> Callable[[float, int], List[float]]:
+    def coefficients(center: float, order: int) -> List[float]:
+        # Desplazamiento de Taylor: Horner repetido sobre (x - a), O(d²)
+        shifted = list(ascending)
+        degree = len(shifted) - 1
+        for i in range(degree):
+            for j in range(degree - 1, i - 1, -1):
+                shifted[j] += center * shifted[j + 1]
+        shifted = shifted[: order + 1]
+        return shifted + [0.0] * (order + 1 - len(shifted))
+    return coefficients
+
+
+# ============================================================
+# Reconocimiento
+# ============================================================
+
+_FUNCTIONS = {
+    sp.sin: (_sin, "sin"),
+    sp.cos: (_cos, "cos"),
+    sp.sinh: (_sinh, "sinh"),
+    sp.cosh: (_cosh, "cosh"),
+    sp.exp: (_exp, "exp"),
+    sp.log: (_log, "log"),
+}
+
+
+def _number(expr: sp.Expr) -> float:
+    try:
+        value = float(sp.N(expr))
+    except (TypeError, ValueError):
+        raise NoClosedForm(f"{expr} no es una constante real")
+    if not math.isfinite(value):
+        raise NoClosedForm(f"{expr} no es finita")
+    return value
+
+
+def _linear(arg: sp.Expr, var: sp.Symbol) -> Tuple[float, float]:
+    """(p, q) si arg = p·x + q con p ≠ 0."""
+    poly = arg.as_poly(var)
+    if poly is None or poly.degree() != 1:
+        raise NoClosedForm(f"{arg} no es lineal en {var}")
+    p, q = (_number(c) for c in poly.all_coeffs())
+    return p, q
+
+
+def _polynomial_form(expr: sp.Expr, var: sp.Symbol) -> ClosedForm:
+    poly = expr.as_poly(var)
+    if poly is None:
+        raise NoClosedForm(f"{expr} no es un polinomio en {var}")
+    ascending = [_number(c) for c in reversed(poly.all_coeffs())]
+    return ClosedForm(f"polinomio de grado {poly.degree()}", _polynomial(ascending))
+
+
+def _term(expr: sp.Expr, var: sp.Symbol) -> ClosedForm:
+    if var not in expr.free_symbols or expr.is_polynomial(var):
+        return _polynomial_form(expr, var)
+
+    if expr.is_Mul:
+        const = [a for a in expr.args if var not in a.free_symbols]
+        rest = [a for a in expr.args if var in a.free_symbols]
+        if len(rest) != 1:
+            raise NoClosedForm(f"producto no soportado: {expr}")
+        inner = _term(rest[0], var)
+        factor = _number(sp.Mul(*const))
+        return ClosedForm(
+            inner.family,
+            lambda center, order: [factor * c for c in inner._coefficients(center, order)],
+        )
+
+    if isinstance(expr, sp.Pow):
+        base, exponent = expr.as_base_exp()
+        if var in exponent.free_symbols:
+            raise NoClosedForm(f"exponente variable: {expr}")
+        p, q = _linear(base, var)
+        alpha = _number(exponent)
+        label = sp.sstr(exponent) if exponent.is_Rational else f"{alpha:g}"
+        return ClosedForm(f"(p·x + q)^{label}", _power(p, q, alpha))
+
+    if isinstance(expr, sp.Function) and len(expr.args) == 1 and expr.func in _FUNCTIONS:
+        builder, name = _FUNCTIONS[expr.func]
+        p, q = _linear(expr.args[0], var)
+        return ClosedForm(f"{name}(p·x + q)", builder(p, q))
+
+    raise NoClosedForm(f"sin fórmula cerrada para {expr}")
+
+
+def match_closed_form(expr: sp.Expr, var: sp.Symbol) -> ClosedForm:
+    """
+    Reconoce expr como combinación lineal de familias con fórmula cerrada.
+    Lanza NoClosedForm si algún término no encaja.
+    """
+    if not expr.is_Add or expr.is_polynomial(var):
+        return _term(expr, var)
+
+    terms = [_term(arg, var) for arg in expr.args]
+
+    def coefficients(center: float, order: int) -> List[float]:
+        total = [0.0] * (order + 1)
+        for term in terms:
+            for k, c in enumerate(term._coefficients(center, order)):
+                total[k] += c
+        return total
+
+    return ClosedForm(" + ".join(term.family for term in terms), coefficients)
+
+
+def find_closed_form(expr: sp.Expr, var: sp.Symbol) -> Optional[ClosedForm]:
+    """Como match_closed_form, pero devuelve None si no hay fórmula cerrada."""
+    try:
+        return match_closed_form(expr, var)
+    except NoClosedForm:
+        return None
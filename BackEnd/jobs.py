@@ -0,0 +1,321 @@
+# jobs.py
+"""
+Cola de trabajos asíncronos para análisis caros (órdenes altos).
+
+- POST /taylor/jobs encola el trabajo y devuelve un id; un pool local de
+  hilos (TAYLOR_JOB_WORKERS) lo ejecuta aparte de los hilos de FastAPI.
+- El motor llama a Job.checkpoint() al terminar cada etapa y cada orden de
+  coeficientes: ahí se publica el progreso (que se transmite por SSE) y se
+  verifican la cancelación y los presupuestos de tiempo real y de CPU.
+  La verificación es cooperativa: una sola derivada muy cara se termina
+  antes de que el trabajo se corte.
+- Control de admisión por costo: cada trabajo trae un costo estimado y la
+  suma de lo que está en cola o corriendo no puede pasar de la capacidad.
+  Así los trabajos largos no acaparan la CPU que usa el tráfico interactivo.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Estados terminales de un trabajo
+FINISHED_STATES = ("done", "failed", "cancelled", "budget_exceeded")
+
+
+class JobCancelled(Exception):
+    """El trabajo fue cancelado por el usuario."""
+
+
+class JobBudgetExceeded(Exception):
+    """El trabajo superó su presupuesto de tiempo o de CPU."""
+
+
+class AdmissionRejected(Exception):
+    """No hay capacidad para aceptar el trabajo (o es demasiado caro)."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_cost(
+    node_count: int,
+    order: int,
+    engine: str,
+    *,
+    precision: str = "float",
+    dps: int = 50,
+) -> float:
+    """
+    Costo relativo de un análisis. En modo simbólico las derivadas crecen con
+    el orden, así que se estima cuadrático en n; en modo AD cada coeficiente
+    nuevo recorre los anteriores (también cuadrático) pero con floats, mucho
+    más barato; el motor de series hace esos mismos pasos en numpy. Los
+    modos "mp" / "exact" (y "auto", que puede terminar en mp) usan la misma
+    aritmética de series con números más lentos, que crecen con los dígitos.
+    """
+    n = order + 1
+    if precision != "float":
+        return max(1, node_count) * n * n / 10.0 * max(1.0, dps / 50.0)
+    if engine == "ad":
+        return max(1, node_count) * n * n / 100.0
+    if engine == "series":
+        return max(1, node_count) * n * n / 2000.0
+    return float(max(1, node_count) * n * n)
+
+
+# ============================================================
+# Trabajo
+# ============================================================
+
+class Job:
+    """Estado, eventos de progreso y presupuestos de un trabajo."""
+
+    def __init__(
+        self,
+        payload: Dict[str, Any],
+        cost: float,
+        *,
+        time_budget: float,
+        cpu_budget: float,
+    ):
+        self.id = uuid.uuid4().hex
+        self.payload = payload
+        self.cost = cost
+        self.time_budget = time_budget
+        self.cpu_budget = cpu_budget
+
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.progress: Dict[str, Any] = {}
+
+        self._cancel = threading.Event()
+        self._cond = threading.Condition()
+        self._events: List[Dict[str, Any]] = []
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    # -------------------------------------------------------------------
+    # Eventos
+    # -------------------------------------------------------------------
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        with self._cond:
+            event = {"seq": len(self._events), **event}
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def events_since(self, cursor: int) -> List[Dict[str, Any]]:
+        with self._cond:
+            return self._events[cursor:]
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def _set_status(self, status: str, **info) -> None:
+        self.status = status
+        if status in FINISHED_STATES:
+            self.finished_at = time.time()
+        self.emit({"type": "status", "status": status, **info})
+
+    # -------------------------------------------------------------------
+    # Cancelación y presupuestos
+    # -------------------------------------------------------------------
+
+    def cancel(self) -> bool:
+        """Pide la cancelación. Un trabajo en cola se cancela de inmediato."""
+        if self.finished:
+            return False
+        self._cancel.set()
+        if self.status == "queued":
+            self._set_status("cancelled")
+        return True
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._wall_start if self.started_at else 0.0
+
+    def cpu_used(self) -> float:
+        # thread_time: CPU del hilo que ejecuta el trabajo (solo válido en él)
+        return time.thread_time() - self._cpu_start
+
+    def checkpoint(self, stage: str, **info) -> None:
+        """Callback de progreso del motor: publica y verifica límites."""
+        if self._cancel.is_set():
+            raise JobCancelled("Trabajo cancelado.")
+        elapsed = self.elapsed()
+        cpu = self.cpu_used()
+        if elapsed > self.time_budget:
+            raise JobBudgetExceeded(
+                f"Se superó el presupuesto de tiempo ({self.time_budget:g} s) en la etapa '{stage}'."
+            )
+        if cpu > self.cpu_budget:
+            raise JobBudgetExceeded(
+                f"Se superó el presupuesto de CPU ({self.cpu_budget:g} s) en la etapa '{stage}'."
+            )
+        self.progress = {"stage": stage, **info}
+        self.emit({
+            "type": "progress",
+            "stage": stage,
+            **info,
+            "elapsed": round(elapsed, 4),
+            "cpu": round(cpu, 4),
+        })
+
+    def snapshot(self, include_result: bool = True) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "cost": self.cost,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "time_budget": self.time_budget,
+            "cpu_budget": self.cpu_budget,
+            "error": self.error,
+            "result": self.result if include_result else None,
+        }
+
+
+# ============================================================
+# Pool de trabajos
+# ============================================================
+
+class JobManager:
+    """
+    Ejecuta trabajos en un pool de hilos propio con control de admisión.
+
+    - run:          función (job) -> resultado; debe llamar a job.checkpoint.
+    - workers:      hilos del pool.
+    - capacity:     costo total máximo en cola + en ejecución.
+    - max_job_cost: costo máximo de un solo trabajo.
+    - retention:    segundos que se conserva un trabajo terminado.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Job], Dict[str, Any]],
+        *,
+        workers: int = 2,
+        capacity: float = 2_000_000.0,
+        max_job_cost: float = 1_000_000.0,
+        retention: float = 3600.0,
+    ):
+        self._run = run
+        self.workers = max(1, workers)
+        self.capacity = capacity
+        self.max_job_cost = max_job_cost
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="taylor-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _load(self) -> float:
+        return sum(job.cost for job in self._jobs.values() if not job.finished)
+
+    def _prune(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.retention
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(
+        self,
+        payload: Dict[str, Any],
+        cost: float,
+        *,
+        time_budget: float,
+        cpu_budget: float,
+    ) -> Job:
+        if cost > self.max_job_cost:
+            self.rejected += 1
+            raise AdmissionRejected(
+                f"Trabajo demasiado caro (costo estimado {cost:g}, máximo {self.max_job_cost:g}). "
+                "Pruebe con un orden menor o con engine='series'."
+            )
+        with self._lock:
+            self._prune()
+            load = self._load()
+            if load + cost > self.capacity:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    f"Sin capacidad para el trabajo (en curso {load:g} + {cost:g} > {self.capacity:g}).",
+                    retry_after=5.0,
+                )
+            job = Job(payload, cost, time_budget=time_budget, cpu_budget=cpu_budget)
+            self._jobs[job.id] = job
+        job.emit({"type": "status", "status": "queued", "cost": cost})
+        self._executor.submit(self._execute, job)
+        return job
+
+    def _execute(self, job: Job) -> None:
+        if job.finished:
+            return  # cancelado mientras estaba en cola
+        job.started_at = time.time()
+        job._wall_start = time.perf_counter()
+        job._cpu_start = time.thread_time()
+        job._set_status("running")
+        try:
+            job.result = self._run(job)
+        except JobCancelled:
+            job._set_status("cancelled")
+        except JobBudgetExceeded as e:
+            job.error = str(e)
+            job._set_status("budget_exceeded", error=job.error)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job._set_status("failed", error=job.error)
+        else:
+            job._set_status(
+                "done",
+                elapsed=round(job.elapsed(), 4),
+                cpu=round(job.cpu_used(), 4),
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_status: Dict[str, int] = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "max_job_cost": self.max_job_cost,
+                "load": self._load(),
+                "rejected": self.rejected,
+                "jobs": by_status,
+            }
+
+    def shutdown(self) -> None:
+        """Cancela lo pendiente y cierra el pool sin esperar."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,5 @@
 import math
 from typing import List
-from tabulate import tabulate
 import time
 
 # ============================================================
@@ -314,6 +313,8 @@ def medir_tiempo_y_iteraciones(func, *args, **kwargs):
 # ============================================================
 
 if __name__ == "__main__":
+    # Solo para imprimir las tablas: importar lab no requiere tabulate
+    from tabulate import tabulate
 
     punto_centro = 0.0
     orden_taylor = min(165, 10) - 1 # Asegurarse de que el orden no exceda el número de derivadas definidas 
@@ -0,0 +1,298 @@
+# latex_fast.py
+"""
+Parser liviano de LaTeX → SymPy para el subconjunto que envía MathLive.
+
+Evita cargar y ejecutar el parser ANTLR de `sympy.parsing.latex` en cada
+request. Cubre:
+
+- números, variables de una letra y multiplicación implícita (2x, xy),
+  que como en ANTLR liga más fuerte que * y / explícitos: 1/2x = 1/(2x)
+- + - * /, \\cdot, \\times, \\div y potencias ^{...} / ^n
+- paréntesis (), [], {} y \\left( ... \\right)
+- \\frac{a}{b}, \\sqrt{a}, \\sqrt[n]{a}
+- \\sin \\cos \\tan \\exp \\log \\ln \\arcsin \\arccos \\arctan
+  \\sinh \\cosh \\tanh, con o sin paréntesis (\\sin x, \\sin^2 x)
+- \\pi
+
+Cualquier otra construcción lanza UnsupportedLatex para que quien llama
+pueda recurrir al parser ANTLR. También la notación de Leibniz
+(\\frac{d}{dx} ..., \\frac{dy}{dx}), que ANTLR convierte en Derivative.
+
+Diferencias intencionales con parse_latex: \\log y \\ln producen log(u)
+natural (ANTLR arma log(u, E) sin evaluar, que manual_diff no sabe
+derivar) y \\pi produce sympy.pi en lugar de un símbolo "pi".
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+import sympy as sp
+
+
+class UnsupportedLatex(ValueError):
+    """La entrada usa LaTeX fuera del subconjunto que cubre este parser."""
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+|\\[,;:!\ ])
+  | (?P<command>\\[a-zA-Z]+)
+  | (?P<number>\d+(?:\.\d*)?|\.\d+)
+  | (?P<letter>[a-zA-Z])
+  | (?P<char>[-+*/^_()\[\]{}!|.,])
+    """,
+    re.VERBOSE,
+)
+
+# Delimitadores de tamaño: no aportan significado, se descartan al tokenizar
+_SIZING_COMMANDS = {r"\left", r"\right", r"\mleft", r"\mright", r"\displaystyle"}
+
+_FUNCTIONS = {
+    r"\sin": sp.sin,
+    r"\cos": sp.cos,
+    r"\tan": sp.tan,
+    r"\exp": sp.exp,
+    r"\log": sp.log,
+    r"\ln": sp.log,
+    r"\arcsin": sp.asin,
+    r"\arccos": sp.acos,
+    r"\arctan": sp.atan,
+    r"\sinh": sp.sinh,
+    r"\cosh": sp.cosh,
+    r"\tanh": sp.tanh,
+}
+
+_CONSTANTS = {
+    r"\pi": sp.pi,
+}
+
+_MUL_TOKENS = {"*", r"\cdot", r"\times"}
+_DIV_TOKENS = {"/", r"\div"}
+
+Token = Tuple[str, str]
+
+
+def _tokenize(src: str) -> List[Token]:
+    tokens: List[Token] = []
+    pos = 0
+    while pos < len(src):
+        m = _TOKEN_RE.match(src, pos)
+        if m is None:
+            raise UnsupportedLatex(f"Carácter no soportado en posición {pos}: {src[pos]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group()
+        if kind == "space" or (kind == "command" and text in _SIZING_COMMANDS):
+            continue
+        tokens.append((kind, text))
+    return tokens
+
+
+class _Parser:
+    """Descenso recursivo sobre la lista de tokens; construye objetos de SymPy."""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    # -- utilidades ------------------------------------------------------
+
+    def peek(self) -> str:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return ""
+
+    def peek_kind(self) -> str:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][0]
+        return ""
+
+    def take(self) -> str:
+        if self.pos >= len(self.tokens):
+            raise UnsupportedLatex("Fin de expresión inesperado.")
+        text = self.tokens[self.pos][1]
+        self.pos += 1
+        return text
+
+    def expect(self, text: str) -> None:
+        got = self.take()
+        if got != text:
+            raise UnsupportedLatex(f"Se esperaba {text!r} y llegó {got!r}.")
+
+    def starts_factor(self) -> bool:
+        kind, text = self.peek_kind(), self.peek()
+        if kind in ("number", "letter"):
+            return True
+        if text in ("(", "[", "{"):
+            return True
+        return text in _FUNCTIONS or text in _CONSTANTS or text in (r"\frac", r"\sqrt")
+
+    # -- gramática -------------------------------------------------------
+
+    def parse(self) -> sp.Expr:
+        if not self.tokens:
+            raise UnsupportedLatex("Expresión vacía.")
+        result = self.expr()
+        if self.pos != len(self.tokens):
+            raise UnsupportedLatex(f"Token inesperado: {self.peek()!r}")
+        return result
+
+    def expr(self) -> sp.Expr:
+        result = self.term()
+        while self.peek() in ("+", "-"):
+            if self.take() == "+":
+                result = result + self.term()
+            else:
+                result = result - self.term()
+        return result
+
+    def term(self) -> sp.Expr:
+        result = self.implicit_product()
+        while True:
+            tok = self.peek()
+            if tok in _MUL_TOKENS:
+                self.take()
+                result = result * self.implicit_product()
+            elif tok in _DIV_TOKENS:
+                self.take()
+                result = result / self.implicit_product()
+            else:
+                return result
+
+    def implicit_product(self) -> sp.Expr:
+        """
+        Multiplicación implícita: 2x, x\sin(x), (x+1)(x-1). Liga más fuerte
+        que * y / explícitos, igual que ANTLR: 1/2x es 1/(2x), no x/2.
+        """
+        result = self.unary()
+        while self.starts_factor():
+            result = result * self.power()
+        return result
+
+    def unary(self) -> sp.Expr:
+        if self.peek() == "-":
+            self.take()
+            return -self.unary()
+        if self.peek() == "+":
+            self.take()
+            return self.unary()
+        return self.power()
+
+    def power(self) -> sp.Expr:
+        base = self.primary()
+        while self.peek() == "^":
+            self.take()
+            base = base ** self.exponent()
+        if self.peek() in ("!", "_"):
+            raise UnsupportedLatex(f"Operador no soportado: {self.peek()!r}")
+        return base
+
+    def exponent(self) -> sp.Expr:
+        kind, tok = self.peek_kind(), self.peek()
+        if tok == "{":
+            return self.group()
+        if kind == "number":
+            return self.number(self.take())
+        if kind == "letter":
+            return sp.Symbol(self.take())
+        if tok in _CONSTANTS:
+            return _CONSTANTS[self.take()]
+        raise UnsupportedLatex(f"Exponente no soportado: {tok!r}")
+
+    def group_starts_with_d(self) -> bool:
+        """¿Lo que sigue es un grupo {d...}? (numerador o denominador de d/dx)"""
+        return (
+            self.peek() == "{"
+            and self.pos + 1 < len(self.tokens)
+            and self.tokens[self.pos + 1] == ("letter", "d")
+        )
+
+    def group(self) -> sp.Expr:
+        self.expect("{")
+        inner = self.expr()
+        self.expect("}")
+        return inner
+
+    @staticmethod
+    def number(text: str) -> sp.Expr:
+        if "." in text:
+            return sp.Float(text)
+        return sp.Integer(text)
+
+    def primary(self) -> sp.Expr:
+        kind, tok = self.peek_kind(), self.peek()
+
+        if kind == "number":
+            return self.number(self.take())
+        if kind == "letter":
+            return sp.Symbol(self.take())
+
+        if tok in ("(", "[", "{"):
+            closing = {"(": ")", "[": "]", "{": "}"}[self.take()]
+            inner = self.expr()
+            self.expect(closing)
+            return inner
+
+        if tok == r"\frac":
+            self.take()
+            leibniz = self.group_starts_with_d()
+            num = self.group()
+            if leibniz and self.group_starts_with_d():
+                raise UnsupportedLatex("Notación de Leibniz (\\frac{d}{dx}).")
+            den = self.group()
+            return num / den
+
+        if tok == r"\sqrt":
+            self.take()
+            if self.peek() == "[":
+                self.take()
+                index = self.expr()
+                self.expect("]")
+                return sp.root(self.group(), index)
+            return sp.sqrt(self.group())
+
+        if tok in _CONSTANTS:
+            return _CONSTANTS[self.take()]
+
+        if tok in _FUNCTIONS:
+            return self.function()
+
+        raise UnsupportedLatex(f"Construcción no soportada: {tok!r}")
+
+    def function(self) -> sp.Expr:
+        func = _FUNCTIONS[self.take()]
+
+        # \sin^2 x  →  sin(x)**2   (\sin^{-1} es ambiguo: se deja a ANTLR)
+        func_power = None
+        if self.peek() == "^":
+            self.take()
+            func_power = self.exponent()
+            if func_power.is_negative:
+                raise UnsupportedLatex("Potencia negativa de función (posible inversa).")
+        if self.peek() == "_":
+            raise UnsupportedLatex("Función con subíndice (p. ej. \\log_b).")
+
+        if self.peek() in ("(", "[", "{"):
+            arg = self.primary()
+        else:
+            # Argumento sin paréntesis: \sin 2x, \sin x y (hasta + - u otra función)
+            arg = self.power()
+            while self.starts_factor() and self.peek() not in _FUNCTIONS:
+                arg = arg * self.power()
+            if self.peek() in _MUL_TOKENS or self.peek() in _DIV_TOKENS:
+                raise UnsupportedLatex("Operador explícito dentro de un argumento sin paréntesis.")
+
+        result = func(arg)
+        if func_power is not None:
+            result = result ** func_power
+        return result
+
+
+def parse_latex_fast(src: str) -> sp.Expr:
+    """
+    Convierte LaTeX (subconjunto MathLive) en una expresión de SymPy.
+    Lanza UnsupportedLatex si la entrada se sale del subconjunto.
+    """
+    return _Parser(_tokenize(src)).parse()
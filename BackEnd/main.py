@@ -1,14 +1,67 @@
 # main.py
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Literal, Optional
 from pathlib import Path
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
+import numpy as np
+
+from caching import LRUCache
+from jobs import AdmissionRejected, Job, JobManager, estimate_cost
+from manual_diff import count_nodes
+from metrics import (
+    StageTimer,
+    activate,
+    cache_outcome,
+    observe_analysis,
+    render_metrics,
+    server_timing_header,
+)
+from persistent_store import get_store
+from plotting import shutdown_plot_pool, warm_up_plot_pool
+from profiling import (
+    SamplingProfiler,
+    clear_profiles,
+    list_profiles,
+    load_collapsed,
+    load_profile,
+    profiling_enabled,
+    save_profile,
+    should_profile,
+)
+from taylor_engine import (
+    ENGINE_CACHES,
+    SIMPLIFY_TIMEOUT_NOTE,
+    clear_engine_caches,
+    evaluar_taylor_en_puntos,
+    generar_taylor_con_analisis,
+    normalize_input_expression,
+    parse_input_cached,
+    render_taylor_plot,
+    shutdown_simplify_pool,
+    warm_up_engine,
+)
 
-from taylor_engine import generar_taylor_con_analisis
+
+# Órdenes mayores a este límite no se aceptan en los endpoints síncronos:
+# hay que usar POST /taylor/jobs
+SYNC_MAX_ORDER = int(os.environ.get("TAYLOR_SYNC_MAX_ORDER", "50"))
+JOB_MAX_ORDER = 1000
 
 
 # ============================================================
@@ -28,6 +81,120 @@ class TaylorRequest(BaseModel):
     plot_min: Optional[float] = Field(None)
     plot_max: Optional[float] = Field(None)
     num_points: int = Field(300, ge=10, le=2000)
+    include_plot: bool = Field(
+        False,
+        description="Si es True, embebe el PNG en base64. Si no, se pide aparte con plot_url.",
+    )
+    include_plot_series: bool = Field(
+        False,
+        description="Si es True, devuelve f(x) y P_k(x) como series float32 en base64 para graficar en el cliente.",
+    )
+    series_orders: Optional[List[int]] = Field(
+        None,
+        max_length=50,
+        description="Órdenes k de las sumas parciales P_k a incluir en plot_series (por defecto, solo n).",
+    )
+    series_max_points: int = Field(
+        400, ge=10, le=2000,
+        description="Puntos aproximados por serie tras la reducción LTTB.",
+    )
+    normalize: Optional[Literal["expand", "cancel"]] = Field(
+        None,
+        description="Normalización opcional entre órdenes para controlar el tamaño de las derivadas.",
+    )
+    engine: Literal["symbolic", "ad", "series"] = Field(
+        "symbolic",
+        description=(
+            "'symbolic' deriva a mano; 'ad' calcula los coeficientes con aritmética de series "
+            "(solo numérico); 'series' hace lo mismo con arreglos de numpy y productos por FFT, "
+            "para órdenes altos."
+        ),
+    )
+    detail: Literal["none", "summary", "full"] = Field(
+        "summary",
+        description=(
+            "Log de pasos: 'none' no lo genera, 'summary' muestra cada derivada tal cual "
+            "y 'full' intenta simplificarlas (con un presupuesto de tiempo)."
+        ),
+    )
+    precision: Literal["float", "auto", "mp", "exact"] = Field(
+        "float",
+        description=(
+            "Aritmética de los coeficientes: 'float', 'mp' (mpmath con dps dígitos), "
+            "'exact' (fracciones, solo funciones racionales) o 'auto' (float si alcanza)."
+        ),
+    )
+    dps: int = Field(50, ge=16, le=2000, description="Dígitos decimales del modo 'mp'.")
+
+
+class TaylorJobRequest(TaylorRequest):
+    order: int = Field(5, ge=0, le=JOB_MAX_ORDER, description="Orden n del polinomio.")
+    time_budget_s: Optional[float] = Field(
+        None, gt=0,
+        description="Tiempo real máximo de ejecución (acotado por el máximo del servidor).",
+    )
+    cpu_budget_s: Optional[float] = Field(
+        None, gt=0,
+        description="Tiempo de CPU máximo (acotado por el máximo del servidor).",
+    )
+
+
+class PlotSpec(BaseModel):
+    """
+    Lo que hace falta para dibujar una gráfica. Viaja codificado en plot_url,
+    así que se valida con los mismos límites que un trabajo.
+    """
+    expression: str
+    input_is_latex: bool = True
+    center: float = 0.0
+    order: int = Field(5, ge=0, le=JOB_MAX_ORDER)
+    plot_min: Optional[float] = None
+    plot_max: Optional[float] = None
+    num_points: int = Field(300, ge=10, le=2000)
+    normalize: Optional[Literal["expand", "cancel"]] = None
+    engine: Literal["symbolic", "ad", "series"] = "symbolic"
+
+
+class TaylorBatchRequest(BaseModel):
+    jobs: List[TaylorRequest] = Field(..., min_length=1, max_length=5000)
+    include_plot: bool = Field(False, description="Generar la gráfica PNG de cada trabajo.")
+    include_steps: bool = Field(False, description="Generar el log de pasos de cada trabajo.")
+
+
+MAX_EVAL_POINTS = 1_000_000
+
+
+class TaylorEvaluateRequest(BaseModel):
+    expression: str = Field(..., description="Expresión de entrada (LaTeX o texto tipo SymPy).")
+    center: float = Field(0.0, description="Centro de la expansión de Taylor (a).")
+    order: int = Field(5, ge=0, description="Orden n del polinomio.")
+    input_is_latex: bool = Field(True)
+    normalize: Optional[Literal["expand", "cancel"]] = Field(None)
+    engine: Literal["symbolic", "ad", "series"] = Field("symbolic")
+    xs: Optional[List[float]] = Field(
+        None,
+        max_length=MAX_EVAL_POINTS,
+        description="Puntos de evaluación. Si se omite, se usa linspace(x_min, x_max, num_points).",
+    )
+    x_min: Optional[float] = Field(None)
+    x_max: Optional[float] = Field(None)
+    num_points: int = Field(1000, ge=1, le=MAX_EVAL_POINTS)
+    include_partials: bool = Field(False, description="Incluir P_0..P_n en cada punto.")
+
+
+class TaylorEvaluateResponse(BaseModel):
+    expression_sympy_str: str
+    center: float
+    order: int
+    coefficients: List[Optional[float]]
+    x: List[float]
+    approx: List[Optional[float]]
+    exact: List[Optional[float]]
+    abs_error: List[Optional[float]]
+    derivative_approx: List[Optional[float]]
+    derivative_exact: List[Optional[float]]
+    derivative_abs_error: List[Optional[float]]
+    partials: Optional[List[List[Optional[float]]]] = None
 
 
 class ErrorMetrics(BaseModel):
@@ -37,13 +204,32 @@ class ErrorMetrics(BaseModel):
 
 class ConvergenceRow(BaseModel):
     order: int
-    approx: float
+    approx: Optional[float]
     exact: Optional[float]
     abs_error: Optional[float]
     rel_error: Optional[float]
     rel_error_pct: Optional[float]
 
 
+class PrecisionInfo(BaseModel):
+    requested: str
+    mode: str
+    digits: Optional[int]
+
+
+class PartialSeries(BaseModel):
+    order: int
+    values: str
+
+
+class PlotSeries(BaseModel):
+    encoding: str
+    count: int
+    x: str
+    f: str
+    partials: List[PartialSeries]
+
+
 class TaylorAnalysisResponse(BaseModel):
     expression_input: str
     input_is_latex: bool
@@ -53,7 +239,15 @@ class TaylorAnalysisResponse(BaseModel):
     x_eval: float
     order: int
 
-    coefficients: List[float]
+    # ±inf / nan (fuera del rango float) van como null; el valor completo
+    # está en coefficients_exact en los modos mp y exact
+    coefficients: List[Optional[float]]
+    coefficients_exact: Optional[List[str]] = None
+    precision: Optional[PrecisionInfo] = None
+
+    # Tamaño de cada derivada como árbol y como DAG (subárboles compartidos)
+    derivative_node_counts: Optional[List[int]]
+    derivative_dag_node_counts: Optional[List[int]] = None
 
     polynomial_sympy_str: str
     polynomial_latex: str
@@ -70,18 +264,98 @@ class TaylorAnalysisResponse(BaseModel):
     convergence_table: List[ConvergenceRow]
 
     plot_base64_png: Optional[str]
+    plot_series: Optional[PlotSeries] = None
+    plot_id: Optional[str] = None
+    plot_url: Optional[str] = None
 
     steps: List[str]
 
 
+class BatchJobResult(BaseModel):
+    index: int
+    ok: bool
+    result: Optional[TaylorAnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class TaylorBatchResponse(BaseModel):
+    results: List[BatchJobResult]
+
+
+class TaylorJobAccepted(BaseModel):
+    job_id: str
+    status: str
+    cost: float
+    status_url: str
+    events_url: str
+
+
+class TaylorJobStatus(BaseModel):
+    job_id: str
+    status: Literal["queued", "running", "done", "failed", "cancelled", "budget_exceeded"]
+    cost: float
+    progress: Dict[str, Any]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    time_budget: float
+    cpu_budget: float
+    error: Optional[str]
+    result: Optional[TaylorAnalysisResponse]
+
+
 # ============================================================
 # FastAPI app
 # ============================================================
 
+# Precalentamiento: corre en un hilo al arrancar para que el proceso acepte
+# conexiones enseguida; /health/ready responde 503 hasta que termina.
+# TAYLOR_WARMUP=0 lo desactiva (p. ej. en desarrollo).
+WARMUP_ENABLED = os.environ.get("TAYLOR_WARMUP", "1") != "0"
+WARMUP: Dict[str, Any] = {
+    "state": "pending",
+    "started_at": None,
+    "finished_at": None,
+    "timings": {},
+    "error": None,
+}
+
+
+def run_warm_up() -> None:
+    WARMUP.update(state="warming", started_at=time.time())
+    try:
+        timings = warm_up_engine()
+        start = time.perf_counter()
+        if warm_up_plot_pool():
+            timings["plot_pool"] = round(time.perf_counter() - start, 4)
+    except Exception as e:
+        # La API funciona igual (en frío): se informa y no se bloquea readiness
+        WARMUP.update(state="failed", error=f"{type(e).__name__}: {e}")
+    else:
+        WARMUP.update(state="ready", timings=timings)
+    finally:
+        WARMUP["finished_at"] = time.time()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if WARMUP_ENABLED:
+        threading.Thread(target=run_warm_up, name="taylor-warmup", daemon=True).start()
+    else:
+        WARMUP["state"] = "skipped"
+    yield
+    # Cerrar el pool de trabajos y el pool de procesos del renderer
+    JOBS.shutdown()
+    STREAM_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+    shutdown_plot_pool()
+    shutdown_simplify_pool()
+
+
 app = FastAPI(
     title="TaylorLab API",
     description="API académica para análisis de series de Taylor.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Permitir conexión desde frontend local o deploy
@@ -93,6 +367,123 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ============================================================
+# Caché de resultados de /taylor/analyze
+# ============================================================
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    raw = os.environ.get(name)
+    if raw is None or raw == "":
+        return default
+    value = float(raw)
+    return value if value > 0 else None
+
+
+# Límites configurables por entorno (0 o negativo = sin límite de MB / TTL)
+_CACHE_MAX_MB = _env_float("TAYLOR_CACHE_MAX_MB", 64.0)
+
+RESULT_CACHE = LRUCache(
+    max_entries=int(os.environ.get("TAYLOR_CACHE_MAX_ENTRIES", "512")),
+    max_bytes=int(_CACHE_MAX_MB * 1024 * 1024) if _CACHE_MAX_MB is not None else None,
+    ttl=_env_float("TAYLOR_CACHE_TTL_SECONDS", 3600.0),
+    size_of=lambda result: len(json.dumps(result)),
+)
+
+
+def _normalized_expression(expression: str) -> str:
+    """Expresión canónica para la clave de caché (aliases + espacios)."""
+    return re.sub(r"\s+", " ", normalize_input_expression(expression)).strip()
+
+
+def result_cache_key(
+    req: TaylorRequest,
+    *,
+    include_plot: bool = True,
+    include_steps: bool = True,
+) -> str:
+    """
+    Clave de contenido de una request: hash de la expresión normalizada y de
+    todos los parámetros que cambian el resultado.
+    """
+    payload = req.model_dump()
+    payload["expression"] = _normalized_expression(req.expression)
+    payload["include_plot"] = include_plot
+    payload["include_steps"] = include_steps
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# Gráficas bajo demanda: la respuesta del análisis trae un id y el PNG se
+# renderiza (y se cachea) recién cuando alguien hace GET /taylor/plot/{id}.
+# La especificación va codificada en la propia URL (?spec=...), así que
+# cualquier worker puede atenderla sin estado compartido.
+PLOT_PNG_CACHE = LRUCache(
+    max_entries=256,
+    max_bytes=int(_CACHE_MAX_MB * 1024 * 1024) if _CACHE_MAX_MB is not None else None,
+    size_of=len,
+)
+
+
+def _plot_spec_json(spec: PlotSpec) -> str:
+    return json.dumps(spec.model_dump(), sort_keys=True, separators=(",", ":"))
+
+
+def _plot_id(canonical: str) -> str:
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def register_plot(req: TaylorRequest) -> Dict[str, str]:
+    """Devuelve plot_id (hash de contenido) y la plot_url que lleva la especificación."""
+    fields = {name: getattr(req, name) for name in PlotSpec.model_fields}
+    fields["expression"] = _normalized_expression(req.expression)
+    spec = PlotSpec(**fields)
+    canonical = _plot_spec_json(spec)
+    plot_id = _plot_id(canonical)
+    encoded = base64.urlsafe_b64encode(canonical.encode("utf-8")).decode("ascii").rstrip("=")
+    return {"plot_id": plot_id, "plot_url": f"/taylor/plot/{plot_id}?spec={encoded}"}
+
+
+def decode_plot_spec(plot_id: str, encoded: str) -> PlotSpec:
+    """
+    Decodifica y valida la especificación de ?spec=. El id tiene que ser el
+    hash de esa misma especificación (ETag y clave de la caché de PNG).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+        spec = PlotSpec.model_validate_json(raw)
+    except (binascii.Error, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Especificación de gráfica inválida: {e}")
+    if _plot_id(_plot_spec_json(spec)) != plot_id:
+        raise HTTPException(
+            status_code=404,
+            detail="La especificación no corresponde a la gráfica; vuelva a llamar a /taylor/analyze.",
+        )
+    return spec
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Protege los endpoints de administración. Si la variable de entorno
+    TAYLOR_ADMIN_TOKEN está definida, hay que enviarla en X-Admin-Token.
+    """
+    expected = os.environ.get("TAYLOR_ADMIN_TOKEN")
+    if expected and x_admin_token != expected:
+        raise HTTPException(status_code=403, detail="Token de administración inválido.")
+
+
+def require_profiling_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Como require_admin, pero sin TAYLOR_ADMIN_TOKEN el perfilado (y sus
+    perfiles, que guardan la request completa) queda desactivado.
+    """
+    if not profiling_enabled():
+        raise HTTPException(
+            status_code=403,
+            detail="Perfilado desactivado: configure TAYLOR_ADMIN_TOKEN.",
+        )
+    require_admin(x_admin_token)
+
+
 # ============================================================
 # Taylor endpoint
 # ============================================================
@@ -103,7 +494,125 @@ app.add_middleware(
     tags=["taylor"],
     summary="Analiza una función usando Taylor",
 )
-def analyze_taylor(req: TaylorRequest):
+def analyze_taylor(
+    req: TaylorRequest,
+    response: Response,
+    profile: bool = Query(False, description="Perfilar esta request (requiere token de administración)."),
+    x_profile: Optional[str] = Header(None),
+    x_admin_token: Optional[str] = Header(None),
+):
+    check_sync_order(req.order)
+    requested = profile or x_profile in ("1", "true")
+    if requested:
+        require_profiling_admin(x_admin_token)
+    timer = StageTimer()
+    if should_profile(requested):
+        result, cache_status = run_profiled_analysis(req, timer, response)
+    else:
+        result, cache_status = run_analysis(req, include_plot=req.include_plot, timer=timer)
+    response.headers["X-Cache"] = cache_status
+    response.headers["Server-Timing"] = server_timing_header(timer)
+    return result
+
+
+def run_profiled_analysis(req: TaylorRequest, timer: StageTimer, response: Response):
+    """
+    run_analysis bajo el profiler por muestreo, sin leer la caché de
+    resultados (un HIT no tendría nada que perfilar). El perfil se guarda
+    aunque el análisis falle; su id va en el header X-Profile-Id, también
+    en la respuesta de error.
+    """
+    profiler = SamplingProfiler()
+    outcome = error = None
+    try:
+        with profiler:
+            outcome = run_analysis(
+                req, include_plot=req.include_plot, timer=timer, use_cache=False
+            )
+    except Exception as e:
+        error = e
+    profile_id = save_profile(profiler, req.model_dump(), {
+        "stages_ms": timer.stages,
+        "node_counts": timer.node_counts,
+        "cache": timer.cache,
+        "error": f"{type(error).__name__}: {error}" if error is not None else None,
+    })
+    if error is None:
+        response.headers["X-Profile-Id"] = profile_id
+        return outcome
+
+    headers = {"X-Profile-Id": profile_id}
+    if isinstance(error, HTTPException):
+        raise HTTPException(
+            status_code=error.status_code,
+            detail=error.detail,
+            headers={**(error.headers or {}), **headers},
+        ) from error
+    raise HTTPException(
+        status_code=500,
+        detail=f"Error durante el análisis perfilado ({type(error).__name__}).",
+        headers=headers,
+    ) from error
+
+
+def check_sync_order(order: int) -> None:
+    if order > SYNC_MAX_ORDER:
+        raise HTTPException(
+            status_code=422,
+            detail=(
+                f"order={order} supera el máximo síncrono ({SYNC_MAX_ORDER}); "
+                "use POST /taylor/jobs para órdenes altos."
+            ),
+        )
+
+
+def run_analysis(
+    req: TaylorRequest,
+    *,
+    include_plot: bool = True,
+    include_steps: bool = True,
+    progress=None,
+    timer: Optional[StageTimer] = None,
+    use_cache: bool = True,
+):
+    """
+    Ejecuta generar_taylor_con_analisis para una request, pasando antes por
+    la caché de resultados. Devuelve (resultado, "HIT" | "MISS").
+    `progress` se pasa al motor (lo usan los trabajos asíncronos).
+    Con include_steps=False no se generan pasos, sea cual sea req.detail.
+
+    Los tiempos por etapa quedan en `timer` (para el header Server-Timing)
+    y en los histogramas de /metrics. Con use_cache=False no se lee la
+    caché de resultados (el resultado sí se guarda).
+    """
+    timer = timer if timer is not None else StageTimer()
+    start = time.perf_counter()
+    with activate(timer):
+        result, cache_status = _cached_analysis(
+            req, include_plot, include_steps, progress, use_cache
+        )
+    timer.elapsed_ms = (time.perf_counter() - start) * 1e3
+    timer.cache = cache_outcome(cache_status == "HIT", timer)
+    observe_analysis(timer, req.order)
+    return result, cache_status
+
+
+def _cached_analysis(
+    req: TaylorRequest,
+    include_plot: bool,
+    include_steps: bool,
+    progress,
+    use_cache: bool,
+):
+    cache_key = result_cache_key(
+        req, include_plot=include_plot, include_steps=include_steps
+    )
+    plot_handle = register_plot(req)
+
+    cached = RESULT_CACHE.get(cache_key) if use_cache else None
+    if cached is not None:
+        return {**cached, "expression_input": req.expression, **plot_handle}, "HIT"
+
     plot_limits = None
     if req.plot_min is not None and req.plot_max is not None:
         plot_limits = (req.plot_min, req.plot_max)
@@ -116,11 +625,489 @@ def analyze_taylor(req: TaylorRequest):
         input_is_latex=req.input_is_latex,
         plot_limits=plot_limits,
         num_points=req.num_points,
+        normalize=req.normalize,
+        engine=req.engine,
+        include_plot=include_plot,
+        detail=req.detail if include_steps else "none",
+        include_plot_series=req.include_plot_series,
+        series_orders=req.series_orders,
+        series_max_points=req.series_max_points,
+        precision=req.precision,
+        dps=req.dps,
+        progress=progress,
     )
 
+    result.update(plot_handle)
+    # Con pasos que no alcanzaron a simplificarse, la próxima request reintenta
+    if not any(SIMPLIFY_TIMEOUT_NOTE in step for step in result["steps"]):
+        RESULT_CACHE.set(cache_key, result)
+    return result, "MISS"
+
+
+# Análisis en streaming: cada request corre en este pool y va publicando
+# eventos en una cola que consume la respuesta NDJSON
+STREAM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("TAYLOR_STREAM_WORKERS", "8")),
+    thread_name_prefix="taylor-stream",
+)
+_STREAM_END = object()
+
+
+class _StreamAbandoned(Exception):
+    """El cliente cerró la conexión: se deja de calcular."""
+
+
+@app.post(
+    "/taylor/analyze/stream",
+    tags=["taylor"],
+    summary="Analiza una función y transmite el resultado por etapas (NDJSON)",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+def analyze_taylor_stream(req: TaylorRequest):
+    """
+    Una línea JSON por evento, con un campo `type`:
+
+    - parse, exact: expresión interpretada y f(x_eval).
+    - coefficients: c_k y su fila de la tabla de convergencia, apenas se
+      calcula cada orden.
+    - evaluation: P_n, derivadas y errores en x_eval.
+    - polynomial, plot, plot_series: las partes caras, al final.
+    - result: la respuesta completa (igual a /taylor/analyze), o error.
+    """
+    check_sync_order(req.order)
+    events: "queue.Queue" = queue.Queue()
+    abandoned = threading.Event()
+
+    def progress(stage: str, **info) -> None:
+        if abandoned.is_set():
+            raise _StreamAbandoned()
+        events.put({"type": stage, **info})
+
+    def work() -> None:
+        try:
+            result, cache_status = run_analysis(
+                req, include_plot=req.include_plot, progress=progress
+            )
+            if cache_status == "HIT":
+                # Sin cálculo no hubo eventos: se reconstruyen las filas
+                for row in result["convergence_table"]:
+                    events.put({
+                        "type": "coefficients",
+                        "order": row["order"],
+                        "of": req.order,
+                        "coefficient": result["coefficients"][row["order"]],
+                        "row": row,
+                    })
+            events.put({"type": "result", "cache": cache_status, "result": result})
+        except _StreamAbandoned:
+            pass
+        except (ValueError, NotImplementedError) as e:
+            events.put({"type": "error", "status": 422, "detail": str(e)})
+        except Exception as e:
+            events.put({"type": "error", "status": 500, "detail": f"{type(e).__name__}: {e}"})
+        finally:
+            events.put(_STREAM_END)
+
+    STREAM_EXECUTOR.submit(work)
+
+    def stream():
+        try:
+            while True:
+                event = events.get()
+                if event is _STREAM_END:
+                    return
+                yield json.dumps(event) + "\n"
+        finally:
+            abandoned.set()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get(
+    "/taylor/plot/{plot_id}",
+    tags=["taylor"],
+    summary="PNG de f(x) y su polinomio de Taylor (bajo demanda)",
+    response_class=Response,
+    responses={200: {"content": {"image/png": {}}}},
+)
+def get_plot(
+    plot_id: str,
+    request: Request,
+    spec: str = Query(..., description="Especificación codificada (viene en plot_url)."),
+):
+    plot = decode_plot_spec(plot_id, spec)
+
+    # El id es un hash del contenido, así que sirve directamente como ETag
+    etag = f'"{plot_id}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    def render() -> bytes:
+        plot_limits = None
+        if plot.plot_min is not None and plot.plot_max is not None:
+            plot_limits = (plot.plot_min, plot.plot_max)
+        return render_taylor_plot(
+            plot.expression,
+            plot.center,
+            plot.order,
+            input_is_latex=plot.input_is_latex,
+            plot_limits=plot_limits,
+            num_points=plot.num_points,
+            normalize=plot.normalize,
+            engine=plot.engine,
+        )
+
+    try:
+        png = PLOT_PNG_CACHE.get_or_compute(plot_id, render)
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+@app.post(
+    "/taylor/analyze/batch",
+    response_model=TaylorBatchResponse,
+    tags=["taylor"],
+    summary="Analiza muchos trabajos de Taylor en una sola llamada",
+)
+def analyze_taylor_batch(batch: TaylorBatchRequest):
+    """
+    Procesa los trabajos agrupados por expresión, para que el parseo y la
+    torre de derivadas (cacheados en el motor) se calculen una vez por grupo
+    y se reutilicen con cada centro / orden. Los resultados vuelven en el
+    orden original, con un error por trabajo si alguno falla.
+    """
+    order_of_work = sorted(
+        range(len(batch.jobs)),
+        key=lambda i: (
+            batch.jobs[i].input_is_latex,
+            _normalized_expression(batch.jobs[i].expression),
+            batch.jobs[i].center,
+            batch.jobs[i].order,
+        ),
+    )
+
+    results: List[Optional[BatchJobResult]] = [None] * len(batch.jobs)
+    for i in order_of_work:
+        try:
+            check_sync_order(batch.jobs[i].order)
+            result, _ = run_analysis(
+                batch.jobs[i],
+                include_plot=batch.include_plot,
+                include_steps=batch.include_steps,
+            )
+            results[i] = BatchJobResult(index=i, ok=True, result=result)
+        except HTTPException as e:
+            results[i] = BatchJobResult(index=i, ok=False, error=str(e.detail))
+        except Exception as e:
+            results[i] = BatchJobResult(index=i, ok=False, error=f"{type(e).__name__}: {e}")
+
+    return {"results": results}
+
+
+def _json_array(values: np.ndarray) -> list:
+    """Arreglo NumPy → lista JSON, con NaN/inf como null."""
+    out = values.astype(object)
+    out[~np.isfinite(values)] = None
+    return out.tolist()
+
+
+@app.post(
+    "/taylor/evaluate",
+    response_model=TaylorEvaluateResponse,
+    tags=["taylor"],
+    summary="Evalúa P_n, P_n', f y f' sobre muchos puntos",
+)
+def evaluate_taylor(req: TaylorEvaluateRequest):
+    check_sync_order(req.order)
+    if req.xs is not None:
+        xs = np.asarray(req.xs, dtype=float)
+    elif req.x_min is not None and req.x_max is not None:
+        xs = np.linspace(req.x_min, req.x_max, req.num_points)
+    else:
+        raise HTTPException(
+            status_code=422,
+            detail="Hay que enviar 'xs' o bien 'x_min' y 'x_max'.",
+        )
+
+    try:
+        arrays = evaluar_taylor_en_puntos(
+            req.expression,
+            req.center,
+            req.order,
+            xs,
+            input_is_latex=req.input_is_latex,
+            normalize=req.normalize,
+            engine=req.engine,
+            include_partials=req.include_partials,
+        )
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    content = {
+        "expression_sympy_str": arrays["expression_sympy_str"],
+        "center": req.center,
+        "order": req.order,
+        "coefficients": _json_array(np.asarray(arrays["coefficients"], dtype=float)),
+        "partials": None,
+    }
+    for name in ("x", "approx", "exact", "abs_error",
+                 "derivative_approx", "derivative_exact", "derivative_abs_error"):
+        content[name] = _json_array(arrays[name])
+    if req.include_partials:
+        content["partials"] = [_json_array(row) for row in arrays["partials"]]
+
+    # Respuesta directa: con cientos de miles de puntos, revalidar cada
+    # float con Pydantic cuesta más que el cálculo en sí
+    return JSONResponse(content)
+
+
+# ============================================================
+# Trabajos asíncronos (órdenes altos)
+# ============================================================
+
+JOB_TIME_BUDGET = float(os.environ.get("TAYLOR_JOB_TIME_BUDGET", "300"))
+JOB_CPU_BUDGET = float(os.environ.get("TAYLOR_JOB_CPU_BUDGET", "240"))
+
+
+def _run_job(job: Job) -> Dict[str, Any]:
+    req = TaylorJobRequest(**job.payload)
+    result, _ = run_analysis(req, include_plot=req.include_plot, progress=job.checkpoint)
     return result
 
 
+JOBS = JobManager(
+    _run_job,
+    workers=int(os.environ.get("TAYLOR_JOB_WORKERS", "2")),
+    capacity=float(os.environ.get("TAYLOR_JOB_CAPACITY", "2000000")),
+    max_job_cost=float(os.environ.get("TAYLOR_JOB_MAX_COST", "1000000")),
+)
+
+
+def _get_job(job_id: str) -> Job:
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo desconocido o expirado.")
+    return job
+
+
+@app.post(
+    "/taylor/jobs",
+    response_model=TaylorJobAccepted,
+    status_code=202,
+    tags=["jobs"],
+    summary="Encola un análisis caro y devuelve un id de trabajo",
+)
+def submit_job(req: TaylorJobRequest):
+    try:
+        sym_expr = parse_input_cached(req.expression, req.input_is_latex)
+    except (ValueError, NotImplementedError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    cost = estimate_cost(
+        count_nodes(sym_expr), req.order, req.engine,
+        precision=req.precision, dps=req.dps,
+    )
+
+    try:
+        job = JOBS.submit(
+            req.model_dump(),
+            cost,
+            time_budget=min(req.time_budget_s or JOB_TIME_BUDGET, JOB_TIME_BUDGET),
+            cpu_budget=min(req.cpu_budget_s or JOB_CPU_BUDGET, JOB_CPU_BUDGET),
+        )
+    except AdmissionRejected as e:
+        headers = {"Retry-After": str(int(e.retry_after))} if e.retry_after else None
+        status = 429 if e.retry_after else 413
+        raise HTTPException(status_code=status, detail=str(e), headers=headers)
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "cost": job.cost,
+        "status_url": f"/taylor/jobs/{job.id}",
+        "events_url": f"/taylor/jobs/{job.id}/events",
+    }
+
+
+@app.get(
+    "/taylor/jobs/{job_id}",
+    response_model=TaylorJobStatus,
+    tags=["jobs"],
+    summary="Estado, progreso y (al terminar) resultado de un trabajo",
+)
+def get_job(job_id: str):
+    return _get_job(job_id).snapshot()
+
+
+@app.delete(
+    "/taylor/jobs/{job_id}",
+    response_model=TaylorJobStatus,
+    tags=["jobs"],
+    summary="Cancela un trabajo en cola o en ejecución",
+)
+def cancel_job(job_id: str):
+    job = _get_job(job_id)
+    job.cancel()
+    return job.snapshot(include_result=False)
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@app.get(
+    "/taylor/jobs/{job_id}/events",
+    tags=["jobs"],
+    summary="Progreso del trabajo como Server-Sent Events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def job_events(job_id: str, last_event_id: Optional[str] = Header(None)):
+    """
+    Un evento `progress` por etapa y por orden de coeficientes, y eventos
+    `status` (queued, running, done, failed, cancelled, budget_exceeded).
+    El stream se cierra al terminar el trabajo; el resultado se pide con
+    GET /taylor/jobs/{id}. Last-Event-ID permite reanudar.
+    """
+    job = _get_job(job_id)
+    cursor = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    async def stream():
+        nonlocal cursor
+        idle = 0.0
+        while True:
+            events = job.events_since(cursor)
+            for event in events:
+                yield _sse(event)
+            cursor += len(events)
+            if job.finished and not job.events_since(cursor):
+                return
+            if events:
+                idle = 0.0
+            elif idle >= 15.0:
+                yield ": keepalive\n\n"
+                idle = 0.0
+            await asyncio.sleep(0.1)
+            idle += 0.1
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+# Administración
+# ============================================================
+
+@app.get("/admin/cache", tags=["admin"], dependencies=[Depends(require_admin)])
+def cache_stats():
+    """
+    Contadores de la caché de resultados, de las cachés por etapa del motor
+    y del almacén persistente del host (None si está desactivado).
+    """
+    store = get_store()
+    return {
+        "results": RESULT_CACHE.stats(),
+        "plot_png": PLOT_PNG_CACHE.stats(),
+        **{name: cache.stats() for name, cache in ENGINE_CACHES.items()},
+        "store": store.stats() if store is not None else None,
+    }
+
+
+@app.get("/admin/jobs", tags=["admin"], dependencies=[Depends(require_admin)])
+def job_stats():
+    """Carga, capacidad y trabajos por estado de la cola asíncrona."""
+    return JOBS.stats()
+
+
+@app.delete("/admin/cache", tags=["admin"], dependencies=[Depends(require_admin)])
+def clear_cache():
+    """
+    Vacía la caché de resultados y las cachés por etapa de este worker. El
+    almacén persistente es compartido por el host y se administra offline
+    (python persistent_store.py clear | rebuild).
+    """
+    return {
+        "cleared": RESULT_CACHE.clear() + PLOT_PNG_CACHE.clear(),
+        "cleared_engine": clear_engine_caches(),
+    }
+
+
+@app.get("/admin/profiles", tags=["admin"], dependencies=[Depends(require_profiling_admin)])
+def profiles_index():
+    """
+    Perfiles guardados (más nuevo primero). Se generan con
+    POST /taylor/analyze?profile=1 (o el header X-Profile: 1) o por muestreo
+    con TAYLOR_PROFILE_SAMPLE_RATE.
+    """
+    return {"profiles": list_profiles()}
+
+
+@app.get("/admin/profiles/{profile_id}", tags=["admin"], dependencies=[Depends(require_profiling_admin)])
+def profile_detail(profile_id: str):
+    """Request completa (para reproducirla), tiempos por etapa y muestras."""
+    try:
+        return load_profile(profile_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Perfil desconocido.")
+
+
+@app.get(
+    "/admin/profiles/{profile_id}/collapsed",
+    tags=["admin"],
+    dependencies=[Depends(require_profiling_admin)],
+    response_class=PlainTextResponse,
+)
+def profile_collapsed(profile_id: str):
+    """Pilas en formato collapsed (flamegraph.pl, speedscope, inferno)."""
+    try:
+        return PlainTextResponse(load_collapsed(profile_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Perfil desconocido.")
+
+
+@app.delete("/admin/profiles", tags=["admin"], dependencies=[Depends(require_profiling_admin)])
+def delete_profiles():
+    """Borra todos los perfiles guardados."""
+    return {"cleared": clear_profiles()}
+
+
+@app.get("/metrics", tags=["meta"], response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Histogramas de latencia por etapa, grupo de orden y resultado de caché
+    (hit / warm / miss), y tamaño de las derivadas, en formato Prometheus.
+    Son de este worker: con varios workers, cada scrape ve uno de ellos.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health/live", tags=["meta"])
+def health_live():
+    """El proceso responde (no dice nada del precalentamiento)."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", tags=["meta"])
+def health_ready(response: Response):
+    """
+    Listo para tráfico cuando terminó el precalentamiento (o si falló o está
+    desactivado). Mientras tanto responde 503.
+    """
+    ready = WARMUP["state"] in ("ready", "failed", "skipped")
+    if not ready:
+        response.status_code = 503
+    return {"ready": ready, **WARMUP}
+
+
 # ============================================================
 # FRONTEND STATIC FILE SERVING (como LaserMapper3D)
 # ============================================================
@@ -132,7 +1119,7 @@ def _api_overview():
     return {
         "message": "TaylorLab API + Frontend",
         "frontend_note": "Si el build existe, se sirve en /",
-        "endpoints": ["/taylor/analyze"]
+        "endpoints": ["/taylor/analyze", "/taylor/analyze/stream", "/taylor/analyze/batch", "/taylor/evaluate", "/taylor/plot/{id}", "/taylor/jobs", "/admin/cache", "/admin/jobs", "/admin/profiles", "/health/ready", "/metrics"]
     }
 
 
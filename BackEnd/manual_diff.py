@@ -30,10 +30,14 @@ Trabaja sobre árboles de expresiones de SymPy (sp.Expr), aplicando reglas:
 
 from __future__ import annotations
 
-from typing import Iterable
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import sympy as sp
 
+from metrics import stage
+
 
 # ---------------------------------------------------------------------------
 # Utilidades internas
@@ -194,6 +198,178 @@ def manual_diff_k(expr: sp.Expr, var: sp.Symbol, k: int) -> sp.Expr:
     return result
 
 
+# ---------------------------------------------------------------------------
+# Control del crecimiento del árbol entre órdenes
+# ---------------------------------------------------------------------------
+
+def count_nodes(expr: sp.Expr) -> int:
+    """Número de nodos del árbol de la expresión (subárboles repetidos cuentan cada vez)."""
+    return sum(1 for _ in sp.preorder_traversal(expr))
+
+
+def count_dag_nodes(expr: sp.Expr) -> int:
+    """Número de subexpresiones distintas (tamaño del DAG con subárboles compartidos)."""
+    # Recorre cada subexpresión una sola vez: preorder_traversal expandiría
+    # los subárboles repetidos, que en derivadas altas son casi todo el árbol
+    seen = {expr}
+    pending = [expr]
+    while pending:
+        for arg in pending.pop().args:
+            if arg not in seen:
+                seen.add(arg)
+                pending.append(arg)
+    return len(seen)
+
+
+# Normalizaciones baratas que se pueden aplicar entre un orden y el siguiente.
+# Ojo: en expresiones trigonométricas racionales `expand` puede hacer crecer
+# el árbol en lugar de achicarlo; por eso DerivativeTower solo se queda con el
+# resultado normalizado cuando efectivamente tiene menos nodos.
+NORMALIZERS: Dict[str, Callable[[sp.Expr], sp.Expr]] = {
+    "expand": sp.expand,
+    "cancel": sp.cancel,
+}
+
+
+def normalize_derivative(expr: sp.Expr, method: Optional[str]) -> sp.Expr:
+    """
+    Aplica la normalización `method` a expr y devuelve la versión con menos
+    nodos entre la original y la normalizada. Con method=None no hace nada.
+    """
+    if method is None:
+        return expr
+    try:
+        normalizer = NORMALIZERS[method]
+    except KeyError:
+        raise ValueError(f"Normalización desconocida: {method}")
+
+    candidate = normalizer(expr)
+    if count_nodes(candidate) < count_nodes(expr):
+        return candidate
+    return expr
+
+
+# ---------------------------------------------------------------------------
+# Torre de derivadas: DerivativeTower
+# ---------------------------------------------------------------------------
+
+class DerivativeTower:
+    """
+    Guarda f, f', f'', ... de una expresión y produce cada orden nuevo
+    derivando UNA sola vez el orden anterior.
+
+    Pedir hasta el orden n cuesta n pasadas de manual_diff_once (en lugar de
+    1 + 2 + ... + n con manual_diff_k), y la misma torre se comparte entre
+    los coeficientes, la derivada exacta y cualquier paso posterior.
+
+    Con `normalize` (ver NORMALIZERS) cada derivada nueva se normaliza antes
+    de usarse como punto de partida del orden siguiente. `node_counts` guarda
+    el tamaño del árbol por orden para poder vigilar su crecimiento, y
+    dag_node_counts el de su DAG (subexpresiones distintas), que es lo que
+    realmente cuesta evaluar la versión compilada con cse.
+
+    La torre puede compartirse entre hilos: extender y compilar se hacen
+    bajo un lock.
+    """
+
+    def __init__(
+        self,
+        expr: sp.Expr,
+        var: sp.Symbol,
+        normalize: Optional[str] = None,
+    ):
+        if normalize is not None and normalize not in NORMALIZERS:
+            raise ValueError(f"Normalización desconocida: {normalize}")
+        self.expr = expr
+        self.var = var
+        self.normalize = normalize
+        self._derivatives: List[sp.Expr] = [expr]
+        self._compiled: Dict[Tuple[int, str], Callable] = {}
+        self.node_counts: List[int] = [count_nodes(expr)]
+        self._dag_node_counts: List[int] = []
+        self._lock = threading.RLock()
+
+    @property
+    def max_order(self) -> int:
+        """Mayor orden de derivada ya calculado."""
+        return len(self._derivatives) - 1
+
+    def extend_to(self, k: int) -> None:
+        """Calcula (si hace falta) las derivadas hasta el orden k inclusive."""
+        if k < 0:
+            raise ValueError("El orden de derivación k debe ser >= 0")
+        if len(self._derivatives) > k:
+            return
+        with self._lock, stage("differentiate"):
+            while len(self._derivatives) <= k:
+                nxt = manual_diff_once(self._derivatives[-1], self.var)
+                nxt = normalize_derivative(nxt, self.normalize)
+                self.node_counts.append(count_nodes(nxt))
+                self._derivatives.append(nxt)
+
+    def derivative(self, k: int) -> sp.Expr:
+        """Devuelve la derivada k-ésima (k = 0 es la propia expresión)."""
+        self.extend_to(k)
+        return self._derivatives[k]
+
+    def derivatives(self, k: int) -> List[sp.Expr]:
+        """Devuelve [f, f', ..., f^(k)]."""
+        self.extend_to(k)
+        return list(self._derivatives[: k + 1])
+
+    def __getitem__(self, k: int) -> sp.Expr:
+        return self.derivative(k)
+
+    def compiled(self, k: int, backend: str = "math") -> Callable:
+        """
+        Función numérica (lambdify) de la derivada k-ésima. Con backend
+        "math" evalúa floats; con "numpy" evalúa arreglos completos.
+        Se compila una sola vez por (orden, backend) y queda guardada en la torre.
+        """
+        key = (k, backend)
+        fn = self._compiled.get(key)
+        if fn is None:
+            with self._lock:
+                fn = self._compiled.get(key)
+                if fn is None:
+                    f_k = self.derivative(k)
+                    with stage("lambdify"):
+                        fn = sp.lambdify(self.var, f_k, modules=backend, cse=True)
+                    self._compiled[key] = fn
+        return fn
+
+    def evaluate(self, k: int, value: float) -> float:
+        """
+        Evalúa f^(k)(value) como float usando la versión compilada.
+
+        Si la evaluación rápida desborda, da complejo o cae fuera del dominio
+        de `math`, se recurre a sp.N sobre el árbol simbólico. En ese caso un
+        resultado no real lanza TypeError, igual que float(sp.N(...)).
+        """
+        try:
+            result = self.compiled(k)(value)
+            if not isinstance(result, complex):
+                result = float(result)
+                if math.isfinite(result):
+                    return result
+        except (ArithmeticError, ValueError, TypeError):
+            pass
+        return float(sp.N(self.derivative(k).subs(self.var, value)))
+
+    def dag_node_counts(self, k: int) -> List[int]:
+        """
+        Tamaño del DAG (subexpresiones distintas) de cada orden hasta k. Se
+        calcula al pedirlo y queda guardado en la torre.
+        """
+        self.extend_to(k)
+        if len(self._dag_node_counts) <= k:
+            with self._lock:
+                while len(self._dag_node_counts) <= k:
+                    d = self._derivatives[len(self._dag_node_counts)]
+                    self._dag_node_counts.append(count_dag_nodes(d))
+        return self._dag_node_counts[: k + 1]
+
+
 # ---------------------------------------------------------------------------
 # (Opcional) Conjunto de funciones soportadas (para documentación / debug)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,229 @@
+# metrics.py
+"""
+Tiempos por etapa del análisis de Taylor y métricas para Prometheus.
+
+- StageTimer acumula, para una request, los milisegundos de cada etapa
+  (parse, coeficientes, lambdify, gráfica, ...) y algunos tamaños (nodos del
+  árbol de cada derivada).
+- El timer activo vive en un ContextVar: el motor y los módulos de abajo
+  (manual_diff, persistent_store) marcan etapas con `with stage("nombre"):` sin que
+  haya que pasar el timer por parámetro. Sin timer activo no se mide nada.
+- Las etapas anidadas se descuentan de la que las contiene: cada una
+  informa su tiempo propio y la suma da el total.
+- Histogram guarda histogramas en memoria y los escribe en el formato de
+  texto de Prometheus (sin depender de prometheus_client). Cada worker de
+  uvicorn tiene los suyos; Prometheus los agrega por instancia.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# ============================================================
+# Timer por request
+# ============================================================
+
+class StageTimer:
+    """Milisegundos propios por etapa (en orden de aparición) y contadores."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        # Tiempo de pared de toda la request (lo completa quien la atiende)
+        self.elapsed_ms: Optional[float] = None
+        self.cache: Optional[str] = None
+        self.node_counts: Optional[List[int]] = None
+        # True si la request calculó algo (y no solo leyó de las cachés)
+        self.computed = False
+        self._stack: List[float] = []
+
+    def add(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+
+_current: ContextVar[Optional[StageTimer]] = ContextVar("taylor_stage_timer", default=None)
+
+
+@contextmanager
+def activate(timer: StageTimer) -> Iterator[StageTimer]:
+    """Hace de `timer` el timer activo del contexto actual."""
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Mide el bloque como etapa `name` del timer activo (si lo hay)."""
+    timer = _current.get()
+    if timer is None:
+        yield
+        return
+    timer._stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - start) * 1e3
+        nested = timer._stack.pop()
+        timer.add(name, elapsed - nested)
+        if timer._stack:
+            timer._stack[-1] += elapsed
+
+
+def mark_computed() -> None:
+    """Marca que la request activa hizo cálculo real (no solo cachés)."""
+    timer = _current.get()
+    if timer is not None:
+        timer.computed = True
+
+
+def record_node_counts(counts: Sequence[int]) -> None:
+    """Tamaño del árbol de cada derivada f, f', ..., f^(n) de la request."""
+    timer = _current.get()
+    if timer is not None:
+        timer.node_counts = list(counts)
+
+
+def server_timing_header(timer: StageTimer) -> str:
+    """Valor del header Server-Timing (una métrica por etapa, más el total)."""
+    parts = [f"{name};dur={ms:.2f}" for name, ms in timer.stages.items()]
+    if timer.elapsed_ms is not None:
+        desc = f';desc="{timer.cache}"' if timer.cache else ""
+        parts.append(f"total;dur={timer.elapsed_ms:.2f}{desc}")
+    if timer.node_counts:
+        counts = ",".join(str(n) for n in timer.node_counts)
+        parts.append(f'nodes;desc="{counts}"')
+    return ", ".join(parts)
+
+
+# ============================================================
+# Histogramas (formato de texto de Prometheus)
+# ============================================================
+
+# Límites superiores de los grupos de orden (el último grupo es abierto)
+ORDER_BUCKETS = (5, 10, 20, 50, 100, 1000)
+
+
+def order_bucket(order: int) -> str:
+    """Grupo de orden para las etiquetas: "0-5", "6-10", ..., "1001+"."""
+    low = 0
+    for high in ORDER_BUCKETS:
+        if order <= high:
+            return f"{low}-{high}"
+        low = high + 1
+    return f"{low}+"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Histograma acumulado por combinación de etiquetas, seguro entre hilos."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...],
+        buckets: Sequence[float],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # etiquetas -> [conteo por bucket (no acumulado), suma]
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted((key, list(c), t[0]) for key, (c, t) in self._series.items())
+        for key, counts, total in series:
+            labels = ",".join(f'{n}="{v}"' for n, v in zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                sep = "," if labels else ""
+                lines.append(
+                    f'{self.name}_bucket{{{labels}{sep}le="{_format_value(bound)}"}} {cumulative}'
+                )
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total!r}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    "taylor_stage_duration_seconds",
+    "Tiempo propio de cada etapa del análisis de Taylor.",
+    ("stage", "order_bucket", "cache"),
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+REQUEST_SECONDS = Histogram(
+    "taylor_analysis_duration_seconds",
+    "Tiempo total de un análisis de Taylor (incluida la caché de resultados).",
+    ("order_bucket", "cache"),
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+DERIVATIVE_NODES = Histogram(
+    "taylor_derivative_nodes",
+    "Nodos del árbol de la derivada de mayor orden de cada análisis simbólico.",
+    ("order_bucket",),
+    (10, 30, 100, 300, 1000, 3000, 10000, 30000, 100000),
+)
+
+HISTOGRAMS = (STAGE_SECONDS, REQUEST_SECONDS, DERIVATIVE_NODES)
+
+
+def cache_outcome(result_cache_hit: bool, timer: StageTimer) -> str:
+    """
+    "hit": salió entero de la caché de resultados; "warm": se armó la
+    respuesta pero los coeficientes ya estaban en las cachés del motor;
+    "miss": hubo que calcularlos.
+    """
+    if result_cache_hit:
+        return "hit"
+    return "miss" if timer.computed else "warm"
+
+
+def observe_analysis(timer: StageTimer, order: int) -> None:
+    """Vuelca un análisis terminado (con elapsed_ms y cache ya puestos) en los histogramas."""
+    bucket = order_bucket(order)
+    for name, ms in timer.stages.items():
+        STAGE_SECONDS.observe(ms / 1e3, stage=name, order_bucket=bucket, cache=timer.cache)
+    REQUEST_SECONDS.observe(timer.elapsed_ms / 1e3, order_bucket=bucket, cache=timer.cache)
+    if timer.node_counts:
+        DERIVATIVE_NODES.observe(timer.node_counts[-1], order_bucket=bucket)
+
+
+def render_metrics() -> str:
+    """Todas las métricas en formato de exposición de texto de Prometheus."""
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,604 @@
+# persistent_store.py
+"""
+Almacén persistente de torres de derivadas y coeficientes, compartido por
+todos los workers de uvicorn de un mismo host (un archivo SQLite).
+
+- Torres: cada derivada f^(k) se guarda como srepr comprimido (zlib), con
+  clave = hash del srepr de la expresión parseada + normalización. Una torre
+  que se extiende en un worker queda disponible para los demás y sobrevive
+  a los reinicios.
+- Coeficientes: arreglos float64 de la tabla simbólica por (expresión,
+  normalización, centro); se guarda siempre el prefijo más largo conocido.
+  Los motores AD y de series no se guardan: recalcularlos cuesta lo mismo
+  que leerlos.
+- Concurrencia: modo WAL (lectores sin bloquear a un escritor), una conexión
+  por hilo y busy_timeout para esperar el lock de escritura entre procesos.
+- Tamaño: al pasar de max_bytes se descartan las torres y arreglos usados
+  hace más tiempo, hasta quedar en el 90 %.
+- Versión: si cambia STORE_VERSION (p. ej. porque cambió manual_diff), el
+  contenido viejo se descarta al abrir.
+- Seguridad: está desactivado salvo que TAYLOR_STORE_PATH diga dónde
+  guardarlo. El directorio se crea con permisos 0700 y el archivo con 0600;
+  si alguno es de otro usuario (o el directorio lo puede escribir cualquiera)
+  no se abre. Las derivadas no se leen con eval: _parse_srepr solo acepta
+  llamadas a clases de SymPy con literales, como las que escribe sp.srepr.
+
+Reconstrucción offline (desde BackEnd/):
+    python persistent_store.py stats --path ...
+    python persistent_store.py rebuild --path ...   # recalcula todo en un archivo nuevo
+    python persistent_store.py clear | vacuum --path ...
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import sqlite3
+import stat
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import sympy as sp
+
+from manual_diff import DerivativeTower
+from metrics import stage
+
+
+# Subir cuando cambie el formato o la forma de derivar (invalida lo guardado)
+STORE_VERSION = "1"
+
+DEFAULT_MAX_MB = 256.0
+
+# last_used se actualiza como mucho una vez por este intervalo (segundos)
+_TOUCH_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS towers (
+    tower_key  TEXT PRIMARY KEY,
+    expr       TEXT NOT NULL,
+    normalize  TEXT,
+    bytes      INTEGER NOT NULL DEFAULT 0,
+    last_used  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS derivatives (
+    tower_key  TEXT NOT NULL,
+    k          INTEGER NOT NULL,
+    srepr_z    BLOB NOT NULL,
+    nodes      INTEGER NOT NULL,
+    PRIMARY KEY (tower_key, k)
+);
+CREATE TABLE IF NOT EXISTS coefficients (
+    coef_key   TEXT PRIMARY KEY,
+    engine     TEXT NOT NULL,
+    tower_key  TEXT NOT NULL,
+    center     REAL NOT NULL,
+    n          INTEGER NOT NULL,
+    coefs      BLOB NOT NULL,
+    bytes      INTEGER NOT NULL,
+    last_used  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS towers_lru ON towers (last_used);
+CREATE INDEX IF NOT EXISTS coefficients_lru ON coefficients (last_used);
+"""
+
+# ============================================================
+# Lectura de srepr sin eval
+# ============================================================
+
+# Clases y constantes de SymPy que puede nombrar un srepr (nada de funciones
+# sueltas ni módulos: solo cosas que construyen un árbol de Basic)
+_SREPR_NAMES: Dict[str, Any] = {
+    name: obj
+    for name, obj in vars(sp).items()
+    if not name.startswith("_")
+    and (isinstance(obj, sp.Basic) or (isinstance(obj, type) and issubclass(obj, sp.Basic)))
+}
+# srepr de Piecewise usa ExprCondPair, que sympy no exporta arriba
+_SREPR_NAMES["ExprCondPair"] = sp.functions.elementary.piecewise.ExprCondPair
+
+# Únicas clases que reciben textos como argumento (el nombre o los dígitos);
+# al resto un texto le llegaría a sympify, que sí evalúa código
+_SREPR_TEXT_ARGS = {"Symbol", "Dummy", "Function", "Float"}
+
+
+def _srepr_literal(node: ast.AST, allow_text: bool) -> Any:
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _srepr_literal(node.operand, False)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return -value
+    elif isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, (bool, int)) or (allow_text and isinstance(value, str)):
+            return value
+    raise ValueError(f"srepr no válido: {ast.dump(node)}")
+
+
+def _srepr_node(node: ast.AST) -> Any:
+    if isinstance(node, ast.Name):
+        if node.id in _SREPR_NAMES:
+            return _SREPR_NAMES[node.id]
+        raise ValueError(f"srepr no válido: nombre {node.id!r}")
+    if not isinstance(node, ast.Call):
+        return _srepr_literal(node, False)
+
+    func = node.func
+    if isinstance(func, ast.Call):
+        # Function('f')(x): la función indefinida aplicada a sus argumentos
+        if not (isinstance(func.func, ast.Name) and func.func.id == "Function"):
+            raise ValueError("srepr no válido: llamada sobre una llamada")
+        name = "Function"
+        target = _srepr_node(func)
+    elif isinstance(func, ast.Name) and func.id in _SREPR_NAMES:
+        name = func.id
+        target = _SREPR_NAMES[name]
+    else:
+        raise ValueError(f"srepr no válido: {ast.dump(func)}")
+
+    allow_text = name in _SREPR_TEXT_ARGS and not isinstance(func, ast.Call)
+    args = [
+        _srepr_literal(arg, allow_text) if not isinstance(arg, (ast.Call, ast.Name))
+        else _srepr_node(arg)
+        for arg in node.args
+    ]
+    kwargs = {kw.arg: _srepr_literal(kw.value, False) for kw in node.keywords if kw.arg}
+    if len(kwargs) != len(node.keywords):
+        raise ValueError("srepr no válido: **kwargs")
+    return target(*args, **kwargs)
+
+
+def _parse_srepr(text: str) -> sp.Expr:
+    """Inversa de sp.srepr que solo construye objetos de SymPy (ValueError si no)."""
+    return _srepr_node(ast.parse(text, mode="eval").body)
+
+
+def expression_key(expr: sp.Expr, normalize: Optional[str] = None) -> str:
+    """Clave estable de (expresión normalizada, normalización)."""
+    text = f"{sp.srepr(expr)}|{normalize or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _dump_expr(expr: sp.Expr) -> bytes:
+    return zlib.compress(sp.srepr(expr).encode("utf-8"), 6)
+
+
+def _load_expr(blob: bytes) -> sp.Expr:
+    return _parse_srepr(zlib.decompress(blob).decode("utf-8"))
+
+
+# ============================================================
+# Ubicación del archivo
+# ============================================================
+
+def _check_owner(path: str, st: os.stat_result) -> None:
+    if hasattr(os, "getuid") and st.st_uid != os.getuid():
+        raise PermissionError(f"{path} es de otro usuario (uid {st.st_uid})")
+
+
+def _prepare_location(path: str) -> None:
+    """
+    Crea el directorio (0700) y el archivo (0600) si faltan y verifica que
+    sean del usuario del servicio. PermissionError si no se puede confiar en ellos.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.stat(directory)
+    _check_owner(directory, st)
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{directory} lo pueden escribir otros usuarios")
+
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+    fd = os.open(path, flags, 0o600)
+    try:
+        st = os.fstat(fd)
+        _check_owner(path, st)
+        if stat.S_IMODE(st.st_mode) & 0o077:
+            os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+
+class PersistentStore:
+    """Archivo SQLite compartido entre procesos; seguro entre hilos."""
+
+    def __init__(self, path: str, max_bytes: int = int(DEFAULT_MAX_MB * 1024 * 1024)):
+        _prepare_location(path)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._init_schema()
+
+    # -------------------------------------------------------------------
+    # Conexión
+    # -------------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements: List[Tuple[str, tuple]]) -> None:
+        """Ejecuta varias sentencias en una transacción de escritura corta."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.writes += 1
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if row is None or row[0] != STORE_VERSION:
+            self._write([
+                ("DELETE FROM derivatives", ()),
+                ("DELETE FROM towers", ()),
+                ("DELETE FROM coefficients", ()),
+                ("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (STORE_VERSION,)),
+            ])
+
+    # -------------------------------------------------------------------
+    # Torres
+    # -------------------------------------------------------------------
+
+    def load_derivatives(
+        self, tower_key: str, start: int, stop: int
+    ) -> List[Tuple[sp.Expr, int]]:
+        """Derivadas guardadas de orden start..stop (solo el tramo contiguo)."""
+        rows = self._conn().execute(
+            "SELECT k, srepr_z, nodes FROM derivatives "
+            "WHERE tower_key = ? AND k BETWEEN ? AND ? ORDER BY k",
+            (tower_key, start, stop),
+        ).fetchall()
+        out: List[Tuple[sp.Expr, int]] = []
+        for k, blob, nodes in rows:
+            if k != start + len(out):
+                break
+            try:
+                out.append((_load_expr(blob), nodes))
+            except (ValueError, TypeError, SyntaxError, zlib.error):
+                break  # entrada corrupta: desde acá se vuelve a derivar
+        if out:
+            self.hits += 1
+            last_used = self._conn().execute(
+                "SELECT last_used FROM towers WHERE tower_key = ?", (tower_key,)
+            ).fetchone()
+            if last_used is not None and last_used[0] < time.time() - _TOUCH_INTERVAL:
+                self._touch("towers", "tower_key", tower_key)
+        else:
+            self.misses += 1
+        return out
+
+    def save_derivatives(
+        self,
+        tower_key: str,
+        root: sp.Expr,
+        normalize: Optional[str],
+        start: int,
+        derivatives: List[sp.Expr],
+        node_counts: List[int],
+    ) -> None:
+        if not derivatives:
+            return
+        blobs = [_dump_expr(d) for d in derivatives]
+        size = sum(len(b) for b in blobs)
+        now = time.time()
+        statements: List[Tuple[str, tuple]] = [(
+            "INSERT INTO towers (tower_key, expr, normalize, bytes, last_used) "
+            "VALUES (?, ?, ?, 0, ?) ON CONFLICT (tower_key) DO UPDATE SET last_used = excluded.last_used",
+            (tower_key, sp.srepr(root), normalize, now),
+        )]
+        for offset, (blob, nodes) in enumerate(zip(blobs, node_counts)):
+            statements.append((
+                "INSERT OR IGNORE INTO derivatives (tower_key, k, srepr_z, nodes) VALUES (?, ?, ?, ?)",
+                (tower_key, start + offset, blob, nodes),
+            ))
+        statements.append((
+            "UPDATE towers SET bytes = (SELECT COALESCE(SUM(LENGTH(srepr_z)), 0) "
+            "FROM derivatives WHERE tower_key = ?) WHERE tower_key = ?",
+            (tower_key, tower_key),
+        ))
+        self._write(statements)
+        self._evict_if_needed(size)
+
+    # -------------------------------------------------------------------
+    # Coeficientes
+    # -------------------------------------------------------------------
+
+    @staticmethod
+    def coefficient_key(engine: str, tower_key: str, center: float) -> str:
+        return f"{engine}:{tower_key}:{float(center)!r}"
+
+    def load_coefficients(
+        self, engine: str, tower_key: str, center: float, order: int
+    ) -> Optional[List[float]]:
+        """c_0..c_order si hay un prefijo guardado de ese largo; si no, None."""
+        key = self.coefficient_key(engine, tower_key, center)
+        row = self._conn().execute(
+            "SELECT n, coefs, last_used FROM coefficients WHERE coef_key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] <= order:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if row[2] < time.time() - _TOUCH_INTERVAL:
+            self._touch("coefficients", "coef_key", key)
+        return np.frombuffer(row[1], dtype="<f8")[: order + 1].tolist()
+
+    def save_coefficients(
+        self, engine: str, tower_key: str, center: float, coefs: List[float]
+    ) -> None:
+        """Guarda el arreglo si es más largo que el que ya había."""
+        key = self.coefficient_key(engine, tower_key, center)
+        blob = np.asarray(coefs, dtype="<f8").tobytes()
+        self._write([(
+            "INSERT INTO coefficients (coef_key, engine, tower_key, center, n, coefs, bytes, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (coef_key) DO UPDATE SET n = excluded.n, coefs = excluded.coefs, "
+            "bytes = excluded.bytes, last_used = excluded.last_used "
+            "WHERE excluded.n > coefficients.n",
+            (key, engine, tower_key, float(center), len(coefs), blob, len(blob), time.time()),
+        )])
+        self._evict_if_needed(len(blob))
+
+    # -------------------------------------------------------------------
+    # LRU por tamaño
+    # -------------------------------------------------------------------
+
+    def _touch(self, table: str, column: str, key: str) -> None:
+        try:
+            self._write([(
+                f"UPDATE {table} SET last_used = ? WHERE {column} = ?",
+                (time.time(), key),
+            )])
+        except sqlite3.OperationalError:
+            pass  # otro proceso tiene el lock: no vale la pena esperar por esto
+
+    def total_bytes(self) -> int:
+        row = self._conn().execute(
+            "SELECT (SELECT COALESCE(SUM(bytes), 0) FROM towers) + "
+            "(SELECT COALESCE(SUM(bytes), 0) FROM coefficients)"
+        ).fetchone()
+        return int(row[0])
+
+    def _evict_if_needed(self, _added: int) -> None:
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        conn = self._conn()
+        candidates = conn.execute(
+            "SELECT 'towers', tower_key, bytes, last_used FROM towers "
+            "UNION ALL SELECT 'coefficients', coef_key, bytes, last_used FROM coefficients "
+            "ORDER BY last_used"
+        ).fetchall()
+        statements: List[Tuple[str, tuple]] = []
+        for table, key, size, _last_used in candidates:
+            if total <= target:
+                break
+            if table == "towers":
+                statements.append(("DELETE FROM derivatives WHERE tower_key = ?", (key,)))
+                statements.append(("DELETE FROM towers WHERE tower_key = ?", (key,)))
+            else:
+                statements.append(("DELETE FROM coefficients WHERE coef_key = ?", (key,)))
+            total -= size
+            self.evictions += 1
+        if statements:
+            self._write(statements)
+
+    # -------------------------------------------------------------------
+    # Administración
+    # -------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._conn()
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "bytes": self.total_bytes(),
+            "towers": conn.execute("SELECT COUNT(*) FROM towers").fetchone()[0],
+            "derivatives": conn.execute("SELECT COUNT(*) FROM derivatives").fetchone()[0],
+            "coefficient_arrays": conn.execute("SELECT COUNT(*) FROM coefficients").fetchone()[0],
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        self._write([
+            ("DELETE FROM derivatives", ()),
+            ("DELETE FROM towers", ()),
+            ("DELETE FROM coefficients", ()),
+        ])
+
+    def vacuum(self) -> None:
+        self._conn().execute("VACUUM")
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# ============================================================
+# Torre respaldada por el almacén
+# ============================================================
+
+class StoredDerivativeTower(DerivativeTower):
+    """
+    DerivativeTower que antes de derivar busca los órdenes en el almacén y
+    después guarda los que calculó. Los demás workers los leen de ahí.
+    """
+
+    def __init__(
+        self,
+        expr: sp.Expr,
+        var: sp.Symbol,
+        store: PersistentStore,
+        normalize: Optional[str] = None,
+    ):
+        super().__init__(expr, var, normalize=normalize)
+        self.store = store
+        self.key = expression_key(expr, normalize)
+
+    def extend_to(self, k: int) -> None:
+        if len(self._derivatives) > k:
+            return
+        with self._lock:
+            have = len(self._derivatives)
+            if have > k:
+                return
+            try:
+                with stage("store"):
+                    for derivative, nodes in self.store.load_derivatives(self.key, have, k):
+                        # Mismo orden que DerivativeTower: quien lee sin lock
+                        # mira _derivatives, así que node_counts va primero
+                        self.node_counts.append(nodes)
+                        self._derivatives.append(derivative)
+            except sqlite3.Error:
+                pass  # sin almacén se sigue derivando en memoria
+            computed_from = len(self._derivatives)
+            super().extend_to(k)
+            try:
+                with stage("store"):
+                    self.store.save_derivatives(
+                        self.key, self.expr, self.normalize, computed_from,
+                        self._derivatives[computed_from:], self.node_counts[computed_from:],
+                    )
+            except sqlite3.Error:
+                pass
+
+
+# ============================================================
+# Almacén del proceso (configurado por entorno)
+# ============================================================
+
+_store: Optional[PersistentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[PersistentStore]:
+    """
+    Almacén compartido del host: TAYLOR_STORE_PATH (sin definir o vacío lo
+    desactiva) y TAYLOR_STORE_MAX_MB. None si está desactivado o no se pudo
+    abrir (incluido un archivo o directorio de otro usuario).
+    """
+    global _store
+    if _store is None:
+        path = os.environ.get("TAYLOR_STORE_PATH", "")
+        if not path:
+            return None
+        with _store_lock:
+            if _store is None:
+                max_mb = float(os.environ.get("TAYLOR_STORE_MAX_MB", DEFAULT_MAX_MB))
+                try:
+                    _store = PersistentStore(path, int(max_mb * 1024 * 1024))
+                except (sqlite3.Error, OSError):
+                    return None
+    return _store
+
+
+# ============================================================
+# Línea de comandos (mantenimiento offline)
+# ============================================================
+
+def rebuild(path: str, max_bytes: int) -> Dict[str, int]:
+    """
+    Recalcula todas las torres y coeficientes guardados con el código actual
+    en un archivo nuevo, y lo reemplaza al final (los workers que tengan el
+    viejo abierto siguen leyendo el suyo hasta reconectarse).
+    """
+    from taylor_engine import CoefficientTable, x
+
+    old = PersistentStore(path, max_bytes)
+    conn = old._conn()
+    towers = conn.execute(
+        "SELECT t.tower_key, t.expr, t.normalize, MAX(d.k) FROM towers t "
+        "JOIN derivatives d ON d.tower_key = t.tower_key GROUP BY t.tower_key"
+    ).fetchall()
+    arrays = conn.execute(
+        "SELECT tower_key, center, n FROM coefficients WHERE engine = 'symbolic'"
+    ).fetchall()
+    old.close()
+
+    tmp_path = path + ".rebuild"
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(tmp_path + suffix):
+            os.remove(tmp_path + suffix)
+    new = PersistentStore(tmp_path, max_bytes)
+
+    rebuilt: Dict[str, StoredDerivativeTower] = {}
+    for key, expr_text, normalize, max_k in towers:
+        expr = _parse_srepr(expr_text)
+        tower = StoredDerivativeTower(expr, x, new, normalize=normalize)
+        tower.extend_to(max_k)
+        rebuilt[key] = tower
+
+    for key, center, n in arrays:
+        if key in rebuilt:
+            # CoefficientTable guarda el arreglo en el almacén nuevo
+            CoefficientTable(rebuilt[key], center).ensure(n - 1)
+
+    stats = new.stats()
+    new.vacuum()
+    new.close()
+    os.replace(tmp_path, path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return {"towers": stats["towers"], "coefficient_arrays": stats["coefficient_arrays"]}
+
+
+def main() -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Mantenimiento del almacén persistente.")
+    parser.add_argument("command", choices=["stats", "rebuild", "clear", "vacuum"])
+    parser.add_argument("--path", default=os.environ.get("TAYLOR_STORE_PATH") or None)
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("falta --path (o TAYLOR_STORE_PATH)")
+    max_bytes = int(args.max_mb * 1024 * 1024)
+
+    if args.command == "rebuild":
+        # El motor no debe leer el archivo que se está reconstruyendo
+        os.environ["TAYLOR_STORE_PATH"] = ""
+        print(json.dumps(rebuild(args.path, max_bytes), indent=2))
+        return 0
+
+    store = PersistentStore(args.path, max_bytes)
+    if args.command == "clear":
+        store.clear()
+    if args.command in ("clear", "vacuum"):
+        store.vacuum()
+    print(json.dumps(store.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+# plot_series.py
+"""
+Series numéricas compactas para que el cliente dibuje la gráfica él mismo
+(en lugar de recibir un PNG rasterizado en el servidor).
+
+1) Muestreo adaptativo: se parte de una grilla uniforme y se agregan puntos
+   medios en los intervalos con más curvatura o más error |f - P_n|.
+2) Reducción con LTTB (Largest-Triangle-Three-Buckets): se conservan los
+   puntos que mejor preservan la forma visual de cada curva.
+3) Codificación: arreglos float32 little-endian en base64 (NaN = hueco).
+"""
+
+from __future__ import annotations
+
+import base64
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+
+# ============================================================
+# LTTB
+# ============================================================
+
+def lttb_indices(xs: np.ndarray, ys: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Índices elegidos por Largest-Triangle-Three-Buckets para reducir (xs, ys)
+    a n_out puntos. Siempre incluye el primero y el último. Los NaN cuentan
+    como 0 para elegir, y los bordes de cada hueco se conservan aparte.
+    """
+    n = len(xs)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    ys_sel = np.nan_to_num(ys, nan=0.0, posinf=0.0, neginf=0.0)
+    bucket_edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    chosen = [0]
+    prev = 0
+    for b in range(n_out - 2):
+        start, end = bucket_edges[b], bucket_edges[b + 1]
+        if end <= start:
+            continue
+        # Punto "siguiente": promedio del bucket que sigue
+        nxt_start = end
+        nxt_end = bucket_edges[b + 2] if b + 2 < len(bucket_edges) else n
+        nxt_end = max(nxt_end, nxt_start + 1)
+        avg_x = xs[nxt_start:nxt_end].mean()
+        avg_y = ys_sel[nxt_start:nxt_end].mean()
+
+        px, py = xs[prev], ys_sel[prev]
+        cand_x = xs[start:end]
+        cand_y = ys_sel[start:end]
+        areas = np.abs((px - avg_x) * (cand_y - py) - (px - cand_x) * (avg_y - py))
+        prev = start + int(np.argmax(areas))
+        chosen.append(prev)
+    chosen.append(n - 1)
+
+    # Conservar los bordes de los huecos (polos, fuera de dominio)
+    finite = np.isfinite(ys)
+    gap_edges = np.nonzero(finite[1:] != finite[:-1])[0]
+    return np.unique(np.concatenate([chosen, gap_edges, gap_edges + 1]))
+
+
+# ============================================================
+# Polos
+# ============================================================
+
+def mark_pole_gaps(ys: np.ndarray, jump_factor: float = 50.0) -> np.ndarray:
+    """
+    Corta la curva en los polos con cambio de signo (1/(1+x), tan x, ...):
+    entre dos muestras consecutivas con signos opuestos y un salto mucho
+    mayor que el paso típico se pone NaN, para no dibujar la asíntota.
+    """
+    ys = np.array(ys, dtype=float)
+    if len(ys) < 3:
+        return ys
+    steps = np.abs(np.diff(ys))
+    finite_steps = steps[np.isfinite(steps)]
+    if finite_steps.size == 0:
+        return ys
+    typical = float(np.median(finite_steps))
+    with np.errstate(invalid="ignore"):
+        flips = (np.sign(ys[1:]) * np.sign(ys[:-1]) < 0) & (steps > jump_factor * typical)
+    idx = np.nonzero(flips)[0]
+    # Se anula el extremo con mayor |y| (el más cercano al polo)
+    nearer = np.where(np.abs(ys[idx]) >= np.abs(ys[idx + 1]), idx, idx + 1)
+    ys[nearer] = np.nan
+    return ys
+
+
+# ============================================================
+# Muestreo adaptativo
+# ============================================================
+
+def adaptive_samples(
+    funcs: Sequence[Callable[[np.ndarray], np.ndarray]],
+    x_min: float,
+    x_max: float,
+    n_initial: int,
+    n_max: int,
+    rounds: int = 4,
+) -> np.ndarray:
+    """
+    Puntos de muestreo en [x_min, x_max]: grilla uniforme de n_initial puntos
+    refinada (hasta n_max) donde las funciones tienen más curvatura o donde
+    difieren más entre sí (p. ej. f y P_n).
+    """
+    xs = np.linspace(x_min, x_max, n_initial)
+    for _ in range(rounds):
+        budget = n_max - len(xs)
+        if budget <= 0:
+            break
+        values = [np.nan_to_num(fn(xs), nan=0.0, posinf=0.0, neginf=0.0) for fn in funcs]
+
+        # Puntaje por intervalo [x_i, x_{i+1}]
+        score = np.zeros(len(xs) - 1)
+        for ys in values:
+            scale = np.ptp(ys) or 1.0
+            curvature = np.zeros(len(xs))
+            curvature[1:-1] = np.abs(ys[2:] - 2 * ys[1:-1] + ys[:-2])
+            score += (curvature[:-1] + curvature[1:]) / scale
+        if len(values) > 1:
+            err = np.abs(values[0] - values[-1])
+            scale = err.max() or 1.0
+            score += (err[:-1] + err[1:]) / scale
+
+        if not np.any(score > 0):
+            break
+        n_refine = min(budget, len(score) // 2)
+        worst = np.argsort(score)[-n_refine:]
+        worst = worst[score[worst] > 0]
+        midpoints = (xs[worst] + xs[worst + 1]) / 2
+        xs = np.sort(np.concatenate([xs, midpoints]))
+    return xs
+
+
+# ============================================================
+# Codificación
+# ============================================================
+
+def encode_float32(values: np.ndarray) -> str:
+    """Arreglo → float32 little-endian → base64 (NaN se mantiene como NaN)."""
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def build_series(
+    f_vec: Callable[[np.ndarray], np.ndarray],
+    partial_vecs: Dict[int, Callable[[np.ndarray], np.ndarray]],
+    x_min: float,
+    x_max: float,
+    num_points: int,
+    max_points: int,
+) -> Dict:
+    """
+    Arma las series f(x) y P_k(x) (para cada k de partial_vecs) sobre una
+    misma grilla adaptativa: se muestrea con num_points (refinando hasta 4x)
+    y se reduce con LTTB a unos max_points puntos compartidos por todas.
+    """
+    orders: List[int] = sorted(partial_vecs)
+    funcs = [f_vec] + ([partial_vecs[orders[-1]]] if orders else [])
+    xs = adaptive_samples(funcs, x_min, x_max, n_initial=num_points, n_max=4 * num_points)
+
+    f_vals = mark_pole_gaps(f_vec(xs))
+    partial_vals = {k: partial_vecs[k](xs) for k in orders}
+
+    keep = lttb_indices(xs, f_vals, max_points)
+    if orders:
+        keep = np.union1d(keep, lttb_indices(xs, partial_vals[orders[-1]], max_points))
+
+    return {
+        "encoding": "float32-le-base64",
+        "count": int(len(keep)),
+        "x": encode_float32(xs[keep]),
+        "f": encode_float32(f_vals[keep]),
+        "partials": [
+            {"order": k, "values": encode_float32(partial_vals[k][keep])} for k in orders
+        ],
+    }
@@ -0,0 +1,176 @@
+# plotting.py
+"""
+Renderizado de la gráfica f(x) vs. P_n(x) sin el estado global de pyplot.
+
+- Se usa la API orientada a objetos (Figure + FigureCanvasAgg): cada figura
+  es independiente, así que dos requests concurrentes no pueden mezclar
+  líneas entre sí.
+- La figura y sus artistas (líneas, marcador del centro) se crean una sola
+  vez por hilo/proceso y en cada render solo se actualizan los datos.
+- El rasterizado corre en un pool de procesos dedicado (por defecto uno por
+  núcleo) para no competir por el GIL con los hilos de FastAPI.
+  TAYLOR_PLOT_WORKERS=0 lo desactiva y renderiza en el hilo que llama.
+- matplotlib se importa recién al crear la primera figura: con el pool
+  activo el proceso de la API nunca lo carga (solo los workers).
+"""
+
+from __future__ import annotations
+
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+
+# ============================================================
+# Figura reutilizable
+# ============================================================
+
+class PlotRenderer:
+    """Figura con sus artistas ya creados; render() solo cambia los datos."""
+
+    def __init__(self):
+        # Import diferido: matplotlib tarda ~0.5 s en cargar
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(8, 4.5))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+        (self.line_f,) = self.ax.plot([], [], label="f(x)")
+        (self.line_taylor,) = self.ax.plot([], [], linestyle="--", label="Serie de Taylor")
+        self.center_line = self.ax.axvline(0.0, color="gray", linestyle=":")
+        (self.center_point,) = self.ax.plot([], [], "o", color="C2")
+
+        self.ax.legend(handles=[self.line_f, self.line_taylor])
+        self.ax.grid(True)
+
+        # tight_layout parte de los márgenes actuales: se restauran en cada
+        # render para que el resultado no dependa de la gráfica anterior
+        pars = self.figure.subplotpars
+        self._initial_margins = {
+            name: getattr(pars, name)
+            for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+        }
+
+    def render(
+        self,
+        xs: np.ndarray,
+        ys_real: np.ndarray,
+        ys_taylor: np.ndarray,
+        center: float,
+        center_value: float,
+    ) -> bytes:
+        self.line_f.set_data(xs, ys_real)
+        self.line_taylor.set_data(xs, ys_taylor)
+        self.center_line.set_xdata([center, center])
+        self.center_point.set_data([center], [center_value])
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.figure.subplots_adjust(**self._initial_margins)
+        self.figure.tight_layout()
+
+        buf = io.BytesIO()
+        self.figure.savefig(buf, format="png")
+        return buf.getvalue()
+
+
+_local = threading.local()
+
+
+def _renderer() -> PlotRenderer:
+    """Renderer propio del hilo (y por lo tanto del proceso) actual."""
+    renderer = getattr(_local, "renderer", None)
+    if renderer is None:
+        renderer = PlotRenderer()
+        _local.renderer = renderer
+    return renderer
+
+
+def render_png_local(xs, ys_real, ys_taylor, center, center_value) -> bytes:
+    """Renderiza en el hilo actual con su figura reutilizable."""
+    return _renderer().render(
+        np.asarray(xs, dtype=float),
+        np.asarray(ys_real, dtype=float),
+        np.asarray(ys_taylor, dtype=float),
+        float(center),
+        float(center_value),
+    )
+
+
+# ============================================================
+# Pool de procesos
+# ============================================================
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def plot_workers() -> int:
+    """Tamaño del pool (TAYLOR_PLOT_WORKERS; por defecto, núcleos disponibles)."""
+    raw = os.environ.get("TAYLOR_PLOT_WORKERS")
+    if raw is not None and raw != "":
+        return max(0, int(raw))
+    return os.cpu_count() or 1
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if _pool is None and plot_workers() > 0:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: el proceso de la API tiene hilos, y fork con hilos no es seguro
+                _pool = ProcessPoolExecutor(
+                    max_workers=plot_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_plot_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def warm_up_plot_pool() -> bool:
+    """
+    Arranca los workers del pool y les hace cargar matplotlib con un render
+    mínimo. Sin pool no hace nada (para no cargar matplotlib en la API).
+    """
+    pool = _get_pool()
+    if pool is None:
+        return False
+    futures = [
+        pool.submit(render_png_local, [0.0, 1.0], [0.0, 1.0], [0.0, 1.0], 0.0, 0.0)
+        for _ in range(plot_workers())
+    ]
+    for future in futures:
+        future.result()
+    return True
+
+
+def render_png(xs, ys_real, ys_taylor, center, center_value) -> bytes:
+    """
+    PNG de f(x) y P_n(x). Usa el pool de procesos si está habilitado; si no,
+    renderiza en el hilo actual.
+    """
+    pool = _get_pool()
+    args = (
+        np.asarray(xs, dtype=float),
+        np.asarray(ys_real, dtype=float),
+        np.asarray(ys_taylor, dtype=float),
+        float(center),
+        float(center_value),
+    )
+    if pool is None:
+        return render_png_local(*args)
+    return pool.submit(render_png_local, *args).result()
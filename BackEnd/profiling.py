@@ -0,0 +1,244 @@
+# profiling.py
+"""
+Perfilado bajo demanda de /taylor/analyze con salida para flame graphs.
+
+- SamplingProfiler: un hilo aparte toma, cada `interval` segundos, la pila
+  del hilo que atiende la request (sys._current_frames) y cuenta cuántas
+  veces aparece cada pila. No instrumenta nada, así que el costo no depende
+  de cuántas llamadas haga el motor (manual_diff_once es muy recursivo).
+  El muestreador necesita el GIL, así que en la práctica no toma más de una
+  muestra por intervalo de cambio de hilo (sys.getswitchinterval, 5 ms).
+- La salida es el formato "collapsed stacks" (una línea por pila,
+  "raíz;...;hoja cantidad"), que leen flamegraph.pl, speedscope e inferno.
+- Cada perfil se guarda en TAYLOR_PROFILE_DIR como <id>.collapsed más
+  <id>.json con la request completa (para reproducirla con curl), los
+  tiempos por etapa y el resultado. Se conservan los últimos
+  TAYLOR_PROFILE_MAX_FILES perfiles.
+- should_profile() decide: siempre si lo pidió un admin, y si no con
+  probabilidad TAYLOR_PROFILE_SAMPLE_RATE (0 por defecto: nunca).
+- Sin TAYLOR_ADMIN_TOKEN no se perfila nada (profiling_enabled): los
+  perfiles guardan la request completa y sin token cualquiera los leería.
+
+Lo que corre en otros procesos (pool de simplify, pool de gráficas) aparece
+como la espera del hilo, no con sus propias funciones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+DEFAULT_DIR = os.path.join(tempfile.gettempdir(), "taylorlab_profiles")
+DEFAULT_INTERVAL = 0.002
+DEFAULT_MAX_FILES = 200
+
+_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+
+def profile_dir() -> str:
+    return os.environ.get("TAYLOR_PROFILE_DIR") or DEFAULT_DIR
+
+
+def sample_rate() -> float:
+    try:
+        rate = float(os.environ.get("TAYLOR_PROFILE_SAMPLE_RATE", "0"))
+    except ValueError:
+        return 0.0
+    return min(max(rate, 0.0), 1.0)
+
+
+def profiling_enabled() -> bool:
+    """El perfilado solo existe con un token de administración configurado."""
+    return bool(os.environ.get("TAYLOR_ADMIN_TOKEN"))
+
+
+def should_profile(requested: bool) -> bool:
+    """Perfilar esta request: pedido explícito o muestreo aleatorio."""
+    if not profiling_enabled():
+        return False
+    if requested:
+        return True
+    rate = sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+# ============================================================
+# Profiler por muestreo
+# ============================================================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    # ";" separa marcos en el formato collapsed (la cantidad va tras el último espacio)
+    return f"{code.co_name} ({module}:{code.co_firstlineno})".replace(";", ",")
+
+
+def _depth(frame) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class SamplingProfiler:
+    """
+    Muestrea la pila del hilo que entra al `with`. Las pilas se recortan al
+    marco que abrió el profiler, así el flame graph empieza en el endpoint y
+    no en el servidor.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._target = 0
+        self._skip = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        # Marcos por encima del que llama (uvicorn, starlette, anyio, ...)
+        self._skip = _depth(sys._getframe(1)) - 1
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="taylor-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()
+            self.stacks[";".join(labels[self._skip:])] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Pilas en formato collapsed, de la más frecuente a la menos."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# ============================================================
+# Perfiles guardados
+# ============================================================
+
+def _path(profile_id: str, extension: str) -> str:
+    if not _ID_RE.match(profile_id):
+        raise KeyError(profile_id)
+    return os.path.join(profile_dir(), f"{profile_id}.{extension}")
+
+
+def save_profile(profiler: SamplingProfiler, request: Dict[str, Any], info: Dict[str, Any]) -> str:
+    """Guarda pilas + request + `info` (etapas, caché, error) y devuelve el id."""
+    directory = profile_dir()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    meta = {
+        "id": profile_id,
+        "created": time.time(),
+        "request": request,
+        "duration_ms": round(profiler.duration * 1e3, 3),
+        "samples": profiler.samples,
+        "interval_ms": profiler.interval * 1e3,
+        "python": sys.version.split()[0],
+        **info,
+    }
+    with open(_path(profile_id, "collapsed"), "w", encoding="utf-8") as f:
+        f.write(profiler.collapsed())
+    # El JSON se escribe al final: un perfil está completo si su JSON existe
+    with open(_path(profile_id, "json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False, default=str)
+    _prune(directory)
+    return profile_id
+
+
+def _prune(directory: str) -> None:
+    """Deja solo los últimos TAYLOR_PROFILE_MAX_FILES perfiles."""
+    keep = int(os.environ.get("TAYLOR_PROFILE_MAX_FILES", str(DEFAULT_MAX_FILES)))
+    ids = sorted(name[:-5] for name in os.listdir(directory) if name.endswith(".json"))
+    for old in ids[: max(len(ids) - keep, 0)]:
+        for extension in ("json", "collapsed"):
+            try:
+                os.remove(os.path.join(directory, f"{old}.{extension}"))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Resumen de los perfiles guardados, del más nuevo al más viejo."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    out = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(".json") or not _ID_RE.match(name[:-5]):
+            continue
+        try:
+            meta = load_profile(name[:-5])
+        except (OSError, ValueError):
+            continue
+        request = meta.get("request", {})
+        out.append({
+            "id": meta["id"],
+            "created": meta["created"],
+            "expression": request.get("expression"),
+            "order": request.get("order"),
+            "engine": request.get("engine"),
+            "duration_ms": meta["duration_ms"],
+            "samples": meta["samples"],
+            "error": meta.get("error"),
+        })
+    return out
+
+
+def load_profile(profile_id: str) -> Dict[str, Any]:
+    """Metadatos de un perfil (KeyError si no existe)."""
+    try:
+        with open(_path(profile_id, "json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise KeyError(profile_id)
+
+
+def load_collapsed(profile_id: str) -> str:
+    """Pilas collapsed de un perfil (KeyError si no existe)."""
+    try:
+        with open(_path(profile_id, "collapsed"), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise KeyError(profile_id)
+
+
+def clear_profiles() -> int:
+    """Borra todos los perfiles guardados y devuelve cuántos había."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return 0
+    removed = 0
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".collapsed")) and _ID_RE.match(name.rsplit(".", 1)[0]):
+            os.remove(os.path.join(directory, name))
+            removed += name.endswith(".json")
+    return removed
@@ -0,0 +1,285 @@
+# taylor_ad.py
+"""
+Modo "diferenciación automática" (AD) de Taylor: calcula numéricamente los
+coeficientes c_0..c_n de la serie de Taylor de una expresión de SymPy
+alrededor de un punto, SIN construir derivadas simbólicas.
+
+Cada nodo del árbol se evalúa como una serie truncada (lista de n+1 números)
+y se combinan con las recurrencias clásicas de aritmética de series:
+
+- (u + v)_k = u_k + v_k
+- (u * v)_k = Σ_{j=0..k} u_j v_{k-j}                       (Cauchy)
+- (u / v)_k = (u_k - Σ_{j=0..k-1} q_j v_{k-j}) / v_0
+- exp(u):  e_k = (1/k) Σ_{j=1..k} j u_j e_{k-j}
+- log(u):  l_k = (u_k - (1/k) Σ_{j=1..k-1} j l_j u_{k-j}) / u_0
+- u^α:     p_k = 1/(k u_0) Σ_{j=1..k} ((α+1) j - k) u_j p_{k-j}
+- sin/cos: s_k = (1/k) Σ j u_j c_{k-j},  c_k = -(1/k) Σ j u_j s_{k-j}
+- sinh/cosh igual que sin/cos pero sin el signo negativo
+- tan = sin/cos, tanh = sinh/cosh
+- asin, acos, atan: se integra la serie de su derivada
+  (u'/sqrt(1-u²), -u'/sqrt(1-u²), u'/(1+u²))
+
+Todas las reglas cuestan O(n²) operaciones escalares, así que obtener todos
+los coeficientes hasta el orden n cuesta O(n²) por nodo del árbol.
+
+Las operaciones escalares vienen de un "backend" con la misma interfaz que
+el módulo `math` (exp, log, sin, cos, ...), de modo que el mismo código
+sirve con floats (`math`) o con otra aritmética compatible.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable, List
+
+import sympy as sp
+
+
+Series = List[float]
+
+
+# ---------------------------------------------------------------------------
+# Operaciones sobre series truncadas
+# ---------------------------------------------------------------------------
+
+def series_constant(c, n: int) -> Series:
+    """Serie de una constante: [c, 0, 0, ...]."""
+    return [c] + [c * 0] * n
+
+
+def series_variable(center, n: int) -> Series:
+    """Serie de la variable x alrededor de a: [a, 1, 0, ...]."""
+    out = series_constant(center, n)
+    if n >= 1:
+        out[1] = center * 0 + 1
+    return out
+
+
+def series_add(u: Series, v: Series) -> Series:
+    return [a + b for a, b in zip(u, v)]
+
+
+def series_scale(u: Series, c) -> Series:
+    return [a * c for a in u]
+
+
+def series_mul(u: Series, v: Series) -> Series:
+    n = len(u)
+    return [sum(u[j] * v[k - j] for j in range(k + 1)) for k in range(n)]
+
+
+def series_div(u: Series, v: Series) -> Series:
+    if v[0] == 0:
+        raise ValueError("División por una serie que se anula en el centro.")
+    n = len(u)
+    q: Series = []
+    for k in range(n):
+        acc = u[k] - sum(q[j] * v[k - j] for j in range(k))
+        q.append(acc / v[0])
+    return q
+
+
+def series_derivative(u: Series) -> Series:
+    """Serie de u' (mismo largo; el último coeficiente queda en 0)."""
+    n = len(u)
+    return [k * u[k] for k in range(1, n)] + [u[0] * 0]
+
+
+def series_integrate(u: Series, c0) -> Series:
+    """Serie de la primitiva de u con término independiente c0 (mismo largo)."""
+    n = len(u)
+    return [c0] + [u[k - 1] / k for k in range(1, n)]
+
+
+def series_exp(u: Series, fn) -> Series:
+    n = len(u)
+    e: Series = [fn.exp(u[0])]
+    for k in range(1, n):
+        e.append(sum(j * u[j] * e[k - j] for j in range(1, k + 1)) / k)
+    return e
+
+
+def series_log(u: Series, fn) -> Series:
+    if u[0] <= 0:
+        raise ValueError("log de una serie con término independiente <= 0.")
+    n = len(u)
+    out: Series = [fn.log(u[0])]
+    for k in range(1, n):
+        acc = sum(j * out[j] * u[k - j] for j in range(1, k))
+        out.append((u[k] - acc / k) / u[0])
+    return out
+
+
+def series_pow_int(u: Series, m: int) -> Series:
+    """u^m con m entero, por exponenciación binaria (válido aunque u_0 = 0)."""
+    if m < 0:
+        return series_div(series_constant(u[0] * 0 + 1, len(u) - 1), series_pow_int(u, -m))
+    result = series_constant(u[0] * 0 + 1, len(u) - 1)
+    base = u
+    while m:
+        if m & 1:
+            result = series_mul(result, base)
+        m >>= 1
+        if m:
+            base = series_mul(base, base)
+    return result
+
+
+def series_pow(u: Series, alpha, fn) -> Series:
+    """u^α con α real constante (requiere u_0 > 0)."""
+    if u[0] <= 0:
+        raise ValueError("Potencia no entera de una serie con término independiente <= 0.")
+    n = len(u)
+    p: Series = [fn.exp(alpha * fn.log(u[0]))]
+    for k in range(1, n):
+        acc = sum(((alpha + 1) * j - k) * u[j] * p[k - j] for j in range(1, k + 1))
+        p.append(acc / (k * u[0]))
+    return p
+
+
+def series_sin_cos(u: Series, fn, hyperbolic: bool = False):
+    """Devuelve (sin(u), cos(u)) o (sinh(u), cosh(u)) como series."""
+    n = len(u)
+    if hyperbolic:
+        s: Series = [fn.sinh(u[0])]
+        c: Series = [fn.cosh(u[0])]
+        sign = 1
+    else:
+        s = [fn.sin(u[0])]
+        c = [fn.cos(u[0])]
+        sign = -1
+    for k in range(1, n):
+        s_k = sum(j * u[j] * c[k - j] for j in range(1, k + 1)) / k
+        c_k = sign * sum(j * u[j] * s[k - j] for j in range(1, k + 1)) / k
+        s.append(s_k)
+        c.append(c_k)
+    return s, c
+
+
+def series_asin(u: Series, fn) -> Series:
+    one = series_constant(u[0] * 0 + 1, len(u) - 1)
+    root = series_pow(series_add(one, series_scale(series_mul(u, u), -1)), 0.5, fn)
+    return series_integrate(series_div(series_derivative(u), root), fn.asin(u[0]))
+
+
+def series_acos(u: Series, fn) -> Series:
+    asin_u = series_asin(u, fn)
+    return [fn.acos(u[0])] + [-a for a in asin_u[1:]]
+
+
+def series_atan(u: Series, fn) -> Series:
+    one = series_constant(u[0] * 0 + 1, len(u) - 1)
+    den = series_add(one, series_mul(u, u))
+    return series_integrate(series_div(series_derivative(u), den), fn.atan(u[0]))
+
+
+# ---------------------------------------------------------------------------
+# Evaluación sobre el árbol de SymPy
+# ---------------------------------------------------------------------------
+
+def _float_constant(expr: sp.Expr) -> float:
+    try:
+        return float(sp.N(expr))
+    except TypeError:
+        raise ValueError(f"La constante {expr} no es un número real.")
+
+
+def taylor_series_ad(
+    expr: sp.Expr,
+    var: sp.Symbol,
+    center,
+    order: int,
+    *,
+    fn=math,
+    to_scalar: Callable[[sp.Expr], object] = _float_constant,
+) -> Series:
+    """
+    Devuelve [c_0, ..., c_order] con c_k = f^(k)(center) / k! para f = expr,
+    evaluando el árbol como series truncadas (sin derivadas simbólicas).
+
+    `fn` aporta las funciones escalares (interfaz de `math`) y `to_scalar`
+    convierte subárboles constantes de SymPy a ese tipo de número.
+    """
+    if order < 0:
+        raise ValueError("El orden debe ser >= 0")
+
+    n = order
+    memo = {}
+
+    def ev(e: sp.Expr) -> Series:
+        if e in memo:
+            return memo[e]
+        out = _ev(e)
+        memo[e] = out
+        return out
+
+    def _ev(e: sp.Expr) -> Series:
+        if var not in e.free_symbols:
+            return series_constant(to_scalar(e), n)
+
+        if e == var:
+            return series_variable(center, n)
+
+        if e.is_Add:
+            args = [ev(a) for a in e.args]
+            acc = args[0]
+            for a in args[1:]:
+                acc = series_add(acc, a)
+            return acc
+
+        if e.is_Mul:
+            const = [a for a in e.args if var not in a.free_symbols]
+            rest = [a for a in e.args if var in a.free_symbols]
+            acc = ev(rest[0])
+            for a in rest[1:]:
+                acc = series_mul(acc, ev(a))
+            if const:
+                acc = series_scale(acc, to_scalar(sp.Mul(*const)))
+            return acc
+
+        if isinstance(e, sp.Pow):
+            base, exponent = e.as_base_exp()
+            if var not in exponent.free_symbols:
+                if exponent.is_Integer:
+                    return series_pow_int(ev(base), int(exponent))
+                return series_pow(ev(base), to_scalar(exponent), fn)
+            # Caso general u^v = exp(v * log(u))
+            log_u = series_log(ev(base), fn)
+            return series_exp(series_mul(ev(exponent), log_u), fn)
+
+        if isinstance(e, sp.Function) and len(e.args) == 1:
+            f = e.func
+            u = ev(e.args[0])
+            if f is sp.exp:
+                return series_exp(u, fn)
+            if f is sp.log:
+                return series_log(u, fn)
+            if f is sp.sin:
+                return series_sin_cos(u, fn)[0]
+            if f is sp.cos:
+                return series_sin_cos(u, fn)[1]
+            if f is sp.tan:
+                s, c = series_sin_cos(u, fn)
+                return series_div(s, c)
+            if f is sp.sinh:
+                return series_sin_cos(u, fn, hyperbolic=True)[0]
+            if f is sp.cosh:
+                return series_sin_cos(u, fn, hyperbolic=True)[1]
+            if f is sp.tanh:
+                s, c = series_sin_cos(u, fn, hyperbolic=True)
+                return series_div(s, c)
+            if f is sp.asin:
+                return series_asin(u, fn)
+            if f is sp.acos:
+                return series_acos(u, fn)
+            if f is sp.atan:
+                return series_atan(u, fn)
+
+        raise NotImplementedError(
+            f"El modo AD no soporta la expresión: {repr(e)}"
+        )
+
+    try:
+        return ev(expr)
+    except (OverflowError, ZeroDivisionError) as exc:
+        raise ValueError(f"Error numérico en el modo AD: {exc}")
@@ -1,15 +1,37 @@
-from typing import List, Dict, Optional, Tuple
-import io
+from typing import Callable, List, Dict, Optional, Tuple
 import base64
 import math
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
 
-import matplotlib
-matplotlib.use("Agg")  # backend sin interfaz gráfica (para servidores)
-import matplotlib.pyplot as plt
 import numpy as np
 import sympy as sp
 
-from manual_diff import manual_diff_k  # derivador manual
+from caching import LRUCache
+from closed_forms import ClosedForm, NoClosedForm, find_closed_form
+from latex_fast import UnsupportedLatex, parse_latex_fast
+from manual_diff import DerivativeTower  # derivador manual
+from metrics import mark_computed, record_node_counts, stage  # Server-Timing / Prometheus
+from persistent_store import StoredDerivativeTower, get_store
+from plot_series import build_series, mark_pole_gaps
+from plotting import render_png  # renderer sin pyplot, en pool de procesos
+from taylor_ad import taylor_series_ad  # aritmética de series truncadas
+from taylor_series import taylor_series_eval  # series con numpy / FFT
+from taylor_mp import (  # precisión extendida (mpmath / fracciones)
+    AUTO_FLOAT_MAX_ORDER,
+    DEFAULT_DPS,
+    FLOAT_DIGITS,
+    PRECISION_MODES,
+    float_is_enough,
+    format_number,
+    precise_coefficients,
+    precise_value_and_derivative,
+    to_float,
+    to_number,
+)
 
 # Variable simbólica global
 x = sp.symbols("x")
@@ -107,6 +129,12 @@ def parse_expression(expr_str: str) -> sp.Expr:
 
 
 def parse_expression_from_latex(expr_latex: str) -> sp.Expr:
+    # Camino rápido: parser liviano para el subconjunto de MathLive
+    try:
+        return parse_latex_fast(expr_latex)
+    except UnsupportedLatex:
+        pass
+
     try:
         from sympy.parsing.latex import parse_latex
         return parse_latex(expr_latex)
@@ -115,6 +143,124 @@ def parse_expression_from_latex(expr_latex: str) -> sp.Expr:
         return parse_expression(expr_latex)
 
 
+# ============================================================
+# Pasos legibles (nivel de detalle)
+# ============================================================
+
+# none:    sin log de pasos.
+# summary: cada derivada con sp.latex sobre el árbol que ya existe (barato).
+# full:    además se intenta sp.simplify, con un presupuesto de tiempo.
+DETAIL_LEVELS = ("none", "summary", "full")
+
+# Derivadas más grandes que esto no se escriben completas en los pasos
+STEP_LATEX_MAX_NODES = 400
+
+# Marca de un paso "full" que se quedó sin simplificar (no se cachea)
+SIMPLIFY_TIMEOUT_NOTE = "(sin simplificar: tiempo agotado)"
+
+SIMPLIFY_BUDGET_SECONDS = float(os.environ.get("TAYLOR_SIMPLIFY_BUDGET_SECONDS", "2.0"))
+
+# Procesos de simplify libres (pools de un proceso). Cada llamada toma uno
+# para ella sola: si se pasa de tiempo se mata ese y no el de otra request.
+_simplify_idle: List = []
+_simplify_lock = threading.Lock()
+
+
+def _simplify_workers() -> int:
+    return int(os.environ.get("TAYLOR_SIMPLIFY_WORKERS", "1"))
+
+
+def _checkout_simplify_worker():
+    """
+    Proceso para sp.simplify, de uso exclusivo hasta devolverlo: un hilo no
+    se puede interrumpir, pero un proceso sí, así que el timeout es real.
+    TAYLOR_SIMPLIFY_WORKERS=0 simplifica en el hilo actual (sin timeout);
+    si no, es la cantidad de procesos libres que se conservan.
+    """
+    if _simplify_workers() <= 0:
+        return None
+    with _simplify_lock:
+        if _simplify_idle:
+            return _simplify_idle.pop()
+    worker = multiprocessing.get_context("spawn").Pool(1)
+    # Esperar a que el proceso arranque (importar SymPy lleva ~1 s)
+    # para que ese costo no se descuente del presupuesto
+    worker.apply(abs, (0,))
+    return worker
+
+
+def _checkin_simplify_worker(worker) -> None:
+    with _simplify_lock:
+        if len(_simplify_idle) < _simplify_workers():
+            _simplify_idle.append(worker)
+            return
+    worker.terminate()
+
+
+def shutdown_simplify_pool() -> None:
+    """Termina los procesos de simplify libres (los ocupados, al devolverse)."""
+    with _simplify_lock:
+        workers = list(_simplify_idle)
+        _simplify_idle.clear()
+    for worker in workers:
+        worker.terminate()
+
+
+class SimplifyBudget:
+    """Tiempo total de sp.simplify permitido dentro de un análisis."""
+
+    def __init__(self, seconds: float = SIMPLIFY_BUDGET_SECONDS):
+        self.seconds = seconds
+        self.spent = 0.0
+        self.timeouts = 0
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - self.spent)
+
+    def simplify(self, expr: sp.Expr) -> Optional[sp.Expr]:
+        """Forma simplificada, o None si se agotó el presupuesto."""
+        if self.remaining() <= 0:
+            return None
+        worker = _checkout_simplify_worker()
+        start = time.perf_counter()
+        try:
+            with stage("simplify"):
+                if worker is None:
+                    return sp.simplify(expr)
+                return worker.apply_async(sp.simplify, (expr,)).get(self.remaining())
+        except multiprocessing.TimeoutError:
+            # El proceso sigue ocupado con esta expresión: se descarta solo ese
+            self.timeouts += 1
+            worker.terminate()
+            worker = None
+            return None
+        except Exception:
+            return None
+        finally:
+            self.spent += time.perf_counter() - start
+            if worker is not None:
+                _checkin_simplify_worker(worker)
+
+
+def derivative_latex(
+    tower: DerivativeTower,
+    k: int,
+    detail: str = "summary",
+    budget: Optional[SimplifyBudget] = None,
+) -> str:
+    """f^(k) para el log de pasos, según el nivel de detalle."""
+    f_k = tower.derivative(k)
+    nodes = tower.node_counts[k]
+    if nodes > STEP_LATEX_MAX_NODES:
+        return f"(expresión de {nodes} nodos, no se muestra)"
+    if detail == "full":
+        simplified = (budget or SimplifyBudget()).simplify(f_k)
+        if simplified is not None:
+            return wrap_latex(sp.latex(simplified))
+        return f"{wrap_latex(sp.latex(f_k))} {SIMPLIFY_TIMEOUT_NOTE}"
+    return wrap_latex(sp.latex(f_k))
+
+
 # ============================================================
 # Taylor core
 # ============================================================
@@ -123,51 +269,187 @@ def factorial(n: int) -> int:
     return math.factorial(n)
 
 
+def _coefficient(tower: DerivativeTower, center: float, k: int) -> Tuple[float, float]:
+    """Devuelve (c_k, f^(k)(a)) con c_k = f^(k)(a)/k!, usando la torre."""
+
+    # Evaluación numérica en a (compilada; sp.N solo como respaldo)
+    try:
+        f_k_numeric = tower.evaluate(k, center)
+    except TypeError:
+        raise ValueError(
+            f"No se pudo convertir a número la derivada de orden {k} "
+            f"evaluada en a={center}: {tower.derivative(k).subs(x, center)}"
+        )
+
+    return f_k_numeric / factorial(k), f_k_numeric
+
+
+def _derivative_value(coef_k: float, k: int) -> float:
+    """f^(k)(a) = c_k · k! (inf si no entra en un float)."""
+    try:
+        return coef_k * factorial(k)
+    except OverflowError:
+        return math.copysign(math.inf, coef_k)
+
+
+def _coefficient_step(
+    tower: DerivativeTower,
+    center: float,
+    k: int,
+    f_k_numeric: float,
+    coef_k: float,
+    detail: str = "summary",
+    budget: Optional[SimplifyBudget] = None,
+) -> str:
+    """Texto del paso k para el log de pasos."""
+    return (
+        f"k={k}: f^{k}(a) = {derivative_latex(tower, k, detail, budget)} "
+        f"evaluada en a={wrap_latex(str(center))} → {f_k_numeric}; "
+        f"c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = {coef_k}"
+    )
+
+
+def _closed_form_step(k: int, coef_k: float, closed_form: ClosedForm) -> str:
+    """Texto del paso k cuando el coeficiente sale de una fórmula cerrada."""
+    return (
+        f"k={k}: c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = {coef_k} "
+        f"(fórmula cerrada: {closed_form.family})"
+    )
+
+
 def compute_taylor_coefficients(
     sym_expr: sp.Expr,
     center: float,
     order: int,
+    tower: Optional[DerivativeTower] = None,
+    detail: str = "summary",
 ) -> Tuple[List[float], List[str]]:
 
+    # Familias conocidas (sin, exp, polinomios, ...): fórmula directa
+    closed_form = find_closed_form(sym_expr, x)
+    if closed_form is not None:
+        try:
+            coefs = closed_form.coefficients(center, order)
+        except NoClosedForm:
+            pass
+        else:
+            steps = [
+                _closed_form_step(k, c, closed_form) for k, c in enumerate(coefs)
+            ] if detail != "none" else []
+            return coefs, steps
+
     coefs: List[float] = []
     steps: List[str] = []
 
+    # Cada orden se deriva a partir del anterior (no desde f cada vez)
+    if tower is None:
+        tower = DerivativeTower(sym_expr, x)
+
+    budget = SimplifyBudget() if detail == "full" else None
     for k in range(order + 1):
+        coef_k, f_k_numeric = _coefficient(tower, center, k)
+        coefs.append(coef_k)
+        if detail != "none":
+            steps.append(_coefficient_step(
+                tower, center, k, f_k_numeric, coef_k, detail, budget
+            ))
 
-        # Derivada manual k-ésima
-        f_k = manual_diff_k(sym_expr, x, k)
+    return coefs, steps
 
-        # Evaluación numérica en a
-        f_k_at_a = f_k.subs(x, center)
-        try:
-            f_k_numeric = float(sp.N(f_k_at_a))
-        except TypeError:
-            raise ValueError(
-                f"No se pudo convertir a número la derivada de orden {k} "
-                f"evaluada en a={center}: {f_k_at_a}"
-            )
 
-        coef_k = f_k_numeric / factorial(k)
-        coefs.append(coef_k)
+def compute_taylor_coefficients_ad(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+) -> Tuple[List[float], List[str]]:
+    """
+    Igual que compute_taylor_coefficients, pero en modo AD: los coeficientes
+    salen de aritmética de series truncadas sobre el árbol de SymPy, sin
+    construir ninguna derivada simbólica.
+    """
+    coefs = [float(c) for c in taylor_series_ad(sym_expr, x, float(center), order)]
+    steps = [
+        f"k={k}: c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = {c} (aritmética de series)"
+        for k, c in enumerate(coefs)
+    ]
+    return coefs, steps
 
-        steps.append(
-            f"k={k}: f^{k}(a) = {wrap_latex(str(sp.simplify(f_k)))} "
-            f"evaluada en a={wrap_latex(str(center))} → {f_k_numeric}; "
-            f"c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = {coef_k}"
-        )
 
+def compute_taylor_coefficients_series(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+) -> Tuple[List[float], List[str]]:
+    """
+    Motor de series (TaylorSeries): cada subexpresión se expande una vez y
+    se combina con sumas, convoluciones (FFT en órdenes altos) y
+    recurrencias. Pensado para órdenes de cientos a miles.
+    """
+    coefs = taylor_series_eval(sym_expr, x, float(center), order).coefs.tolist()
+    steps = [
+        f"k={k}: c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = {c} (series por subexpresión)"
+        for k, c in enumerate(coefs)
+    ]
     return coefs, steps
 
 
+def taylor_polynomial(coefs: List[float], center: float) -> Tuple[str, str]:
+    """
+    P_n(x) = Σ c_k (x-a)^k armado directamente, sin simplify.
+
+    Devuelve (texto SymPy, LaTeX), en potencias de (x - a): pasar a la base
+    de monomios haría cancelaciones numéricas en órdenes altos, y los
+    coeficientes ya son los exactos del cálculo. Los textos se escriben
+    término a término (lineal en n, sin armar ninguna expresión SymPy);
+    SymPy reordenaría los factores de (x - a)^k al imprimir.
+    """
+
+    if center == 0:
+        base_str = base_latex = "x"
+    else:
+        shift = sp.Float(abs(center), 15)
+        sign = "-" if center > 0 else "+"
+        base_str = f"(x {sign} {sp.sstr(shift, full_prec=False)})"
+        base_latex = f"\\left(x {sign} {sp.latex(shift)}\\right)"
+
+    str_terms: List[str] = []
+    latex_terms: List[str] = []
+    for k, value in enumerate(coefs):
+        if value == 0:
+            continue
+        c = sp.Float(value, 15)
+        negative = c < 0
+        mag = -c if negative else c
+        if k == 0:
+            term_str, term_latex = sp.sstr(mag, full_prec=False), sp.latex(mag)
+        else:
+            power_str = base_str if k == 1 else f"{base_str}**{k}"
+            power_latex = base_latex if k == 1 else f"{base_latex}^{{{k}}}"
+            term_str = f"{sp.sstr(mag, full_prec=False)}*{power_str}"
+            term_latex = f"{sp.latex(mag)} {power_latex}"
+        if not str_terms:
+            str_terms.append(f"-{term_str}" if negative else term_str)
+            latex_terms.append(f"-{term_latex}" if negative else term_latex)
+        else:
+            op = " - " if negative else " + "
+            str_terms.append(op + term_str)
+            latex_terms.append(op + term_latex)
+
+    if not str_terms:
+        return "0.0", "0.0"
+    return "".join(str_terms), "".join(latex_terms)
+
+
 def evaluate_taylor_poly_with_partials(
     coefs: List[float],
     center: float,
     x_val: float,
 ) -> Tuple[float, List[float]]:
 
+    # Genérico en el tipo de número (float, mpf de mpmath o Fraction)
     dx = x_val - center
-    result = 0.0
-    power = 1.0
+    result = dx - dx
+    power = result + 1
     partials: List[float] = []
 
     for c in coefs:
@@ -179,91 +461,596 @@ def evaluate_taylor_poly_with_partials(
 
 
 def derivative_of_taylor(coefs: List[float], center: float, x_val: float) -> float:
+    # Horner sobre P'(x) = Σ k c_k (x-a)^(k-1), sin calcular potencias sueltas
     dx = x_val - center
-    total = 0.0
-    for k in range(1, len(coefs)):
-        total += k * coefs[k] * (dx ** (k - 1))
+    total = dx - dx
+    for k in range(len(coefs) - 1, 0, -1):
+        total = total * dx + k * coefs[k]
     return total
 
 
-def exact_value(sym_expr: sp.Expr, x_val: float) -> Optional[float]:
+# ============================================================
+# Evaluación vectorizada (muchos puntos a la vez)
+# ============================================================
+
+def evaluate_taylor_poly_vectorized(
+    coefs: List[float],
+    center: float,
+    xs: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evalúa P_n(x) y P_n'(x) sobre un arreglo de puntos con Horner:
+    O(n) operaciones vectoriales y sin matrices de potencias.
+    """
+    dxs = np.asarray(xs, dtype=float) - center
+    n = len(coefs) - 1
+    values = np.full_like(dxs, coefs[n])
+    derivs = np.zeros_like(dxs)
+    # Con coeficientes enormes (órdenes altos) puede haber overflow: NaN/inf
+    with np.errstate(over="ignore", invalid="ignore"):
+        for k in range(n - 1, -1, -1):
+            derivs = derivs * dxs + values
+            values = values * dxs + coefs[k]
+    return values, derivs
+
+
+def partial_sums_vectorized(
+    coefs: List[float],
+    center: float,
+    xs: np.ndarray,
+) -> np.ndarray:
+    """
+    Sumas parciales P_0(x), ..., P_n(x) sobre un arreglo de puntos.
+    Devuelve una matriz (n+1) × len(xs); la fila k es P_k.
+    """
+    dxs = np.asarray(xs, dtype=float) - center
+    out = np.empty((len(coefs), dxs.size))
+    power = np.ones_like(dxs)
+    acc = np.zeros_like(dxs)
+    for k, c in enumerate(coefs):
+        acc += c * power
+        out[k] = acc
+        power *= dxs
+    return out
+
+
+def exact_values_vectorized(
+    tower: DerivativeTower,
+    k: int,
+    xs: np.ndarray,
+) -> np.ndarray:
+    """
+    f^(k) sobre un arreglo con la versión NumPy compilada de la torre.
+    Los puntos fuera del dominio (o con resultado complejo) quedan en NaN.
+    Si la versión NumPy no puede evaluar el arreglo, se usa la compilada con
+    `math` punto a punto (nunca subs), y los puntos que fallan quedan en NaN.
+    """
+    xs = np.asarray(xs, dtype=float)
+    with np.errstate(all="ignore"):
+        try:
+            ys = tower.compiled(k, "numpy")(xs)
+        except Exception:
+            ys = _pointwise_values(tower.compiled(k, "math"), xs)
+    ys = np.asarray(ys)
+    if np.iscomplexobj(ys):
+        ys = np.where(np.abs(ys.imag) > 1e-12, np.nan, ys.real)
+    ys = np.broadcast_to(ys.astype(float), xs.shape).copy()
+    ys[~np.isfinite(ys)] = np.nan
+    return ys
+
+
+def _pointwise_values(f_math, xs: np.ndarray) -> np.ndarray:
+    out = np.empty(xs.shape, dtype=complex)
+    for i, xx in enumerate(xs.flat):
+        try:
+            out.flat[i] = complex(f_math(float(xx)))
+        except (ArithmeticError, ValueError, TypeError):
+            out.flat[i] = np.nan
+    return out
+
+
+def exact_value(
+    sym_expr: sp.Expr,
+    x_val: float,
+    tower: Optional[DerivativeTower] = None,
+) -> Optional[float]:
+    try:
+        if tower is None:
+            tower = DerivativeTower(sym_expr, x)
+        return tower.evaluate(0, x_val)
+    except Exception:
+        return None
+
+
+def exact_derivative_value(
+    sym_expr: sp.Expr,
+    x_val: float,
+    tower: Optional[DerivativeTower] = None,
+) -> Optional[float]:
+    try:
+        if tower is None:
+            tower = DerivativeTower(sym_expr, x)
+        return tower.evaluate(1, x_val)
+    except Exception:
+        return None
+
+
+def exact_derivative_value_ad(sym_expr: sp.Expr, x_val: float) -> Optional[float]:
+    """f'(x_val) en modo AD: es el coeficiente c_1 de la serie centrada en x_val."""
     try:
-        return float(sp.N(sym_expr.subs(x, x_val)))
+        return float(taylor_series_ad(sym_expr, x, float(x_val), 1)[1])
     except Exception:
         return None
 
 
-def exact_derivative_value(sym_expr: sp.Expr, x_val: float) -> Optional[float]:
+def exact_derivative_value_series(sym_expr: sp.Expr, x_val: float) -> Optional[float]:
+    """f'(x_val) con el motor de series (c_1 de la serie centrada en x_val)."""
     try:
-        f_prime = manual_diff_k(sym_expr, x, 1)
-        return float(sp.N(f_prime.subs(x, x_val)))
+        return float(taylor_series_eval(sym_expr, x, float(x_val), 1).coefs[1])
     except Exception:
         return None
 
 
+# ============================================================
+# Cachés por etapa: expresión parseada → torre → coeficientes
+# ============================================================
+
+class CoefficientTable:
+    """
+    Coeficientes (y textos de pasos) ya calculados para una torre y un centro.
+
+    Pedir un orden mayor solo calcula los coeficientes que faltan; pedir uno
+    menor devuelve un prefijo sin recalcular nada. Los textos de pasos se
+    generan aparte, por nivel de detalle, y solo si alguien los pide.
+
+    Si la expresión es de una familia con fórmula cerrada (closed_forms), los
+    coeficientes salen de la fórmula y la torre no se deriva. Si la torre
+    está respaldada por el almacén persistente, los coeficientes también se
+    leen y se guardan ahí.
+    """
+
+    def __init__(self, tower: DerivativeTower, center: float):
+        self.tower = tower
+        self.center = center
+        self.coefs: List[float] = []
+        self.values: List[Optional[float]] = []
+        self.steps: Dict[str, List[str]] = {}
+        self.closed_form = find_closed_form(tower.expr, tower.var)
+        self._lock = threading.Lock()
+
+    def ensure(self, order: int) -> List[float]:
+        with self._lock:
+            if self.closed_form is not None and len(self.coefs) <= order:
+                try:
+                    self.coefs = self.closed_form.coefficients(self.center, order)
+                    self.values = [None] * len(self.coefs)
+                    mark_computed()
+                except NoClosedForm:
+                    # El centro no sirve para la fórmula: motor general
+                    self.closed_form = None
+                    self.coefs, self.values = [], []
+            # Torres del almacén (StoredDerivativeTower) traen .store y .key
+            store = getattr(self.tower, "store", None)
+            if store is not None and len(self.coefs) <= order:
+                self._load_stored(order)
+            computed_from = len(self.coefs)
+            for k in range(len(self.coefs), order + 1):
+                coef_k, f_k_numeric = _coefficient(self.tower, self.center, k)
+                self.coefs.append(coef_k)
+                self.values.append(f_k_numeric)
+            if len(self.coefs) > computed_from:
+                mark_computed()
+            if store is not None and len(self.coefs) > computed_from:
+                try:
+                    with stage("store"):
+                        store.save_coefficients(
+                            "symbolic", self.tower.key, self.center, self.coefs
+                        )
+                except sqlite3.Error:
+                    pass
+            return self.coefs[: order + 1]
+
+    def _load_stored(self, order: int) -> None:
+        """Toma del almacén el arreglo guardado (si cubre hasta `order`)."""
+        try:
+            with stage("store"):
+                coefs = self.tower.store.load_coefficients(
+                    "symbolic", self.tower.key, self.center, order
+                )
+        except sqlite3.Error:
+            return
+        if coefs is None:
+            return
+        self.coefs = coefs
+        self.values = [_derivative_value(c, k) for k, c in enumerate(coefs)]
+
+    def ensure_steps(
+        self,
+        order: int,
+        detail: str = "summary",
+        budget: Optional[SimplifyBudget] = None,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> List[str]:
+        """
+        Pasos 0..order (`progress(k)` avisa cada uno). Se arman fuera del
+        lock (con detail="full" pueden esperar a sp.simplify) y solo se
+        cachean hasta el primero que se quedó sin simplificar: ese se vuelve
+        a intentar en la próxima request.
+        """
+        report = progress or (lambda _k: None)
+        self.ensure(order)
+        with self._lock:
+            done = list(self.steps.get(detail, []))[: order + 1]
+            coefs, values = self.coefs[: order + 1], self.values[: order + 1]
+            closed_form = self.closed_form
+        for k in range(len(done)):
+            report(k)
+        if len(done) > order:
+            return done
+
+        new: List[str] = []
+        for k in range(len(done), order + 1):
+            if closed_form is not None:
+                new.append(_closed_form_step(k, coefs[k], closed_form))
+            else:
+                new.append(_coefficient_step(
+                    self.tower, self.center, k, values[k], coefs[k], detail, budget,
+                ))
+            report(k)
+
+        with self._lock:
+            steps = self.steps.setdefault(detail, [])
+            # Si otra request ya los agregó mientras tanto, quedan los suyos
+            if len(steps) == len(done):
+                for step in new:
+                    if SIMPLIFY_TIMEOUT_NOTE in step:
+                        break
+                    steps.append(step)
+        return done + new
+
+
+PARSE_CACHE = LRUCache(max_entries=1024)
+TOWER_CACHE = LRUCache(max_entries=128)
+COEFFICIENT_CACHE = LRUCache(max_entries=512)
+
+ENGINE_CACHES = {
+    "parse": PARSE_CACHE,
+    "tower": TOWER_CACHE,
+    "coefficients": COEFFICIENT_CACHE,
+}
+
+
+def clear_engine_caches() -> int:
+    """Vacía todas las cachés por etapa y devuelve cuántas entradas había."""
+    return sum(cache.clear() for cache in ENGINE_CACHES.values())
+
+
+def parse_input_cached(expr_input: str, input_is_latex: bool) -> sp.Expr:
+    """Parseo + normalización de constantes, cacheado por texto normalizado."""
+    expr_normalized = normalize_input_expression(expr_input)
+
+    def parse() -> sp.Expr:
+        if input_is_latex:
+            sym_expr = parse_expression_from_latex(expr_normalized)
+        else:
+            sym_expr = parse_expression(expr_normalized)
+        return normalize_constants(sym_expr)
+
+    return PARSE_CACHE.get_or_compute((expr_normalized, input_is_latex), parse)
+
+
+def get_derivative_tower(
+    sym_expr: sp.Expr,
+    normalize: Optional[str] = None,
+) -> DerivativeTower:
+    """
+    Torre de derivadas compartida para (expresión, normalización). Con el
+    almacén persistente activo, la torre lee y guarda sus derivadas ahí
+    (compartidas con los demás workers del host).
+    """
+    def build() -> DerivativeTower:
+        store = get_store()
+        if store is not None:
+            return StoredDerivativeTower(sym_expr, x, store, normalize=normalize)
+        return DerivativeTower(sym_expr, x, normalize=normalize)
+
+    return TOWER_CACHE.get_or_compute((sym_expr, normalize), build)
+
+
+def get_coefficient_table(
+    sym_expr: sp.Expr,
+    center: float,
+    normalize: Optional[str] = None,
+) -> CoefficientTable:
+    """Tabla de coeficientes compartida para (expresión, normalización, centro)."""
+    return COEFFICIENT_CACHE.get_or_compute(
+        ("symbolic", sym_expr, normalize, float(center)),
+        lambda: CoefficientTable(get_derivative_tower(sym_expr, normalize), center),
+    )
+
+
+def compute_taylor_coefficients_ad_cached(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+) -> Tuple[List[float], List[str]]:
+    """Modo AD con caché: se reutiliza la serie si ya se calculó a un orden >= order."""
+    key = ("ad", sym_expr, float(center))
+    cached = COEFFICIENT_CACHE.get(key)
+    if cached is None or len(cached[0]) <= order:
+        cached = compute_taylor_coefficients_ad(sym_expr, center, order)
+        COEFFICIENT_CACHE.set(key, cached)
+        mark_computed()
+    coefs, steps = cached
+    return coefs[: order + 1], steps[: order + 1]
+
+
+def compute_taylor_coefficients_series_cached(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+) -> Tuple[List[float], List[str]]:
+    """Motor de series con caché (misma reutilización de prefijos que AD)."""
+    key = ("series", sym_expr, float(center))
+    cached = COEFFICIENT_CACHE.get(key)
+    if cached is None or len(cached[0]) <= order:
+        cached = compute_taylor_coefficients_series(sym_expr, center, order)
+        COEFFICIENT_CACHE.set(key, cached)
+        mark_computed()
+    coefs, steps = cached
+    return coefs[: order + 1], steps[: order + 1]
+
+
+def get_precise_coefficients(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+    mode: str,
+    dps: int = DEFAULT_DPS,
+) -> Tuple[list, str]:
+    """
+    Coeficientes en precisión extendida ("mp" o "exact"), con caché y
+    reutilización de prefijos como en el modo AD. Devuelve (coefs, modo usado).
+    """
+    key = ("precise", mode, sym_expr, float(center), dps)
+    cached = COEFFICIENT_CACHE.get(key)
+    if cached is None or len(cached[0]) <= order:
+        cached = precise_coefficients(sym_expr, x, center, order, mode, dps)
+        COEFFICIENT_CACHE.set(key, cached)
+        mark_computed()
+    coefs, mode_used = cached
+    return coefs[: order + 1], mode_used
+
+
+def resolve_precision(
+    sym_expr: sp.Expr,
+    center: float,
+    x_eval: float,
+    order: int,
+    precision: str,
+) -> str:
+    """
+    Modo "auto": floats si alcanzan, "mp" si no. Se decide con una pasada AD
+    en float (barata); si el modo AD no soporta la expresión se usa float.
+    """
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"precision debe ser uno de {PRECISION_MODES}, no {precision!r}")
+    if precision != "auto":
+        return precision
+    if order > AUTO_FLOAT_MAX_ORDER:
+        return "mp"
+    try:
+        coefs = compute_taylor_coefficients_ad_cached(sym_expr, center, order)[0]
+    except NotImplementedError:
+        return "float"
+    except ValueError:
+        return "mp"
+    return "float" if float_is_enough(coefs, center, x_eval) else "mp"
+
+
+def get_taylor_coefficients(
+    sym_expr: sp.Expr,
+    center: float,
+    order: int,
+    *,
+    engine: str = "symbolic",
+    normalize: Optional[str] = None,
+) -> List[float]:
+    """Coeficientes c_0..c_order por el motor elegido, usando las cachés."""
+    if engine == "ad":
+        return compute_taylor_coefficients_ad_cached(sym_expr, center, order)[0]
+    if engine == "series":
+        return compute_taylor_coefficients_series_cached(sym_expr, center, order)[0]
+    return get_coefficient_table(sym_expr, center, normalize).ensure(order)
+
+
 # ============================================================
 # Tabla de convergencia
 # ============================================================
 
+def convergence_row(k: int, approx: float, exact: Optional[float]) -> Dict:
+    """Fila de la tabla de convergencia para P_k(x_eval)."""
+    if exact is None:
+        return {
+            "order": k, "approx": approx,
+            "exact": None, "abs_error": None,
+            "rel_error": None, "rel_error_pct": None
+        }
+    abs_err = abs(approx - exact)
+    rel_err = abs_err / abs(exact) if exact != 0 else None
+    return {
+        "order": k,
+        "approx": approx,
+        "exact": exact,
+        "abs_error": abs_err,
+        "rel_error": rel_err,
+        "rel_error_pct": rel_err * 100 if rel_err is not None else None
+    }
+
+
 def build_convergence_table(partials: List[float], exact: Optional[float]):
-    table = []
-    for k, approx in enumerate(partials):
-        if exact is None:
-            table.append({
-                "order": k, "approx": approx,
-                "exact": None, "abs_error": None,
-                "rel_error": None, "rel_error_pct": None
-            })
-        else:
-            abs_err = abs(approx - exact)
-            rel_err = abs_err / abs(exact) if exact != 0 else None
-            table.append({
-                "order": k,
-                "approx": approx,
-                "exact": exact,
-                "abs_error": abs_err,
-                "rel_error": rel_err,
-                "rel_error_pct": rel_err * 100 if rel_err is not None else None
-            })
-    return table
+    return [convergence_row(k, approx, exact) for k, approx in enumerate(partials)]
+
+
+def json_float(value) -> Optional[float]:
+    """
+    Número del modo → float para la respuesta. JSON no admite ±inf ni nan:
+    van como None (en mp / exact el valor completo está en coefficients_exact).
+    """
+    value = to_float(value)
+    return value if value is not None and math.isfinite(value) else None
+
+
+def _float_row(row: Dict) -> Dict:
+    """Fila de la tabla (float, mp o fracciones) → floats para la respuesta."""
+    return {
+        key: (value if key == "order" else json_float(value))
+        for key, value in row.items()
+    }
+
+
+def error_metrics(approx, exact) -> Dict[str, Optional[float]]:
+    """Errores absoluto y relativo (is not None para no perder exact = 0)."""
+    if exact is None:
+        return {"absolute": None, "relative": None}
+    abs_err = abs(approx - exact)
+    return {
+        "absolute": json_float(abs_err),
+        "relative": json_float(abs_err / abs(exact)) if exact != 0 else None,
+    }
 
 
 # ============================================================
 # Gráfica
 # ============================================================
 
-def plot_function_and_taylor(sym_expr, coefs, center, x_min, x_max, num_points=300):
+def default_plot_limits(center: float) -> Tuple[float, float]:
+    """Rango por defecto de la gráfica: simétrico alrededor del centro."""
+    span = max(1.0, abs(center) + 1.0)
+    return (center - span, center + span)
 
-    f_num = sp.lambdify(x, sym_expr, modules=["numpy"])
-    xs = np.linspace(x_min, x_max, num_points)
-    try:
-        ys_real = f_num(xs)
-    except Exception:
-        ys_real = np.array([float(sym_expr.subs(x, float(xx))) for xx in xs])
 
-    dxs = xs - center
-    powers = np.vstack([dxs**k for k in range(len(coefs))])
-    ys_taylor = (np.array(coefs).reshape(-1, 1) * powers).sum(axis=0)
+def plot_function_and_taylor(sym_expr, coefs, center, x_min, x_max, num_points=300):
+    """Gráfica de f y P_n como PNG en base64 (para embeber en JSON)."""
+    png = render_plot_png(sym_expr, coefs, center, x_min, x_max, num_points)
+    return base64.b64encode(png).decode("ascii")
 
-    plt.figure(figsize=(8, 4.5))
-    plt.plot(xs, ys_real, label="f(x)")
-    plt.plot(xs, ys_taylor, linestyle="--", label="Serie de Taylor")
-    plt.axvline(center, color="gray", linestyle=":")
-    plt.scatter([center], [coefs[0]])
-    plt.legend()
-    plt.grid(True)
 
-    buf = io.BytesIO()
-    plt.tight_layout()
-    plt.savefig(buf, format="png")
-    plt.close()
-    return base64.b64encode(buf.getvalue()).decode("ascii")
+def render_plot_png(sym_expr, coefs, center, x_min, x_max, num_points=300) -> bytes:
+    """
+    PNG de f y P_n. f se muestrea vectorizado con la torre cacheada: los
+    polos y los puntos fuera del dominio quedan como huecos (NaN) en vez de
+    hacer fallar la gráfica. P_n se evalúa con Horner.
+    """
+    xs = np.linspace(x_min, x_max, num_points)
+    ys_real = mark_pole_gaps(exact_values_vectorized(get_derivative_tower(sym_expr), 0, xs))
+    ys_taylor, _ = evaluate_taylor_poly_vectorized(coefs, center, xs)
+
+    with stage("render"):
+        return render_png(xs, ys_real, ys_taylor, center, coefs[0])
 
 
 # ============================================================
 # API
 # ============================================================
 
+def build_plot_series(
+    tower: DerivativeTower,
+    coefs: List[float],
+    center: float,
+    plot_limits: Tuple[float, float],
+    num_points: int,
+    orders: List[int],
+    max_points: int = 400,
+) -> Dict:
+    """
+    Series f(x) y P_k(x) (k en orders) muestreadas adaptativamente y
+    reducidas con LTTB, codificadas como float32 en base64.
+    """
+    partial_vecs = {
+        k: (lambda xs, k=k: evaluate_taylor_poly_vectorized(coefs[: k + 1], center, xs)[0])
+        for k in orders
+    }
+    return build_series(
+        lambda xs: exact_values_vectorized(tower, 0, xs),
+        partial_vecs,
+        plot_limits[0],
+        plot_limits[1],
+        num_points,
+        max_points,
+    )
+
+
+def render_taylor_plot(
+    expr_input: str,
+    center: float,
+    order: int,
+    *,
+    input_is_latex=True,
+    plot_limits=None,
+    num_points=300,
+    normalize=None,
+    engine="symbolic",
+) -> bytes:
+    """
+    PNG de f y P_n para una request, sin el resto del análisis.
+    El parseo y los coeficientes salen de las cachés del motor.
+    """
+    sym_expr = parse_input_cached(expr_input, input_is_latex)
+    coefs = get_taylor_coefficients(
+        sym_expr, center, order, engine=engine, normalize=normalize
+    )
+    if plot_limits is None:
+        plot_limits = default_plot_limits(center)
+    return render_plot_png(
+        sym_expr, coefs, center, plot_limits[0], plot_limits[1], num_points
+    )
+
+
+def evaluar_taylor_en_puntos(
+    expr_input: str,
+    center: float,
+    order: int,
+    xs,
+    *,
+    input_is_latex=True,
+    normalize=None,
+    engine="symbolic",
+    include_partials=False,
+):
+    """
+    Evalúa P_n, P_n', f y f' sobre un arreglo de puntos (todo vectorizado).
+
+    Devuelve arreglos NumPy; con include_partials también la matriz de
+    sumas parciales P_0..P_n (una fila por orden).
+    """
+    sym_expr = parse_input_cached(expr_input, input_is_latex)
+    coefs = get_taylor_coefficients(
+        sym_expr, center, order, engine=engine, normalize=normalize
+    )
+    xs = np.asarray(xs, dtype=float)
+
+    approx, deriv_approx = evaluate_taylor_poly_vectorized(coefs, center, xs)
+    tower = get_derivative_tower(sym_expr, normalize)
+    exact = exact_values_vectorized(tower, 0, xs)
+    deriv_exact = exact_values_vectorized(tower, 1, xs)
+
+    result = {
+        "expression_sympy_str": str(sym_expr),
+        "coefficients": coefs,
+        "x": xs,
+        "approx": approx,
+        "exact": exact,
+        "abs_error": np.abs(approx - exact),
+        "derivative_approx": deriv_approx,
+        "derivative_exact": deriv_exact,
+        "derivative_abs_error": np.abs(deriv_approx - deriv_exact),
+    }
+    if include_partials:
+        result["partials"] = partial_sums_vectorized(coefs, center, xs)
+    return result
+
+
 def generar_taylor_con_analisis(
     expr_input: str,
     center: float,
@@ -273,113 +1060,265 @@ def generar_taylor_con_analisis(
     input_is_latex=True,
     plot_limits=None,
     num_points=300,
+    normalize=None,
+    engine="symbolic",
+    include_plot=True,
+    detail="summary",
+    include_plot_series=False,
+    series_orders=None,
+    series_max_points=400,
+    precision="float",
+    dps=DEFAULT_DPS,
+    progress: Optional[Callable[..., None]] = None,
 ):
-
+    """
+    Análisis completo de Taylor. Si se pasa `progress`, se llama como
+    progress(etapa, **datos) al terminar cada etapa y cada orden de
+    coeficientes; puede lanzar una excepción para abortar el cálculo
+    (cancelación o presupuesto agotado en /taylor/jobs).
+
+    `detail` controla el log de pasos: "none" no lo genera, "summary" usa
+    sp.latex sobre las derivadas ya calculadas y "full" además simplifica
+    cada una dentro de un presupuesto de tiempo.
+
+    `precision` elige la aritmética de los coeficientes y de la tabla de
+    convergencia: "float", "mp" (mpmath con `dps` dígitos), "exact"
+    (fracciones, solo funciones racionales) o "auto".
+    """
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"detail debe ser uno de {DETAIL_LEVELS}, no {detail!r}")
+    include_steps = detail != "none"
     steps: List[str] = []
+    report = progress or (lambda _stage, **_info: None)
 
-    # 1) Parseo + normalización
-    if input_is_latex:
-        expr_normalized = normalize_input_expression(expr_input)
-        sym_expr = parse_expression_from_latex(expr_normalized)
-        sym_expr = normalize_constants(sym_expr)
-        steps.append(
-            f"1) Parseada expresión LaTeX: {wrap_latex(expr_input)} "
-            f"→ {wrap_latex(str(sym_expr))}"
-        )
+    # 1) Parseo + normalización (cacheado)
+    with stage("parse"):
+        sym_expr = parse_input_cached(expr_input, input_is_latex)
+    report("parse", expression_sympy_str=str(sym_expr))
+    kind = "LaTeX" if input_is_latex else "texto"
+    steps.append(
+        f"1) Parseada expresión {kind}: {wrap_latex(expr_input)} "
+        f"→ {wrap_latex(str(sym_expr))}"
+    )
+
+    # Precisión de los coeficientes (float salvo que se pida otra cosa)
+    with stage("coefficients"):
+        mode = resolve_precision(sym_expr, center, x_eval, order, precision)
+    high_precision = mode in ("mp", "exact")
+
+    # El valor exacto se calcula antes que los coeficientes para poder
+    # reportar cada fila de la tabla de convergencia apenas sale su orden.
+    # Los valores *_n son del tipo de número del modo; los que van en la
+    # respuesta se pasan a float al final.
+    if high_precision or engine in ("ad", "series"):
+        # Sin derivadas simbólicas; la torre solo se usa para compilar f
+        # (orden 0) para la gráfica
+        table = None
+        tower = None
+        tower_f = get_derivative_tower(sym_expr, normalize)
     else:
-        expr_normalized = normalize_input_expression(expr_input)
-        sym_expr = parse_expression(expr_normalized)
-        sym_expr = normalize_constants(sym_expr)
-        steps.append(
-            f"1) Parseada expresión texto: {wrap_latex(expr_input)} "
-            f"→ {wrap_latex(str(sym_expr))}"
+        # Torre de derivadas y coeficientes compartidos entre requests:
+        # subir el orden solo calcula las derivadas que faltan
+        with stage("coefficients"):
+            table = get_coefficient_table(sym_expr, center, normalize)
+        tower = tower_f = table.tower
+
+    if high_precision:
+        with stage("coefficients"):
+            coefs_n, mode = get_precise_coefficients(sym_expr, center, order, mode, dps)
+        center_n = to_number(center, mode, dps)
+        x_eval_n = to_number(x_eval, mode, dps)
+        with stage("exact"):
+            f_exact_n, deriv_exact_n = precise_value_and_derivative(
+                sym_expr, x, x_eval, mode, dps
+            )
+    else:
+        center_n, x_eval_n = center, x_eval
+        with stage("exact"):
+            f_exact_n = exact_value(sym_expr, x_eval, tower=tower_f)
+    f_exact = to_float(f_exact_n)
+    report("exact", exact_value_at_x=json_float(f_exact))
+
+    # 2) Coeficientes (y sumas parciales P_k(x_eval) a medida que salen)
+    dx_n = x_eval_n - center_n
+    running = {"sum": dx_n - dx_n, "power": dx_n - dx_n + 1}
+
+    def report_coefficient(k: int, coef_k) -> None:
+        running["sum"] += coef_k * running["power"]
+        running["power"] *= dx_n
+        report(
+            "coefficients", order=k, of=order, coefficient=json_float(coef_k),
+            row=_float_row(convergence_row(k, running["sum"], f_exact_n)),
         )
 
-    # 2) Coeficientes
-    coefs, coef_steps = compute_taylor_coefficients(sym_expr, center, order)
+    if high_precision:
+        with stage("coefficients"):
+            coefs = [to_float(c) for c in coefs_n]
+            for k, coef_k in enumerate(coefs_n):
+                report_coefficient(k, coef_k)
+        digits = "exacto" if mode == "exact" else f"{dps} dígitos"
+        with stage("steps"):
+            coef_steps = [
+                f"k={k}: c_{k} = {wrap_latex(f'f^{k}(a)/{k}!')} = "
+                f"{format_number(c, mode, dps)} ({digits})"
+                for k, c in enumerate(coefs_n)
+            ] if include_steps else []
+    elif table is None:
+        compute = (
+            compute_taylor_coefficients_series_cached if engine == "series"
+            else compute_taylor_coefficients_ad_cached
+        )
+        with stage("coefficients"):
+            coefs, coef_steps = compute(sym_expr, center, order)
+            for k, coef_k in enumerate(coefs):
+                report_coefficient(k, coef_k)
+    else:
+        with stage("coefficients"):
+            for k in range(order + 1):
+                coefs = table.ensure(k)
+                report_coefficient(k, coefs[k])
+        coef_steps = []
+        if include_steps:
+            budget = SimplifyBudget() if detail == "full" else None
+            with stage("steps"):
+                coef_steps = table.ensure_steps(
+                    order, detail, budget,
+                    progress=lambda k: report("steps", order=k, of=order),
+                )
+    if not high_precision:
+        coefs_n = coefs
     steps.append("2) Cálculo de coeficientes cₖ = f⁽ᵏ⁾(a) / k!:")
     steps.extend([f"   - {p}" for p in coef_steps])
 
-    # 3) Polinomio simbólico
-    poly_sym = sum(sp.N(coefs[k]) * (x - center)**k for k in range(len(coefs)))
-    poly_simpl = sp.simplify(poly_sym)
-    steps.append(f"3) Polinomio de Taylor: {wrap_latex(str(poly_simpl))}")
-    poly_latex = sp.latex(poly_simpl)
-
-    # 4) Evaluación Taylor
-    approx_val, partials = evaluate_taylor_poly_with_partials(coefs, center, x_eval)
-    steps.append(
-        f"4) Evaluado P_{order}({wrap_latex(str(x_eval))}) → {approx_val}"
-    )
+    # 3) El polinomio se arma al final, después de lo numérico (ver abajo)
+    polynomial_step = len(steps)
 
-    # 5) Valor exacto
-    f_exact = exact_value(sym_expr, x_eval)
-    if f_exact is not None:
+    with stage("evaluation"):
+        # 4) Evaluación Taylor
+        approx_n, partials_n = evaluate_taylor_poly_with_partials(coefs_n, center_n, x_eval_n)
+        approx_val = to_float(approx_n)
         steps.append(
-            f"5) Valor exacto f({wrap_latex(str(x_eval))}) = {f_exact}"
+            f"4) Evaluado P_{order}({wrap_latex(str(x_eval))}) → {approx_val}"
         )
-    else:
-        steps.append("5) No se pudo calcular f(x_eval).")
 
-    # 6) Derivada aproximada y exacta
-    deriv_approx = derivative_of_taylor(coefs, center, x_eval)
-    steps.append(
-        f"6) Derivada aproximada P'({wrap_latex(str(x_eval))}) = {deriv_approx}"
-    )
+        # 5) Valor exacto
+        if f_exact is not None:
+            steps.append(
+                f"5) Valor exacto f({wrap_latex(str(x_eval))}) = {f_exact}"
+            )
+        else:
+            steps.append("5) No se pudo calcular f(x_eval).")
 
-    deriv_exact = exact_derivative_value(sym_expr, x_eval)
-    if deriv_exact is not None:
+        # 6) Derivada aproximada y exacta
+        deriv_approx_n = derivative_of_taylor(coefs_n, center_n, x_eval_n)
+        deriv_approx = to_float(deriv_approx_n)
         steps.append(
-            f"   Derivada exacta f'({wrap_latex(str(x_eval))}) = {deriv_exact}"
+            f"6) Derivada aproximada P'({wrap_latex(str(x_eval))}) = {deriv_approx}"
         )
-    else:
-        steps.append("   No se pudo calcular f'(x_eval).")
-
-    # 7) Errores (usar is not None para no perder el caso f_exact = 0)
-    value_errors = {
-        "absolute": abs(approx_val - f_exact) if f_exact is not None else None,
-        "relative": (
-            abs(approx_val - f_exact) / abs(f_exact)
-            if (f_exact is not None and f_exact != 0)
-            else None
-        ),
-    }
-    derivative_errors = {
-        "absolute": (
-            abs(deriv_approx - deriv_exact)
-            if deriv_exact is not None
-            else None
-        ),
-        "relative": (
-            abs(deriv_approx - deriv_exact) / abs(deriv_exact)
-            if (deriv_exact is not None and deriv_exact != 0)
-            else None
-        ),
-    }
 
-    # 8) Tabla de convergencia
-    convergence = build_convergence_table(partials, f_exact)
-    steps.append("8) Tabla de convergencia generada.")
+        if high_precision:
+            deriv_exact = to_float(deriv_exact_n)
+        elif engine == "ad":
+            deriv_exact_n = deriv_exact = exact_derivative_value_ad(sym_expr, x_eval)
+        elif engine == "series":
+            deriv_exact_n = deriv_exact = exact_derivative_value_series(sym_expr, x_eval)
+        else:
+            deriv_exact_n = deriv_exact = exact_derivative_value(sym_expr, x_eval, tower=tower)
+        if deriv_exact is not None:
+            steps.append(
+                f"   Derivada exacta f'({wrap_latex(str(x_eval))}) = {deriv_exact}"
+            )
+        else:
+            steps.append("   No se pudo calcular f'(x_eval).")
+
+        # 7) Errores (en la precisión del modo, antes de pasar a float)
+        value_errors = error_metrics(approx_n, f_exact_n)
+        derivative_errors = error_metrics(deriv_approx_n, deriv_exact_n)
+
+        # 8) Tabla de convergencia
+        convergence = [
+            _float_row(row) for row in build_convergence_table(partials_n, f_exact_n)
+        ]
+        steps.append("8) Tabla de convergencia generada.")
+        report(
+            "evaluation",
+            approx_value_at_x=json_float(approx_val),
+            derivative_approx_at_x=json_float(deriv_approx),
+            derivative_exact_at_x=json_float(deriv_exact),
+            value_errors=value_errors,
+            derivative_errors=derivative_errors,
+        )
+
+    # 3) Polinomio de Taylor (armado directo a partir de los coeficientes)
+    # (en mp se pasan los mpf: con órdenes altos los c_k salen del rango float)
+    poly_coefs = coefs
+    if mode == "mp":
+        poly_coefs = [sp.Float(str(c), FLOAT_DIGITS) for c in coefs_n]
+    with stage("polynomial"):
+        poly_str, poly_latex = taylor_polynomial(poly_coefs, center)
+    steps.insert(
+        polynomial_step, f"3) Polinomio de Taylor: {wrap_latex(poly_latex)}"
+    )
+    report(
+        "polynomial",
+        polynomial_sympy_str=poly_str,
+        polynomial_latex=poly_latex,
+    )
 
     # 9) Gráfica
     if plot_limits is None:
-        span = max(1.0, abs(center) + 1.0)
-        plot_limits = (center - span, center + span)
+        plot_limits = default_plot_limits(center)
 
-    steps.append(
-        f"9) Generando gráfica en rango {plot_limits[0]} a {plot_limits[1]}."
-    )
-
-    try:
-        plot_b64 = plot_function_and_taylor(
-            sym_expr, coefs, center,
-            plot_limits[0], plot_limits[1],
-            num_points,
+    if include_plot:
+        steps.append(
+            f"9) Generando gráfica en rango {plot_limits[0]} a {plot_limits[1]}."
         )
-        steps.append("10) Gráfica generada correctamente.")
-    except Exception as e:
+
+        try:
+            with stage("plot"):
+                plot_b64 = plot_function_and_taylor(
+                    sym_expr, coefs, center,
+                    plot_limits[0], plot_limits[1],
+                    num_points,
+                )
+            steps.append("10) Gráfica generada correctamente.")
+        except Exception as e:
+            plot_b64 = None
+            steps.append(f"10) Error generando gráfica: {e}")
+    else:
         plot_b64 = None
-        steps.append(f"10) Error generando gráfica: {e}")
+        steps.append("9) Gráfica no embebida (disponible bajo demanda).")
+    if include_plot:
+        report("plot")
+
+    # 11) Series numéricas para que el cliente dibuje la gráfica
+    plot_series = None
+    if include_plot_series:
+        orders = sorted({min(max(int(k), 0), order) for k in (series_orders or [order])})
+        try:
+            with stage("plot_series"):
+                plot_series = build_plot_series(
+                    tower_f, coefs, center, plot_limits, num_points, orders,
+                    max_points=series_max_points,
+                )
+            steps.append(
+                f"11) Series de graficado generadas ({plot_series['count']} puntos)."
+            )
+        except Exception as e:
+            steps.append(f"11) Error generando series de graficado: {e}")
+        report("plot_series")
+
+    # Tamaño de cada derivada (solo si la torre llegó a este orden: con
+    # fórmula cerrada o coeficientes del almacén puede no haberse derivado)
+    node_counts = (
+        tower.node_counts[: order + 1]
+        if tower is not None and tower.max_order >= order
+        else None
+    )
+    dag_node_counts = None
+    if node_counts is not None:
+        record_node_counts(node_counts)
+        dag_node_counts = tower.dag_node_counts(order)
 
     return {
         "expression_input": expr_input,
@@ -388,16 +1327,69 @@ def generar_taylor_con_analisis(
         "center": center,
         "x_eval": x_eval,
         "order": order,
-        "coefficients": coefs,
-        "polynomial_sympy_str": str(poly_simpl),
+        "coefficients": [json_float(c) for c in coefs],
+        "coefficients_exact": (
+            [format_number(c, mode, dps) for c in coefs_n] if high_precision else None
+        ),
+        "precision": {
+            "requested": precision,
+            "mode": mode,
+            "digits": {"float": FLOAT_DIGITS, "mp": dps}.get(mode),
+        },
+        "derivative_node_counts": node_counts,
+        "derivative_dag_node_counts": dag_node_counts,
+        "polynomial_sympy_str": poly_str,
         "polynomial_latex": poly_latex,
-        "approx_value_at_x": approx_val,
-        "exact_value_at_x": f_exact,
-        "derivative_approx_at_x": deriv_approx,
-        "derivative_exact_at_x": deriv_exact,
+        "approx_value_at_x": json_float(approx_val),
+        "exact_value_at_x": json_float(f_exact),
+        "derivative_approx_at_x": json_float(deriv_approx),
+        "derivative_exact_at_x": json_float(deriv_exact),
         "value_errors": value_errors,
         "derivative_errors": derivative_errors,
         "convergence_table": convergence,
         "plot_base64_png": plot_b64,
-        "steps": steps,
+        "plot_series": plot_series,
+        "steps": steps if include_steps else [],
     }
+
+
+# ============================================================
+# Precalentamiento (arranque en frío)
+# ============================================================
+
+# Expresión de prueba: no tiene fórmula cerrada, así que recorre el camino
+# completo (parser, torre de derivadas, lambdify con math y numpy)
+WARMUP_EXPRESSION = r"\frac{\sin\left(x\right)}{1+x^{2}}"
+
+
+def warm_up_engine() -> Dict[str, float]:
+    """
+    Paga por adelantado lo que si no pagaría el primer usuario: la gramática
+    ANTLR de LaTeX, lambdify y un análisis completo por cada motor numérico.
+    Devuelve los segundos de cada paso.
+    """
+    timings: Dict[str, float] = {}
+
+    def step(name: str, fn: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        fn()
+        timings[name] = round(time.perf_counter() - start, 4)
+
+    def load_antlr() -> None:
+        from sympy.parsing.latex import parse_latex
+        parse_latex(r"\frac{x}{2}")
+
+    def lambdify() -> None:
+        for backend in ("math", "numpy"):
+            sp.lambdify(x, sp.sin(x) * sp.exp(x), modules=backend, cse=True)(0.5)
+
+    step("latex_antlr", load_antlr)
+    step("lambdify", lambdify)
+    step("analysis_symbolic", lambda: generar_taylor_con_analisis(
+        WARMUP_EXPRESSION, 0.0, 0.5, 6, include_plot=False
+    ))
+    step("analysis_series", lambda: generar_taylor_con_analisis(
+        WARMUP_EXPRESSION, 0.0, 0.5, 6, include_plot=False, engine="series",
+        include_plot_series=True,
+    ))
+    return timings
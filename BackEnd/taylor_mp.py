@@ -0,0 +1,223 @@
+# taylor_mp.py
+"""
+Modo de precisión extendida para los coeficientes de Taylor.
+
+Con floats, f⁽ᵏ⁾(a)/k! se desborda pasado k ≈ 170 y mucho antes las sumas
+parciales pierden todos los dígitos por cancelación. Acá se usa la misma
+aritmética de series de taylor_ad, pero con otros números:
+
+- "mp":    flotantes de mpmath con `dps` dígitos decimales. Cada precisión
+           usa su propio contexto (mpmath.mp es global y compartido entre
+           hilos, así que no se toca).
+- "exact": fracciones (fractions.Fraction). Solo sirve para funciones
+           racionales; si aparece algo trascendente se pasa a "mp".
+- "auto":  floats si alcanzan (se verifica con una pasada AD en float, que
+           es barata) y "mp" si no.
+
+Los centros y puntos que llegan como float se interpretan en decimal
+(0.1 es 1/10, no el binario más cercano).
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+import mpmath
+import sympy as sp
+
+from manual_diff import DerivativeTower
+from taylor_ad import taylor_series_ad
+
+
+PRECISION_MODES = ("float", "auto", "mp", "exact")
+DEFAULT_DPS = 50
+FLOAT_DIGITS = 15
+
+# En modo auto, por encima de este orden siempre se usa mp
+AUTO_FLOAT_MAX_ORDER = 40
+
+# Si el término más grande de P_n(x) supera a |P_n(x)| por más que esto,
+# la suma en float pierde demasiados dígitos
+_CANCELLATION_LIMIT = 1e6
+
+
+# ============================================================
+# Aritméticas
+# ============================================================
+
+@functools.lru_cache(maxsize=32)
+def mp_context(dps: int) -> mpmath.MPContext:
+    """Contexto de mpmath propio para `dps` dígitos (no se modifica después)."""
+    ctx = mpmath.MPContext()
+    ctx.dps = dps
+    return ctx
+
+
+class _RationalOnly:
+    """Backend de funciones para el modo exacto: no hay trascendentes."""
+
+    def __getattr__(self, name):
+        def unsupported(*_args):
+            raise NotImplementedError(
+                f"El modo exacto no admite {name}: la función no es racional."
+            )
+        return unsupported
+
+
+def _exact_constant(expr: sp.Expr) -> Fraction:
+    if expr.is_Rational:
+        return Fraction(int(expr.p), int(expr.q))
+    raise NotImplementedError(f"El modo exacto no admite la constante {expr}.")
+
+
+def _mp_constant(ctx: mpmath.MPContext):
+    def convert(expr: sp.Expr):
+        value = sp.N(expr, ctx.dps + 10)
+        if not value.is_real:
+            raise ValueError(f"La constante {expr} no es un número real.")
+        return ctx.mpf(str(value))
+    return convert
+
+
+def to_number(value: float, mode: str, dps: int = DEFAULT_DPS):
+    """Float de la API → número del modo (interpretado en decimal)."""
+    if mode == "exact":
+        return Fraction(repr(float(value)))
+    if mode == "mp":
+        return mp_context(dps).mpf(repr(float(value)))
+    return float(value)
+
+
+def to_float(value) -> Optional[float]:
+    """Número del modo → float; lo que no entra en un double queda en ±inf."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except OverflowError:
+        # Fraction enorme (mpf ya devuelve ±inf): mismo criterio que el motor float
+        return -math.inf if value < 0 else math.inf
+
+
+def format_number(value, mode: str, dps: int = DEFAULT_DPS) -> str:
+    """Texto completo de un número del modo (fracción o dps dígitos)."""
+    if mode == "exact":
+        return str(value)
+    if mode == "mp":
+        return mp_context(dps).nstr(value, dps)
+    return repr(float(value))
+
+
+# ============================================================
+# Coeficientes y valores
+# ============================================================
+
+def _series(expr: sp.Expr, var: sp.Symbol, center, order: int, mode: str, dps: int):
+    if mode == "exact":
+        return taylor_series_ad(
+            expr, var, center, order, fn=_RationalOnly(), to_scalar=_exact_constant
+        )
+    ctx = mp_context(dps)
+    return taylor_series_ad(
+        expr, var, center, order, fn=ctx, to_scalar=_mp_constant(ctx)
+    )
+
+
+def _symbolic_mp_coefficients(expr, var, center, order: int, dps: int) -> list:
+    """
+    Respaldo si el modo AD no soporta la expresión: derivadas de manual_diff
+    + evalf. Lo que manual_diff no sabe derivar (NotImplementedError) falla
+    igual que en float.
+    """
+    ctx = mp_context(dps)
+    point = sp.Float(str(center), dps + 10)
+    tower = DerivativeTower(expr, var)
+    coefs = []
+    for k in range(order + 1):
+        value = tower.derivative(k).evalf(dps + 10, subs={var: point})
+        if not value.is_real:
+            raise ValueError(
+                f"No se pudo convertir a número la derivada de orden {k} en a={center}."
+            )
+        coefs.append(ctx.mpf(str(value)) / math.factorial(k))
+    return coefs
+
+
+def precise_coefficients(
+    expr: sp.Expr,
+    var: sp.Symbol,
+    center: float,
+    order: int,
+    mode: str,
+    dps: int = DEFAULT_DPS,
+) -> Tuple[list, str]:
+    """
+    [c_0..c_order] en el modo pedido ("mp" o "exact"). Devuelve también el
+    modo realmente usado ("exact" cae a "mp" con funciones no racionales).
+    """
+    if mode == "exact":
+        try:
+            return _series(expr, var, to_number(center, "exact"), order, "exact", dps), "exact"
+        except NotImplementedError:
+            mode = "mp"
+    try:
+        return _series(expr, var, to_number(center, "mp", dps), order, "mp", dps), "mp"
+    except NotImplementedError:
+        return _symbolic_mp_coefficients(expr, var, center, order, dps), "mp"
+
+
+def precise_value_and_derivative(
+    expr: sp.Expr,
+    var: sp.Symbol,
+    x_val: float,
+    mode: str,
+    dps: int = DEFAULT_DPS,
+) -> Tuple[Optional[object], Optional[object]]:
+    """(f(x_val), f'(x_val)) en el modo dado; None si no se puede evaluar."""
+    point = to_number(x_val, mode, dps)
+    try:
+        c0, c1 = _series(expr, var, point, 1, mode, dps)
+        return c0, c1
+    except NotImplementedError:
+        pass
+    except (ValueError, ArithmeticError):
+        return None, None
+
+    # Respaldo simbólico (solo mp), con las derivadas de manual_diff
+    ctx = mp_context(dps)
+    at = sp.Float(str(x_val), dps + 10)
+    tower = DerivativeTower(expr, var)
+    values = []
+    for e in (tower.derivative(0), tower.derivative(1)):
+        v = e.evalf(dps + 10, subs={var: at})
+        values.append(ctx.mpf(str(v)) if v.is_real and v.is_finite else None)
+    return values[0], values[1]
+
+
+def float_is_enough(coefs: List[float], center: float, x_eval: float) -> bool:
+    """
+    Heurística del modo auto sobre coeficientes calculados en float:
+    todos finitos, lejos del overflow/underflow y sin cancelación fuerte al
+    sumar P_n(x_eval).
+    """
+    if not all(math.isfinite(c) for c in coefs):
+        return False
+    magnitudes = [abs(c) for c in coefs if c != 0]
+    if magnitudes and (max(magnitudes) > 1e280 or min(magnitudes) < 1e-280):
+        return False
+
+    dx = x_eval - center
+    total = 0.0
+    largest = 0.0
+    power = 1.0
+    for c in coefs:
+        term = c * power
+        total += term
+        largest = max(largest, abs(term))
+        power *= dx
+    if not math.isfinite(total):
+        return False
+    return largest <= _CANCELLATION_LIMIT * max(abs(total), 1e-300)
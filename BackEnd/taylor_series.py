@@ -0,0 +1,358 @@
+# taylor_series.py
+"""
+Motor de aritmética de series (engine="series"): la serie de Taylor truncada
+de cada subexpresión se calcula una sola vez y se combina hacia arriba en el
+árbol de SymPy, sin derivar la expresión completa.
+
+Es la misma idea que taylor_ad, pero sobre un tipo TaylorSeries respaldado
+por arreglos de numpy, pensado para órdenes altos (cientos a miles):
+
+- sumas y múltiplos: operaciones vectoriales
+- productos: convolución; directa para series cortas y por FFT a partir de
+  FFT_MIN_LENGTH coeficientes (O(n log n) en lugar de O(n²))
+- cocientes, potencias, exp, log, sin/cos, ...: recurrencias O(n²) donde
+  cada paso es un producto escalar de numpy; f(g(x)) se resuelve aplicando
+  la recurrencia de f a la serie ya calculada de g
+
+La FFT tiene error absoluto (~eps · n · max|u| · max|v|): los coeficientes
+que quedan por debajo de ese nivel se recalculan con la suma directa, así
+que las colas que decaen rápido no se llenan de ruido.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Union
+
+import numpy as np
+import sympy as sp
+
+
+# Largo a partir del cual los productos usan FFT
+FFT_MIN_LENGTH = 256
+
+# Un coeficiente de la FFT se acepta si |c_k| supera esto por la cota de error
+_FFT_TRUST = 1e6
+
+Number = Union[int, float]
+
+
+def convolve(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Primeros len(u) coeficientes del producto de Cauchy de u y v."""
+    n = len(u)
+    if n < FFT_MIN_LENGTH:
+        return np.convolve(u, v)[:n]
+
+    size = 1 << (2 * n - 1).bit_length()
+    out = np.fft.irfft(np.fft.rfft(u, size) * np.fft.rfft(v, size), size)[:n]
+
+    bound = np.finfo(float).eps * n * np.max(np.abs(u)) * np.max(np.abs(v))
+    for k in np.nonzero(np.abs(out) < _FFT_TRUST * bound)[0]:
+        out[k] = np.dot(u[: k + 1], v[k::-1])
+    return out
+
+
+class TaylorSeries:
+    """
+    Serie de Taylor truncada: coeficientes [c_0..c_n] de f alrededor de un
+    centro fijo. Todas las operaciones devuelven series del mismo orden n.
+    """
+
+    __slots__ = ("coefs",)
+
+    def __init__(self, coefs):
+        self.coefs = np.asarray(coefs, dtype=float)
+
+    # -------------------------------------------------------------------
+    # Construcción
+    # -------------------------------------------------------------------
+
+    @classmethod
+    def constant(cls, c: Number, order: int) -> "TaylorSeries":
+        coefs = np.zeros(order + 1)
+        coefs[0] = c
+        return cls(coefs)
+
+    @classmethod
+    def variable(cls, center: Number, order: int) -> "TaylorSeries":
+        """Serie de x alrededor de a: [a, 1, 0, ...]."""
+        coefs = np.zeros(order + 1)
+        coefs[0] = center
+        if order >= 1:
+            coefs[1] = 1.0
+        return cls(coefs)
+
+    @property
+    def order(self) -> int:
+        return len(self.coefs) - 1
+
+    def __len__(self) -> int:
+        return len(self.coefs)
+
+    def __repr__(self) -> str:
+        return f"TaylorSeries(order={self.order}, coefs={self.coefs[:4].tolist()}...)"
+
+    def _like(self, value: Number) -> "TaylorSeries":
+        return TaylorSeries.constant(value, self.order)
+
+    # -------------------------------------------------------------------
+    # Aritmética
+    # -------------------------------------------------------------------
+
+    def __add__(self, other):
+        if isinstance(other, TaylorSeries):
+            return TaylorSeries(self.coefs + other.coefs)
+        out = self.coefs.copy()
+        out[0] += other
+        return TaylorSeries(out)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return TaylorSeries(-self.coefs)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, TaylorSeries):
+            return TaylorSeries(convolve(self.coefs, other.coefs))
+        return TaylorSeries(self.coefs * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if not isinstance(other, TaylorSeries):
+            return TaylorSeries(self.coefs / other)
+        u, v = self.coefs, other.coefs
+        if v[0] == 0:
+            raise ValueError("División por una serie que se anula en el centro.")
+        q = np.zeros_like(u)
+        for k in range(len(u)):
+            q[k] = (u[k] - np.dot(q[:k], v[k:0:-1])) / v[0]
+        return TaylorSeries(q)
+
+    def __rtruediv__(self, other):
+        return self._like(other) / self
+
+    def __pow__(self, exponent):
+        if float(exponent).is_integer():
+            return self._pow_int(int(exponent))
+        return self._pow_real(float(exponent))
+
+    def _pow_int(self, m: int) -> "TaylorSeries":
+        """u^m por exponenciación binaria (válido aunque u_0 = 0)."""
+        if m < 0:
+            return 1 / self._pow_int(-m)
+        result = self._like(1.0)
+        base = self
+        while m:
+            if m & 1:
+                result = result * base
+            m >>= 1
+            if m:
+                base = base * base
+        return result
+
+    def _pow_real(self, alpha: float) -> "TaylorSeries":
+        """u^α con α real (requiere u_0 > 0)."""
+        u = self.coefs
+        if u[0] <= 0:
+            raise ValueError("Potencia no entera de una serie con término independiente <= 0.")
+        p = np.zeros_like(u)
+        p[0] = u[0] ** alpha
+        j = np.arange(len(u))
+        for k in range(1, len(u)):
+            weights = ((alpha + 1) * j[1 : k + 1] - k) * u[1 : k + 1]
+            p[k] = np.dot(weights, p[k - 1 :: -1][:k]) / (k * u[0])
+        return TaylorSeries(p)
+
+    # -------------------------------------------------------------------
+    # Cálculo
+    # -------------------------------------------------------------------
+
+    def derivative(self) -> "TaylorSeries":
+        """Serie de u' (mismo largo; el último coeficiente queda en 0)."""
+        u = self.coefs
+        out = np.zeros_like(u)
+        out[:-1] = u[1:] * np.arange(1, len(u))
+        return TaylorSeries(out)
+
+    def integrate(self, c0: Number) -> "TaylorSeries":
+        """Primitiva con término independiente c0 (mismo largo)."""
+        u = self.coefs
+        out = np.empty_like(u)
+        out[0] = c0
+        out[1:] = u[:-1] / np.arange(1, len(u))
+        return TaylorSeries(out)
+
+    # -------------------------------------------------------------------
+    # Funciones elementales (recurrencias sobre u' · f'(u))
+    # -------------------------------------------------------------------
+
+    def _weighted(self) -> np.ndarray:
+        """j · u_j, el factor común de las recurrencias."""
+        return np.arange(len(self.coefs)) * self.coefs
+
+    def exp(self) -> "TaylorSeries":
+        ju = self._weighted()
+        e = np.zeros_like(ju)
+        e[0] = math.exp(self.coefs[0])
+        for k in range(1, len(e)):
+            e[k] = np.dot(ju[1 : k + 1], e[k - 1 :: -1][:k]) / k
+        return TaylorSeries(e)
+
+    def log(self) -> "TaylorSeries":
+        u = self.coefs
+        if u[0] <= 0:
+            raise ValueError("log de una serie con término independiente <= 0.")
+        out = np.zeros_like(u)
+        out[0] = math.log(u[0])
+        jl = np.zeros_like(u)
+        for k in range(1, len(u)):
+            acc = np.dot(jl[1:k], u[k - 1 : 0 : -1]) if k > 1 else 0.0
+            out[k] = (u[k] - acc / k) / u[0]
+            jl[k] = k * out[k]
+        return TaylorSeries(out)
+
+    def _sin_cos(self, hyperbolic: bool = False):
+        ju = self._weighted()
+        u0 = self.coefs[0]
+        s = np.zeros_like(ju)
+        c = np.zeros_like(ju)
+        if hyperbolic:
+            s[0], c[0], sign = math.sinh(u0), math.cosh(u0), 1.0
+        else:
+            s[0], c[0], sign = math.sin(u0), math.cos(u0), -1.0
+        for k in range(1, len(ju)):
+            weights = ju[1 : k + 1]
+            s[k] = np.dot(weights, c[k - 1 :: -1][:k]) / k
+            c[k] = sign * np.dot(weights, s[k - 1 :: -1][:k]) / k
+        return TaylorSeries(s), TaylorSeries(c)
+
+    def sin(self) -> "TaylorSeries":
+        return self._sin_cos()[0]
+
+    def cos(self) -> "TaylorSeries":
+        return self._sin_cos()[1]
+
+    def tan(self) -> "TaylorSeries":
+        s, c = self._sin_cos()
+        return s / c
+
+    def sinh(self) -> "TaylorSeries":
+        return self._sin_cos(hyperbolic=True)[0]
+
+    def cosh(self) -> "TaylorSeries":
+        return self._sin_cos(hyperbolic=True)[1]
+
+    def tanh(self) -> "TaylorSeries":
+        s, c = self._sin_cos(hyperbolic=True)
+        return s / c
+
+    def asin(self) -> "TaylorSeries":
+        root = (1 - self * self) ** 0.5
+        return (self.derivative() / root).integrate(math.asin(self.coefs[0]))
+
+    def acos(self) -> "TaylorSeries":
+        asin_u = self.asin()
+        out = -asin_u.coefs
+        out[0] = math.acos(self.coefs[0])
+        return TaylorSeries(out)
+
+    def atan(self) -> "TaylorSeries":
+        return (self.derivative() / (1 + self * self)).integrate(math.atan(self.coefs[0]))
+
+
+# ============================================================
+# Evaluación sobre el árbol de SymPy
+# ============================================================
+
+_FUNCTIONS = {
+    sp.exp: TaylorSeries.exp,
+    sp.log: TaylorSeries.log,
+    sp.sin: TaylorSeries.sin,
+    sp.cos: TaylorSeries.cos,
+    sp.tan: TaylorSeries.tan,
+    sp.sinh: TaylorSeries.sinh,
+    sp.cosh: TaylorSeries.cosh,
+    sp.tanh: TaylorSeries.tanh,
+    sp.asin: TaylorSeries.asin,
+    sp.acos: TaylorSeries.acos,
+    sp.atan: TaylorSeries.atan,
+}
+
+
+def _constant(expr: sp.Expr) -> float:
+    try:
+        return float(sp.N(expr))
+    except TypeError:
+        raise ValueError(f"La constante {expr} no es un número real.")
+
+
+def taylor_series_eval(
+    expr: sp.Expr,
+    var: sp.Symbol,
+    center: float,
+    order: int,
+) -> TaylorSeries:
+    """
+    TaylorSeries de expr alrededor de center hasta el orden dado. Cada
+    subexpresión repetida se evalúa una sola vez.
+    """
+    if order < 0:
+        raise ValueError("El orden debe ser >= 0")
+
+    memo = {}
+
+    def ev(e: sp.Expr) -> TaylorSeries:
+        out = memo.get(e)
+        if out is None:
+            out = memo[e] = _ev(e)
+        return out
+
+    def _ev(e: sp.Expr) -> TaylorSeries:
+        if var not in e.free_symbols:
+            return TaylorSeries.constant(_constant(e), order)
+
+        if e == var:
+            return TaylorSeries.variable(center, order)
+
+        if e.is_Add:
+            acc = ev(e.args[0])
+            for a in e.args[1:]:
+                acc = acc + ev(a)
+            return acc
+
+        if e.is_Mul:
+            const = [a for a in e.args if var not in a.free_symbols]
+            rest = [a for a in e.args if var in a.free_symbols]
+            acc = ev(rest[0])
+            for a in rest[1:]:
+                acc = acc * ev(a)
+            if const:
+                acc = acc * _constant(sp.Mul(*const))
+            return acc
+
+        if isinstance(e, sp.Pow):
+            base, exponent = e.as_base_exp()
+            if var not in exponent.free_symbols:
+                return ev(base) ** _constant(exponent)
+            # Caso general u^v = exp(v · log(u))
+            return (ev(exponent) * ev(base).log()).exp()
+
+        if isinstance(e, sp.Function) and len(e.args) == 1 and e.func in _FUNCTIONS:
+            return _FUNCTIONS[e.func](ev(e.args[0]))
+
+        raise NotImplementedError(
+            f"El motor de series no soporta la expresión: {repr(e)}"
+        )
+
+    with np.errstate(over="raise", divide="raise", invalid="raise"):
+        try:
+            return ev(expr)
+        except (OverflowError, ZeroDivisionError, FloatingPointError) as exc:
+            raise ValueError(f"Error numérico en el motor de series: {exc}")
@@ -23,6 +23,7 @@ function App() {
     result,
     lastRequest,
     loading,
+    partial,
     error,
     analyzeFromLatex,
     reset,
@@ -70,7 +71,7 @@ function App() {
 
           <ProcessZone loading={loading} result={result} />
 
-          <ResultZone loading={loading} result={result} />
+          <ResultZone loading={loading} result={result} partial={partial} />
         </section>
       </main>
 
@@ -1,12 +1,17 @@
 // src/components/ResultZone.tsx
 import React, { useState } from "react";
 import type { TaylorAnalysisResponseDTO } from "../lib/api/taylorTypes";
+import type { TaylorPartialResult } from "../hooks/useTaylorAnalysis";
+import { API_BASE_URL } from "../lib/api/httpClient";
 import LatexDisplay from "./LaTexDisplay";
+import SeriesPlot from "./SeriesPlot";
 import { motion, AnimatePresence } from "framer-motion";
 
 interface ResultZoneProps {
   loading: boolean;
   result: TaylorAnalysisResponseDTO | null;
+  /** Filas de convergencia que ya llegaron por el stream. */
+  partial?: TaylorPartialResult | null;
 }
 
 /**
@@ -14,7 +19,7 @@ interface ResultZoneProps {
  * - Resumen: fórmulas + valores numéricos
  * - Gráfica: imagen de convergencia con lightbox (zoom)
  */
-const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
+const ResultZone: React.FC<ResultZoneProps> = ({ loading, result, partial }) => {
   const [activeTab, setActiveTab] = useState<"resumen" | "grafica">("resumen");
   const [zoomed, setZoomed] = useState(false);
 
@@ -27,9 +32,39 @@ const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
           derivadas y errores relativos. Incluye, además, una gráfica de
           convergencia generada por el backend.
         </p>
-        <div className="flex-1 rounded-xl border border-[rgb(var(--app-border))] bg-[rgba(var(--app-bg),0.4)] px-3 py-2 flex items-center justify-center text-xs text-[rgb(var(--app-muted))]">
-          Calculando resultados…
-        </div>
+        {partial && partial.convergence_table.length > 0 ? (
+          <div className="flex-1 rounded-xl border border-[rgb(var(--app-border))] bg-[rgba(var(--app-bg),0.4)] px-3 py-2 text-xs overflow-y-auto max-h-[32rem] custom-scroll">
+            <p className="mb-2 text-[rgb(var(--app-muted))]">
+              Calculando… orden {partial.convergence_table.length - 1} de {partial.order}
+            </p>
+            <table className="w-full font-mono">
+              <thead className="text-[rgb(var(--app-muted))]">
+                <tr>
+                  <th className="text-left">k</th>
+                  <th className="text-right">cₖ</th>
+                  <th className="text-right">Pₖ(x)</th>
+                  <th className="text-right">error rel.</th>
+                </tr>
+              </thead>
+              <tbody>
+                {partial.convergence_table.map((row) => (
+                  <tr key={row.order}>
+                    <td>{row.order}</td>
+                    <td className="text-right">{partial.coefficients[row.order]?.toExponential(4)}</td>
+                    <td className="text-right">{row.approx?.toPrecision(8) ?? "--"}</td>
+                    <td className="text-right">
+                      {row.rel_error !== null ? row.rel_error.toExponential(2) : "--"}
+                    </td>
+                  </tr>
+                ))}
+              </tbody>
+            </table>
+          </div>
+        ) : (
+          <div className="flex-1 rounded-xl border border-[rgb(var(--app-border))] bg-[rgba(var(--app-bg),0.4)] px-3 py-2 flex items-center justify-center text-xs text-[rgb(var(--app-muted))]">
+            Calculando resultados…
+          </div>
+        )}
       </div>
     );
   }
@@ -64,8 +99,15 @@ const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
       ? (r.derivative_errors.relative * 100).toExponential(3)
       : "--";
 
+  // La gráfica puede venir embebida (base64) o como URL que se pide al abrir la pestaña
+  const plotSrc = r.plot_base64_png
+    ? `data:image/png;base64,${r.plot_base64_png}`
+    : r.plot_url
+      ? `${API_BASE_URL}${r.plot_url}`
+      : null;
+
   const handleOpenZoom = () => {
-    if (!r.plot_base64_png) return;
+    if (!plotSrc) return;
     setZoomed(true);
   };
 
@@ -204,20 +246,36 @@ const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
 
           {activeTab === "grafica" && (
             <>
-              {!r.plot_base64_png && (
+              {r.plot_series && (
+                <div className="flex-1 flex flex-col gap-2">
+                  {plotSrc && (
+                    <div className="text-xs text-[rgb(var(--app-muted))]">
+                      Haz clic en la gráfica para ver la versión PNG ampliada.
+                    </div>
+                  )}
+                  <div
+                    className={`rounded-lg bg-[rgba(var(--app-bg),0.8)] border border-[rgb(var(--app-border))] p-2 ${plotSrc ? "cursor-zoom-in" : ""}`}
+                    onClick={handleOpenZoom}
+                  >
+                    <SeriesPlot series={r.plot_series} center={r.center} />
+                  </div>
+                </div>
+              )}
+
+              {!r.plot_series && !plotSrc && (
                 <div className="h-full flex items-center justify-center text-center text-xs text-[rgb(var(--app-muted))]">
                   No se recibió una gráfica desde el backend para esta petición.
                 </div>
               )}
 
-              {r.plot_base64_png && (
+              {!r.plot_series && plotSrc && (
                 <div className="flex-1 flex flex-col gap-2">
                   <div className="text-xs text-[rgb(var(--app-muted))]">
                     Haz clic en la imagen para ampliarla.
                   </div>
                   <div className="rounded-lg bg-[rgba(var(--app-bg),0.8)] border border-[rgb(var(--app-border))] p-2">
                     <img
-                      src={`data:image/png;base64,${r.plot_base64_png}`}
+                      src={plotSrc}
                       alt="Gráfica de f(x) y su aproximación de Taylor"
                       className="w-full h-auto rounded-md cursor-zoom-in transition-transform duration-200 hover:scale-[1.01]"
                       onClick={handleOpenZoom}
@@ -232,7 +290,7 @@ const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
 
       {/* Lightbox / modal para la gráfica ampliada */}
       <AnimatePresence>
-        {zoomed && r.plot_base64_png && (
+        {zoomed && plotSrc && (
           <motion.div
             className="fixed inset-0 z-50 flex items-center justify-center bg-black/80 backdrop-blur-sm"
             initial={{ opacity: 0 }}
@@ -241,7 +299,7 @@ const ResultZone: React.FC<ResultZoneProps> = ({ loading, result }) => {
             onClick={handleCloseZoom}
           >
             <motion.img
-              src={`data:image/png;base64,${r.plot_base64_png}`}
+              src={plotSrc}
               alt="Gráfica (ampliada)"
               className="max-w-[95vw] max-h-[90vh] rounded-xl shadow-2xl border border-[rgb(var(--app-border))]"
               initial={{ scale: 0.85, opacity: 0 }}
@@ -0,0 +1,120 @@
+// src/components/SeriesPlot.tsx
+import React, { useMemo } from "react";
+import type { PlotSeriesDTO } from "../lib/api/taylorTypes";
+
+interface SeriesPlotProps {
+  series: PlotSeriesDTO;
+  center: number;
+}
+
+const WIDTH = 800;
+const HEIGHT = 450;
+const PAD = 40;
+
+/** Decodifica un arreglo float32 little-endian en base64. */
+function decodeFloat32(b64: string): Float32Array {
+  const bin = atob(b64);
+  const bytes = new Uint8Array(bin.length);
+  for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+  return new Float32Array(bytes.buffer);
+}
+
+/**
+ * Convierte (xs, ys) en el atributo `d` de un <path>. Los NaN cortan la
+ * línea (polos o puntos fuera del dominio).
+ */
+function toPath(
+  xs: Float32Array,
+  ys: Float32Array,
+  sx: (v: number) => number,
+  sy: (v: number) => number
+): string {
+  let d = "";
+  let penDown = false;
+  for (let i = 0; i < xs.length; i++) {
+    if (!Number.isFinite(ys[i])) {
+      penDown = false;
+      continue;
+    }
+    d += `${penDown ? "L" : "M"}${sx(xs[i]).toFixed(1)},${sy(ys[i]).toFixed(1)}`;
+    penDown = true;
+  }
+  return d;
+}
+
+/**
+ * Gráfica de f(x) y de las sumas parciales P_k(x) dibujada en el cliente
+ * a partir de las series numéricas del backend (sin PNG).
+ */
+const SeriesPlot: React.FC<SeriesPlotProps> = ({ series, center }) => {
+  const plot = useMemo(() => {
+    const xs = decodeFloat32(series.x);
+    const f = decodeFloat32(series.f);
+    const partials = series.partials.map((p) => ({
+      order: p.order,
+      ys: decodeFloat32(p.values),
+    }));
+
+    // Rango vertical a partir de f (las parciales pueden divergir mucho)
+    const finite = Array.from(f).filter(Number.isFinite);
+    let yMin = finite.length ? Math.min(...finite) : -1;
+    let yMax = finite.length ? Math.max(...finite) : 1;
+    if (yMin === yMax) {
+      yMin -= 1;
+      yMax += 1;
+    }
+    const margin = (yMax - yMin) * 0.1;
+    yMin -= margin;
+    yMax += margin;
+    const xMin = xs[0];
+    const xMax = xs[xs.length - 1];
+
+    const sx = (v: number) => PAD + ((v - xMin) / (xMax - xMin || 1)) * (WIDTH - 2 * PAD);
+    const sy = (v: number) =>
+      HEIGHT - PAD - ((Math.min(Math.max(v, yMin), yMax) - yMin) / (yMax - yMin)) * (HEIGHT - 2 * PAD);
+
+    return {
+      fPath: toPath(xs, f, sx, sy),
+      partialPaths: partials.map((p) => ({ order: p.order, d: toPath(xs, p.ys, sx, sy) })),
+      centerX: sx(center),
+      yMin,
+      yMax,
+      xMin,
+      xMax,
+    };
+  }, [series, center]);
+
+  return (
+    <svg
+      viewBox={`0 0 ${WIDTH} ${HEIGHT}`}
+      className="w-full h-auto"
+      role="img"
+      aria-label="Gráfica de f(x) y su aproximación de Taylor"
+    >
+      <rect x={PAD} y={PAD} width={WIDTH - 2 * PAD} height={HEIGHT - 2 * PAD} fill="none" stroke="currentColor" strokeOpacity={0.2} />
+      <line x1={plot.centerX} x2={plot.centerX} y1={PAD} y2={HEIGHT - PAD} stroke="gray" strokeDasharray="2 4" />
+      {plot.partialPaths.map((p, i) => (
+        <path
+          key={p.order}
+          d={p.d}
+          fill="none"
+          stroke="#ff7f0e"
+          strokeWidth={1.5}
+          strokeDasharray="6 4"
+          strokeOpacity={(i + 1) / plot.partialPaths.length}
+        />
+      ))}
+      <path d={plot.fPath} fill="none" stroke="#1f77b4" strokeWidth={2} />
+      <text x={PAD} y={HEIGHT - 12} fontSize={12} fill="currentColor">{plot.xMin.toPrecision(3)}</text>
+      <text x={WIDTH - PAD} y={HEIGHT - 12} fontSize={12} fill="currentColor" textAnchor="end">{plot.xMax.toPrecision(3)}</text>
+      <text x={4} y={PAD + 4} fontSize={12} fill="currentColor">{plot.yMax.toPrecision(3)}</text>
+      <text x={4} y={HEIGHT - PAD} fontSize={12} fill="currentColor">{plot.yMin.toPrecision(3)}</text>
+      <text x={WIDTH - PAD - 4} y={PAD + 16} fontSize={12} fill="#1f77b4" textAnchor="end">f(x)</text>
+      <text x={WIDTH - PAD - 4} y={PAD + 32} fontSize={12} fill="#ff7f0e" textAnchor="end">
+        {plot.partialPaths.map((p) => `P${p.order}`).join(", ")}
+      </text>
+    </svg>
+  );
+};
+
+export default SeriesPlot;
@@ -1,10 +1,11 @@
 // src/hooks/useTaylorAnalysis.ts
 import { useCallback, useRef, useState } from "react";
 import {
-  analyzeTaylor,
+  analyzeTaylorStream,
   buildTaylorRequest,
 } from "../lib/api/taylorApi";
 import type {
+  ConvergenceRowDTO,
   TaylorRequestDTO,
   TaylorAnalysisResponseDTO,
 } from "../lib/api/taylorTypes";
@@ -21,6 +22,17 @@ export type TaylorConfigDefaults = Partial<
   input_is_latex?: boolean;
 };
 
+/**
+ * Resultado parcial mientras llega el stream: coeficientes y filas de la
+ * tabla de convergencia ya calculados.
+ */
+export interface TaylorPartialResult {
+  order: number;
+  exact_value_at_x: number | null;
+  coefficients: (number | null)[];
+  convergence_table: ConvergenceRowDTO[];
+}
+
 /**
  * API pública del hook.
  */
@@ -34,6 +46,9 @@ export interface UseTaylorAnalysisResult {
   /** Estado de carga. */
   loading: boolean;
 
+  /** Coeficientes y filas recibidas hasta ahora (solo durante la carga). */
+  partial: TaylorPartialResult | null;
+
   /** Mensaje de error (ya listo para mostrar en UI) o null. */
   error: string | null;
 
@@ -54,7 +69,9 @@ export interface UseTaylorAnalysisResult {
 }
 
 /**
- * Hook para comunicarse con /taylor/analyze de forma tipada y reutilizable.
+ * Hook para comunicarse con /taylor/analyze/stream de forma tipada y
+ * reutilizable. Las filas de convergencia se exponen en `partial` a medida
+ * que el backend termina cada orden.
  */
 export function useTaylorAnalysis(
   defaults: TaylorConfigDefaults = {}
@@ -62,6 +79,7 @@ export function useTaylorAnalysis(
   const [result, setResult] = useState<TaylorAnalysisResponseDTO | null>(null);
   const [lastRequest, setLastRequest] = useState<TaylorRequestDTO | null>(null);
   const [loading, setLoading] = useState(false);
+  const [partial, setPartial] = useState<TaylorPartialResult | null>(null);
   const [error, setError] = useState<string | null>(null);
 
   // Guardamos el AbortController actual para cancelar peticiones previas
@@ -69,6 +87,7 @@ export function useTaylorAnalysis(
 
   const reset = useCallback(() => {
     setResult(null);
+    setPartial(null);
     setLastRequest(null);
     setError(null);
     // no tocamos defaults ni abortRef
@@ -108,7 +127,33 @@ export function useTaylorAnalysis(
 
         setLastRequest(effectiveReq);
 
-        const res = await analyzeTaylor(effectiveReq, controller.signal);
+        setPartial({
+          order: effectiveReq.order,
+          exact_value_at_x: null,
+          coefficients: [],
+          convergence_table: [],
+        });
+
+        const res = await analyzeTaylorStream(
+          effectiveReq,
+          (event) => {
+            if (event.type === "exact") {
+              const exact = event.exact_value_at_x;
+              setPartial((p) => (p ? { ...p, exact_value_at_x: exact } : p));
+            } else if (event.type === "coefficients") {
+              setPartial((p) =>
+                p
+                  ? {
+                      ...p,
+                      coefficients: [...p.coefficients, event.coefficient],
+                      convergence_table: [...p.convergence_table, event.row],
+                    }
+                  : p
+              );
+            }
+          },
+          controller.signal
+        );
         setResult(res);
       } catch (err: unknown) {
         if (err instanceof DOMException && err.name === "AbortError") {
@@ -116,7 +161,7 @@ export function useTaylorAnalysis(
           return;
         }
 
-        console.error("Error calling /taylor/analyze:", err);
+        console.error("Error calling /taylor/analyze/stream:", err);
 
         if (err instanceof ApiError) {
           setError(
@@ -130,7 +175,10 @@ export function useTaylorAnalysis(
           setError("Error desconocido al analizar la función.");
         }
       } finally {
-        setLoading(false);
+        if (abortRef.current === controller) {
+          setLoading(false);
+          setPartial(null);
+        }
       }
     },
     [defaults.center, defaults.x_eval, defaults.order, defaults.input_is_latex, defaults.plot_min, defaults.plot_max, defaults.num_points]
@@ -140,6 +188,7 @@ export function useTaylorAnalysis(
     result,
     lastRequest,
     loading,
+    partial,
     error,
     analyzeFromLatex,
     reset,
@@ -1,9 +1,10 @@
 // src/lib/api/taylorApi.ts
 
-import { apiFetchJson } from "./httpClient";
+import { API_BASE_URL, ApiError, apiFetchJson } from "./httpClient";
 import type {
   TaylorRequestDTO,
   TaylorAnalysisResponseDTO,
+  TaylorStreamEventDTO,
 } from "./taylorTypes";
 
 /**
@@ -24,6 +25,10 @@ export function buildTaylorRequest(
     plot_min: partial.plot_min ?? null,
     plot_max: partial.plot_max ?? null,
     num_points: partial.num_points ?? 300,
+    include_plot: partial.include_plot ?? false,
+    include_plot_series: partial.include_plot_series ?? true,
+    series_orders: partial.series_orders ?? null,
+    detail: partial.detail ?? "summary",
   };
 }
 
@@ -43,3 +48,67 @@ export async function analyzeTaylor(
     }
   );
 }
+
+/**
+ * Llama a /taylor/analyze/stream y entrega cada evento NDJSON a `onEvent`
+ * a medida que llega. Resuelve con la respuesta completa (evento `result`).
+ */
+export async function analyzeTaylorStream(
+  req: TaylorRequestDTO,
+  onEvent: (event: TaylorStreamEventDTO) => void,
+  signal?: AbortSignal
+): Promise<TaylorAnalysisResponseDTO> {
+  const path = "/taylor/analyze/stream";
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: "POST",
+    signal,
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(req),
+  });
+
+  if (!response.ok || !response.body) {
+    let data: unknown = null;
+    try {
+      data = await response.json();
+    } catch {
+      data = null;
+    }
+    const message =
+      (data && (data as any).detail) ||
+      `Error ${response.status} al llamar a ${path}`;
+    throw new ApiError(String(message), response.status, data ?? undefined);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let result: TaylorAnalysisResponseDTO | null = null;
+
+  const parseLine = (line: string): TaylorStreamEventDTO | null => {
+    if (!line.trim()) return null;
+    const event = JSON.parse(line) as TaylorStreamEventDTO;
+    if (event.type === "error") {
+      throw new ApiError(event.detail, event.status, event);
+    }
+    onEvent(event);
+    return event;
+  };
+
+  for (let done = false; !done; ) {
+    const chunk = await reader.read();
+    done = chunk.done;
+    buffer += chunk.value ? decoder.decode(chunk.value, { stream: true }) : "";
+    const lines = buffer.split("\n");
+    // La última línea puede estar incompleta, salvo al cerrar el stream
+    buffer = done ? "" : lines.pop() ?? "";
+    for (const line of lines) {
+      const event = parseLine(line);
+      if (event?.type === "result") result = event.result;
+    }
+  }
+
+  if (!result) {
+    throw new ApiError(`Respuesta incompleta de ${path}`, response.status);
+  }
+  return result;
+}
@@ -24,6 +24,36 @@ export interface TaylorRequestDTO {
 
   /** Número de puntos para la gráfica. */
   num_points: number;
+
+  /** Si es true, la gráfica PNG viene embebida en la respuesta. */
+  include_plot?: boolean;
+
+  /** Si es true, la respuesta trae series numéricas para graficar en el cliente. */
+  include_plot_series?: boolean;
+
+  /** Órdenes k de las sumas parciales P_k a incluir en las series. */
+  series_orders?: number[] | null;
+
+  /**
+   * Nivel de detalle del log de pasos: "none" (sin pasos), "summary"
+   * (derivadas tal cual) o "full" (simplificadas, más lento).
+   */
+  detail?: "none" | "summary" | "full";
+
+  /**
+   * Aritmética de los coeficientes: "float", "mp" (mpmath con `dps`
+   * dígitos), "exact" (fracciones) o "auto".
+   */
+  precision?: "float" | "auto" | "mp" | "exact";
+
+  /** Dígitos decimales del modo "mp". */
+  dps?: number;
+}
+
+export interface PrecisionInfoDTO {
+  requested: string;
+  mode: string;
+  digits: number | null;
 }
 
 export interface ErrorMetricsDTO {
@@ -33,13 +63,29 @@ export interface ErrorMetricsDTO {
 
 export interface ConvergenceRowDTO {
   order: number;
-  approx: number;
+  approx: number | null;
   exact: number | null;
   abs_error: number | null;
   rel_error: number | null;
   rel_error_pct: number | null;
 }
 
+export interface PartialSeriesDTO {
+  order: number;
+  /** Valores de P_k(x) como float32 little-endian en base64. */
+  values: string;
+}
+
+export interface PlotSeriesDTO {
+  encoding: string;
+  count: number;
+  /** Abscisas como float32 little-endian en base64. */
+  x: string;
+  /** Valores de f(x) como float32 little-endian en base64 (NaN = hueco). */
+  f: string;
+  partials: PartialSeriesDTO[];
+}
+
 export interface TaylorAnalysisResponseDTO {
   expression_input: string;
   input_is_latex: boolean;
@@ -48,7 +94,11 @@ export interface TaylorAnalysisResponseDTO {
   x_eval: number;
   order: number;
 
-  coefficients: number[];
+  /** null si el coeficiente no entra en un float (ver coefficients_exact). */
+  coefficients: (number | null)[];
+  /** Coeficientes completos (fracción o dps dígitos) en los modos mp / exact. */
+  coefficients_exact?: string[] | null;
+  precision?: PrecisionInfoDTO | null;
 
   polynomial_sympy_str: string;
   polynomial_latex: string;
@@ -64,9 +114,39 @@ export interface TaylorAnalysisResponseDTO {
 
   convergence_table: ConvergenceRowDTO[];
 
-  /** PNG en base64 (opcional, puede venir null). */
+  /** PNG en base64 (solo si se pidió include_plot). */
   plot_base64_png: string | null;
 
+  /** Series para dibujar la gráfica en el cliente (si se pidieron). */
+  plot_series?: PlotSeriesDTO | null;
+
+  /** Identificador de la gráfica para pedirla aparte. */
+  plot_id: string | null;
+
+  /** Ruta de GET /taylor/plot/{id}?spec=... que devuelve el PNG bajo demanda. */
+  plot_url: string | null;
+
   /** Lista de pasos textuales generados por el motor. */
   steps: string[];
 }
+
+/** Fila + coeficiente que llega apenas se calcula cada orden (streaming). */
+export interface TaylorCoefficientEventDTO {
+  type: "coefficients";
+  order: number;
+  of: number;
+  coefficient: number | null;
+  row: ConvergenceRowDTO;
+}
+
+/**
+ * Eventos NDJSON de /taylor/analyze/stream. Las etapas intermedias
+ * (parse, steps, evaluation, polynomial, plot...) traen sus propios
+ * campos; `result` trae la respuesta completa.
+ */
+export type TaylorStreamEventDTO =
+  | TaylorCoefficientEventDTO
+  | { type: "result"; cache: "HIT" | "MISS"; result: TaylorAnalysisResponseDTO }
+  | { type: "error"; status: number; detail: string }
+  | { type: "exact"; exact_value_at_x: number | null }
+  | { type: "parse" | "steps" | "evaluation" | "polynomial" | "plot" | "plot_series"; [key: string]: unknown };